@@ -0,0 +1,106 @@
+# accumulateur.py
+# Statistiques en flux pour les études Monte Carlo : on ne garde jamais la liste des runs,
+# seulement des moyennes / variances courantes (Welford) et des histogrammes de rangs.
+# Deux accumulateurs remplis par des workers différents se fusionnent (formule de Chan).
+import numpy as np
+from scipy.stats import spearmanr, kendalltau
+
+METRIQUES = ("spearman", "kendall", "mae", "topk")
+
+
+class StatistiqueCourante:
+    """Moyenne et variance courantes (Welford) d'un scalaire ou d'un tableau de forme fixe."""
+
+    def __init__(self, forme=()):
+        self.n = 0
+        self.moyenne = np.zeros(forme)
+        self.m2 = np.zeros(forme)   # somme des carrés des écarts à la moyenne
+
+    def ajouter(self, x):
+        self.n += 1
+        delta = x - self.moyenne
+        self.moyenne = self.moyenne + delta / self.n
+        self.m2 = self.m2 + delta * (x - self.moyenne)
+
+    def fusionner(self, autre):
+        if autre.n == 0:
+            return
+        n = self.n + autre.n
+        delta = autre.moyenne - self.moyenne
+        self.moyenne = self.moyenne + delta * autre.n / n
+        self.m2 = self.m2 + autre.m2 + delta**2 * self.n * autre.n / n
+        self.n = n
+
+    @property
+    def variance(self):
+        """Variance de population (comme np.var / statistics.pstdev)."""
+        return self.m2 / self.n if self.n > 0 else self.m2 * np.nan
+
+    @property
+    def ecart_type(self):
+        return np.sqrt(self.variance)
+
+
+class AccumulateurRangs:
+    """
+    Accumule les classements de runs successifs d'une même population de n_joueurs :
+    - rangs       : moyenne / variance du rang de chaque joueur (0 = meilleur)
+    - histogramme : histogramme[i, r] = nombre de runs où le joueur i a fini au rang r
+    - metriques   : moyenne / variance courantes de spearman, kendall, mae et top-k
+    La mémoire ne dépend pas du nombre de runs.
+    """
+
+    def __init__(self, n_joueurs, k=3):
+        self.n_joueurs = n_joueurs
+        self.k = k
+        self.rangs = StatistiqueCourante((n_joueurs,))
+        self.histogramme = np.zeros((n_joueurs, n_joueurs), dtype=np.int64)
+        self.metriques = {nom: StatistiqueCourante() for nom in METRIQUES}
+
+    @property
+    def n(self):
+        return self.rangs.n
+
+    def ajouter_rangs(self, rangs, reference=None):
+        """
+        Ajoute un run : rangs[i] = rang du joueur i (0 = meilleur, ex-aequo possibles).
+        Si reference (rangs "vrais", par exemple selon niveau_E) est donné, calcule aussi
+        spearman, kendall, mae et top-k par rapport à ce classement.
+        """
+        rangs = np.asarray(rangs, dtype=float)
+        self.rangs.ajouter(rangs)
+        self.histogramme[np.arange(self.n_joueurs), rangs.astype(int)] += 1
+
+        if reference is not None:
+            reference = np.asarray(reference, dtype=float)
+            top_ref = set(np.argsort(reference, kind="stable")[:self.k])
+            top_run = set(np.argsort(rangs, kind="stable")[:self.k])
+            self.ajouter_metriques(
+                spearman=spearmanr(reference, rangs)[0],
+                kendall=kendalltau(reference, rangs)[0],
+                mae=np.mean(np.abs(reference - rangs)),
+                topk=len(top_ref & top_run) / self.k,
+            )
+
+    def ajouter_metriques(self, **valeurs):
+        """Ajoute des métriques déjà calculées, ex. ajouter_metriques(spearman=0.8, mae=1.2)."""
+        for nom, valeur in valeurs.items():
+            if nom not in self.metriques:
+                self.metriques[nom] = StatistiqueCourante()
+            self.metriques[nom].ajouter(valeur)
+
+    def fusionner(self, autre):
+        """Fusionne un accumulateur partiel (ex. renvoyé par un autre processus)."""
+        self.rangs.fusionner(autre.rangs)
+        self.histogramme += autre.histogramme
+        for nom, stat in autre.metriques.items():
+            if nom not in self.metriques:
+                self.metriques[nom] = StatistiqueCourante()
+            self.metriques[nom].fusionner(stat)
+        return self
+
+    def moyenne(self, nom):
+        return float(self.metriques[nom].moyenne)
+
+    def ecart_type(self, nom):
+        return float(self.metriques[nom].ecart_type)
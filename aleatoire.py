@@ -0,0 +1,78 @@
+# aleatoire.py
+# Contexte aléatoire unique passé à Tournoi, Match et aux générateurs de bdd.py.
+# Basé sur numpy Generator / SeedSequence : chaque tournoi reçoit un flux indépendant, dérivé
+# sans coût de (graine maître, numéro du run), donc rejouable et sûr en parallèle.
+import numpy as np
+
+from performance import TamponPerformance
+
+
+class ContexteAleatoire:
+    """
+    - graine       : graine maître (None = entropie du système)
+    - run_id       : numéro du run ; (graine, run_id) identifie le flux de manière unique
+    - taille_reserve : nombre d'uniformes tirés d'un coup pour les appels scalaires
+    """
+
+    def __init__(self, graine=None, run_id=None, taille_reserve=1024, sequence=None):
+        if sequence is None:
+            cle = () if run_id is None else (run_id,)
+            sequence = np.random.SeedSequence(graine, spawn_key=cle)
+        self.sequence = sequence
+        self.generateur = np.random.default_rng(sequence)
+        self.taille_reserve = taille_reserve
+        self._uniformes = []
+        self._position = 0
+
+    @classmethod
+    def depuis_etat_global(cls):
+        """Flux dont la graine est tirée dans l'état global de np.random : np.random.seed le rend rejouable."""
+        return cls(int(np.random.randint(2**63, dtype=np.int64)))
+
+    @classmethod
+    def pour_run(cls, graine, run_id):
+        """Flux du run run_id d'une étude de graine maître graine."""
+        return cls(graine, run_id)
+
+    def enfant(self):
+        """Flux indépendant dérivé de celui-ci (ex. un par tournoi d'une saison)."""
+        return ContexteAleatoire(sequence=self.sequence.spawn(1)[0], taille_reserve=self.taille_reserve)
+
+    # ---------- tirages scalaires (pré-tirés par blocs) ----------
+
+    def uniforme(self):
+        """Remplace random.random() : un nombre de [0, 1), pioché dans une réserve."""
+        if self._position >= len(self._uniformes):
+            self._uniformes = self.generateur.random(self.taille_reserve).tolist()
+            self._position = 0
+        u = self._uniformes[self._position]
+        self._position += 1
+        return u
+
+    def entier(self, a, b):
+        """Remplace random.randint(a, b) (bornes incluses)."""
+        return a + int(self.uniforme() * (b - a + 1))
+
+    def melanger(self, liste):
+        """Remplace random.shuffle : mélange la liste sur place."""
+        liste[:] = [liste[i] for i in self.generateur.permutation(len(liste))]
+
+    # ---------- joueurs ----------
+
+    def semer_joueurs(self, joueurs):
+        """
+        Les performances (Joueur.niveau) des joueurs sont tirées dans ce flux, sauf pour ceux
+        qui ont reçu leur propre générateur avec Joueur.graine (il est conservé).
+        """
+        for j in joueurs:
+            if not j._graine_propre:
+                j._tampon = TamponPerformance(rng=self.generateur)
+
+
+def generateur(rng=None):
+    """Générateur NumPy à utiliser : celui du contexte, un Generator donné, ou l'état global np.random."""
+    if rng is None:
+        return np.random
+    if isinstance(rng, ContexteAleatoire):
+        return rng.generateur
+    return rng
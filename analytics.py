@@ -5,9 +5,11 @@ import pandas as pd
 
 def snapshots_to_df(snapshots):
     """
-    snapshots: liste de listes de dicts
+    snapshots: EnregistreurSnapshots (ou ancienne liste de listes de dicts)
     -> DataFrame avec une ligne par joueur et par ronde.
     """
+    if hasattr(snapshots, "vers_df"):
+        return snapshots.vers_df()
     rows = [row for snap in snapshots for row in snap]
     return pd.DataFrame(rows)
 
@@ -0,0 +1,76 @@
+# arret.py
+# Arrêt anticipé des simulations : au lieu de jouer toujours le même nombre de tournois ou de
+# runs, on s'arrête quand le résultat ne bouge plus.
+# - ArretNorme      : la variation des Elo d'une mise à jour à l'autre (norme 2 ou infinie) est
+#                     passée sous une tolérance (vitesse_convergence.py)
+# - ArretIntervalle : l'intervalle de confiance d'une moyenne Monte Carlo (spearman, rang moyen
+#                     de chaque joueur...) est assez étroit (monte_carlo.etude_parallele)
+# economie() résume ce qui a été épargné par rapport au budget prévu.
+import numpy as np
+from scipy.stats import norm
+
+from accumulateur import StatistiqueCourante
+
+
+class ArretNorme:
+    """
+    - tolerance : seuil sur la norme de la variation des Elo
+    - norme     : "2" ou "inf"
+    - fenetre   : la norme est moyennée sur les fenetre dernières mises à jour (lisse le bruit
+                  d'un K fixe, qui ne laisse jamais la variation d'une ronde tendre vers 0)
+    """
+
+    def __init__(self, tolerance, norme="inf", fenetre=1):
+        self.tolerance = tolerance
+        self.norme = norme
+        self.fenetre = fenetre
+        self.normes = []
+
+    def observer(self, variation):
+        """Ajoute la variation d'une mise à jour ; vrai s'il faut s'arrêter."""
+        variation = np.asarray(variation)
+        if self.norme == "inf":
+            self.normes.append(np.abs(variation).max(initial=0))
+        else:
+            self.normes.append(np.sqrt((variation**2).sum()))
+        return len(self.normes) >= self.fenetre and np.mean(self.normes[-self.fenetre:]) <= self.tolerance
+
+
+class ArretIntervalle:
+    """
+    - tolerance : demi-largeur maximale de l'intervalle de confiance de la moyenne
+    - critere   : "rangs" (rang moyen de chaque joueur, on prend le pire) ou une métrique de
+                  l'AccumulateurRangs ("spearman", "kendall", "mae", "topk")
+    - niveau    : niveau de confiance (intervalle normal z * s / √n)
+    - n_min     : nombre minimal de runs avant de pouvoir s'arrêter
+    """
+
+    def __init__(self, tolerance, critere="spearman", niveau=0.95, n_min=10):
+        self.tolerance = tolerance
+        self.critere = critere
+        self.z = norm.ppf(0.5 + niveau / 2)
+        self.n_min = n_min
+
+    def demi_largeur(self, statistique: StatistiqueCourante):
+        """Demi-largeur de l'intervalle (la plus grande si la statistique est un tableau)."""
+        if statistique.n < 2:
+            return np.inf
+        ecart_type = np.sqrt(statistique.m2 / (statistique.n - 1))   # écart type d'échantillon
+        return float(np.max(self.z * ecart_type / np.sqrt(statistique.n)))
+
+    def atteint(self, accumulateur):
+        """Vrai si l'AccumulateurRangs a assez de runs pour la précision demandée."""
+        if accumulateur.n < self.n_min:
+            return False
+        statistique = accumulateur.rangs if self.critere == "rangs" else accumulateur.metriques[self.critere]
+        return self.demi_largeur(statistique) <= self.tolerance
+
+
+def economie(effectues, maximum):
+    """Ce qui a été joué et épargné (parties, runs...) par rapport au budget maximum."""
+    return {
+        "effectues": effectues,
+        "maximum": maximum,
+        "economises": maximum - effectues,
+        "fraction_economisee": (maximum - effectues) / maximum if maximum else 0.0,
+    }
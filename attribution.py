@@ -3,34 +3,66 @@
 # on considère qu'un classement est une liste de joueurs, du meilleur au pire
 # attribution en ELO : pas d'étape de classement donc à coder direct dans le tournoi
 
-from numpy import log
+# Le calcul se fait sur des tableaux de rangs (1 = premier, ex-aequo = même rang) :
+# un tableau (n_joueurs,) pour un tournoi, (n_tournois, n_joueurs) pour un lot, ou plus de dimensions
+# (saisons, tournois, joueurs). Chaque schéma est une seule expression NumPy sur tout le tableau.
+# De nouveaux schémas s'ajoutent au registre SCHEMAS avec le décorateur @schema.
+
+import numpy as np
+
+SCHEMAS = {}
+
+def schema(nom):
+    """Enregistre f(rangs, n_rangs, **params) -> points sous le nom donné."""
+    def enregistrer(f):
+        SCHEMAS[nom] = f
+        return f
+    return enregistrer
+
+@schema("lineaire")
+def _lineaire(rangs, n_rangs, alpha=1):     # dernier : +alpha point   permier : +alpha*n_rangs points
+    return (n_rangs - rangs + 1) * alpha
+
+@schema("puissance")
+def _puissance(rangs, n_rangs, alpha=2):    # dernier : +1 point    premier : +alpha**(n_rangs-1) points
+    # en flottants : en int64, alpha**(n_rangs-1) déborde sans prévenir dès 64 rangs
+    return np.power(float(alpha), np.asarray(n_rangs - rangs, dtype=float))
+
+@schema("log")
+def _log(rangs, n_rangs, alpha=2):          # dernier : +0points     premier : +log(n_rangs)/log(alpha)
+    return np.log(n_rangs - rangs + 1) / np.log(alpha)
+
+
+def attribuer(rangs, nom="lineaire", **params):
+    """
+    Points de chaque joueur pour un ou plusieurs tournois : même forme que rangs.
+    n_rangs (le rang du dernier) est pris tournoi par tournoi sur le dernier axe.
+    """
+    rangs = np.asarray(rangs)
+    n_rangs = rangs.max(axis=-1, keepdims=True)
+    return SCHEMAS[nom](rangs, n_rangs, **params)
+
+def points_saison(rangs, nom="lineaire", **params):
+    """rangs (..., n_tournois, n_joueurs) -> total des points de la saison (..., n_joueurs)."""
+    return attribuer(rangs, nom, **params).sum(axis=-2)
+
+def _depuis_dict(classement, nom, **params):
+    joueurs = list(classement)
+    points = attribuer(np.fromiter(classement.values(), dtype=int, count=len(joueurs)), nom, **params)
+    return dict(zip(joueurs, points.tolist()))
+
+
+# Interface historique : classement = {joueur: rang} -> {joueur: points}
 
 def attribution_linéaire(classement: list, alpha=1):   # dernier : +alpha point   permier : +alpha*n_rangs points
-    n_joueurs = len(classement)
-    n_rangs = max(list(classement.values()))
-    points = {}
-    for j,rang in classement.items():
-        points[j]=(n_rangs-rang+1)*alpha
-    return points
+    return _depuis_dict(classement, "lineaire", alpha=alpha)
 
 def attribution_puissance(classement, alpha=2):    # dernier : +1 point    premier : +alpha**(n_rangs-1) points
-    n_joueurs = len(classement)   
-    n_rangs = max(list(classement.values()))         
-    points = {}
-    i=0
-    for j,rang in classement.items():
-        points[j]=pow(alpha,(n_rangs-rang))
-    return points
+    return _depuis_dict(classement, "puissance", alpha=alpha)
 
 
 def attribution_log(classement, alpha=2):     # attribue les points selon la fonction inverse de alpha^x, càd ln(x)/ln(alpha)
-    n_joueurs = len(classement)             # dernier : +0points     premier : +log(n_rangs)/log(alpha)
-    n_rangs=max(list(classement.values()))
-    points = {}
-    i=0
-    for j,rang in classement.items():
-        points[j]=log(n_rangs-rang+1)/log(alpha)
-    return points
+    return _depuis_dict(classement, "log", alpha=alpha)
 
 
 # inutilisé car on aura pas le temps de fit
@@ -45,4 +77,12 @@ def attribution_poly(classement,a,b,c,d,e):
         points[classement[i]]=a*i**5+b*i**4+c*i**3+d*i**2+e*i
         i+=1
     return points
-"""
\ No newline at end of file
+"""
+
+
+if __name__ == "__main__":
+    # vérification : pas de débordement avec beaucoup de rangs (2**69 pour le premier de 70)
+    points = attribution_puissance({i: i + 1 for i in range(70)})
+    assert points[0] == 2**69 and points[69] == 1, points[0]
+    assert (points_saison(np.arange(1, 71)[None, :], "puissance") == 2.0 ** np.arange(69, -1, -1)).all()
+    print("attribution_puissance ok pour 70 rangs")
@@ -1,4 +1,6 @@
 from joueur import Joueur
+from population import Population
+from aleatoire import generateur
 
 import os
 import numpy as np
@@ -31,122 +33,262 @@ def joueurs_belloy():
         Joueur("VAST Maxence", 1489),
     ]
 
+def _construire(noms, niveaux_E, elos, niveaux_V=None, en_population=False):
+    """Assemble les joueurs : liste de Joueur, ou Population (tableaux) si en_population."""
+    n = len(noms)
+    elos = np.broadcast_to(np.asarray(elos, dtype=float), (n,))
+    niveaux_V = np.zeros(n) if niveaux_V is None else niveaux_V
+    if en_population:
+        return Population(noms, niveaux_E, niveaux_V, elos)
+    return [Joueur(nom, niveau_E=niveaux_E[i], niveau_V=niveaux_V[i], elo=elos[i]) for i, nom in enumerate(noms)]
+
+# Chaque distribution est décrite par une fonction de bloc : bloc(tirage, debut, fin, n, **params)
+# renvoie les colonnes {"niveau_E", "niveau_V", "elo"} des joueurs d'indices [debut, fin) d'une
+# population de n joueurs. tirage(colonne) donne le générateur à utiliser pour cette colonne.
+# Les fabriques creer_joueurs_* appellent le bloc sur [0, n) ; SpecPopulation l'appelle bloc par
+# bloc (flux d'un million de joueurs sans objet Joueur).
+# Toutes les fabriques acceptent rng : ContexteAleatoire, numpy Generator, ou None (état global np.random)
+
+def _lineaire(i, n, debut, fin):
+    """Valeurs d'indices i de np.linspace(debut, fin, n), sans construire tout le tableau."""
+    if n == 1:
+        return np.full(len(i), float(debut))
+    valeurs = debut + i * ((fin - debut) / (n - 1))
+    valeurs[i == n - 1] = fin
+    return valeurs
+
+def _colonnes(niveaux_E, elo, niveaux_V=None):
+    m = len(niveaux_E)
+    return {
+        "niveau_E": np.asarray(niveaux_E, dtype=float),
+        "niveau_V": np.zeros(m) if niveaux_V is None else niveaux_V,
+        "elo": np.broadcast_to(np.asarray(elo, dtype=float), (m,)).copy(),
+    }
+
+def _normal_coupe(gen, debut, fin, coupe, loi_avant, loi_apres):
+    """Tirages des indices [debut, fin) quand les indices < coupe suivent loi_avant, les autres loi_apres."""
+    avant = gen.normal(*loi_avant, max(0, min(fin, coupe) - debut))
+    apres = gen.normal(*loi_apres, max(0, fin - max(debut, coupe)))
+    return np.concatenate([avant, apres])
+
 # -----------------------------------------------------------
 # 1. Distribution UNIFORME (La Ligne Droite)
 # -----------------------------------------------------------
-def creer_joueurs_uniformes(n: int, elo_depart: int = 1200) -> list[Joueur]:
-    """Test: La vitesse de convergence sur tout le spectre."""
-    joueurs = []
+def _bloc_uniformes(tirage, debut, fin, n, elo_depart=1200):
     # Répartition linéaire exacte de 1000 à 2000
-    niveaux = np.linspace(1000, 2000, n)
-    
-    for i, niv in enumerate(niveaux):
-        joueurs.append(Joueur(f"J_Unif_{i}", elo=elo_depart, niveau_E=niv))
-    return joueurs
+    return _colonnes(_lineaire(np.arange(debut, fin), n, 1000, 2000), elo_depart)
+
+def creer_joueurs_uniformes(n: int, elo_depart: int = 1200, en_population=False, rng=None) -> list[Joueur]:
+    """Test: La vitesse de convergence sur tout le spectre."""
+    return _creer("uniformes", n, rng, en_population, elo_depart=elo_depart)
 
 # -----------------------------------------------------------
 # 2. Distribution GAUSSIENNE (La Cloche - Standard)
 # -----------------------------------------------------------
-def creer_joueurs_gaussiens(n: int, elo_depart: int = 1200) -> list[Joueur]:
+def _bloc_gaussiens(tirage, debut, fin, n, elo_depart=1200):
+    # Moyenne 1500, écart-type 200
+    return _colonnes(tirage("niveau_E").normal(1500, 200, fin - debut), elo_depart)
+
+def creer_joueurs_gaussiens(n: int, elo_depart: int = 1200, en_population=False, rng=None) -> list[Joueur]:
     """Test: La précision dans le 'ventre mou' (là où il y a le plus de monde)."""
-    joueurs = []
-    # Moyenne 1500, écart-type 300
-    niveaux = np.random.normal(1500, 200, n)
-    
-    for i, niv in enumerate(niveaux):
-        joueurs.append(Joueur(f"J_Gauss_{i}", elo=elo_depart, niveau_E=niv))
-    return joueurs
+    return _creer("gaussiens", n, rng, en_population, elo_depart=elo_depart)
 
 # -----------------------------------------------------------
 # 3. Distribution BIMODALE (Les Deux Mondes)
 # -----------------------------------------------------------
-def creer_joueurs_bimodaux(n: int, elo_depart: int = 1200) -> list[Joueur]:
-    """Test: La capacité à séparer deux groupes distincts (Débutants vs Confirmés)."""
-    joueurs = []
+def _bloc_bimodaux(tirage, debut, fin, n, elo_depart=1200):
     # Moitié à 1100 (Faibles), Moitié à 1900 (Forts), peu de mélange
-    groupe_faible = np.random.normal(1100, 100, int(n/2))
-    groupe_fort = np.random.normal(1900, 100, n - int(n/2))
-    niveaux = np.concatenate([groupe_faible, groupe_fort])
-    
-    for i, niv in enumerate(niveaux):
-        joueurs.append(Joueur(f"J_Bim_{i}", elo=elo_depart, niveau_E=niv))
-    return joueurs
+    niveaux = _normal_coupe(tirage("niveau_E"), debut, fin, int(n/2), (1100, 100), (1900, 100))
+    return _colonnes(niveaux, elo_depart)
+
+def creer_joueurs_bimodaux(n: int, elo_depart: int = 1200, en_population=False, rng=None) -> list[Joueur]:
+    """Test: La capacité à séparer deux groupes distincts (Débutants vs Confirmés)."""
+    return _creer("bimodaux", n, rng, en_population, elo_depart=elo_depart)
 
 # -----------------------------------------------------------
 # 4. Distribution ASYMÉTRIQUE (La Queue de Traîne)
 # -----------------------------------------------------------
-def creer_joueurs_asymetriques(n: int, elo_depart: int = 1200) -> list[Joueur]:
-    """Test: La détection des 'Outliers' (quelques génies parmi une masse de débutants)."""
-    joueurs = []
+def _bloc_asymetriques(tirage, debut, fin, n, elo_depart=1200):
     # Distribution Gamma : Beaucoup de faibles, une longue traîne vers les très forts
     shape, scale = 2.0, 150.0 
-    niveaux = 1000 + np.random.gamma(shape, scale, n)
-    
-    for i, niv in enumerate(niveaux):
-        joueurs.append(Joueur(f"J_Asym_{i}", elo=elo_depart, niveau_E=niv))
-    return joueurs
+    return _colonnes(1000 + tirage("niveau_E").gamma(shape, scale, fin - debut), elo_depart)
+
+def creer_joueurs_asymetriques(n: int, elo_depart: int = 1200, en_population=False, rng=None) -> list[Joueur]:
+    """Test: La détection des 'Outliers' (quelques génies parmi une masse de débutants)."""
+    return _creer("asymetriques", n, rng, en_population, elo_depart=elo_depart)
 
 # -----------------------------------------------------------
 # 5. Distribution ANORMALE (Un individu est d'un niveau complètement différent des autres)
 # -----------------------------------------------------------
-
-def creer_joueurs_anormale(n: int, elo_depart: int = 1200) -> list[Joueur]:
+def _bloc_anormale(tirage, debut, fin, n, elo_depart=1200):
+    # Moyenne 1500 (pas important), écart-type 30 (réduit) ; le dernier joueur est à 2000
+    niveaux = tirage("niveau_E").normal(1500, 30, min(fin, n - 1) - debut)
+    if fin == n:
+        niveaux = np.append(niveaux, 2000)
+    return _colonnes(niveaux, elo_depart)
+
+def creer_joueurs_anormale(n: int, elo_depart: int = 1200, en_population=False, rng=None) -> list[Joueur]:
     """Test: L'excelent joueur au milieu de la masse, donc il devrait ressortir du lot"""
-    joueurs = []
-    # Moyenne 1500 (pas important), écart-type 30 (réduit)
-    niveaux = np.random.normal(1500, 30, n-1)
-    
-    for i, niv in enumerate(niveaux):
-        joueurs.append(Joueur(f"J_Gauss_{i}", elo=elo_depart, niveau_E=niv))
-    joueurs.append(Joueur(f"J_Gauss_{i}", elo=elo_depart, niveau_E=2000))
-    return joueurs
+    return _creer("anormale", n, rng, en_population, elo_depart=elo_depart)
 
 # -----------------------------------------------------------
 # 6. Distribution Remontada (Un individu est d'un niveau complètement supérieur aux autres mais est d'un elo inférieur)
 # -----------------------------------------------------------
-
-def creer_joueurs_remontada(n: int) -> list[Joueur]:
+def _bloc_remontada(tirage, debut, fin, n):
+    # Moyenne 1500 (pas important), écart-type 30 (réduit) ; elo = niveau sauf pour le dernier
+    niveaux = tirage("niveau_E").normal(1500, 30, min(fin, n - 1) - debut)
+    if fin == n:
+        return _colonnes(np.append(niveaux, 1800), np.append(niveaux, 1200))
+    return _colonnes(niveaux, niveaux)
+
+def creer_joueurs_remontada(n: int, en_population=False, rng=None) -> list[Joueur]:
     """Test: L'excelent joueur au milieu de la masse (qui elle est bien classé donc elo=niv), donc il devrait ressortir du lot"""
-    joueurs = []
-    # Moyenne 1500 (pas important), écart-type 30 (réduit)
-    niveaux = np.random.normal(1500, 30, n-1)
-      
-    for i, niv in enumerate(niveaux):
-        joueurs.append(Joueur(f"J_Gauss_{i}", elo=niv, niveau_E=niv))
-    
-    joueurs.append(Joueur(f"J_Gauss_{i}", elo=1200, niveau_E=1800))
-    return joueurs
+    return _creer("remontada", n, rng, en_population)
 
 # -----------------------------------------------------------
 # 7. Distribution GAUSSIENNE_ELO (La Cloche - Standard)
 # -----------------------------------------------------------
-def creer_joueurs_gaussiens_elo(n: int, bool_elo_depart_identique=True) -> list[Joueur]:
+def _bloc_gaussiens_elo(tirage, debut, fin, n, bool_elo_depart_identique=True):
+    # Moyenne 1500, écart-type 50
+    niveaux = tirage("niveau_E").normal(1500, 50, fin - debut)
+    if bool_elo_depart_identique:
+        return _colonnes(np.full(fin - debut, 1500.0), niveaux)
+    return _colonnes(niveaux, tirage("elo").normal(1500, 300, fin - debut))
+
+def creer_joueurs_gaussiens_elo(n: int, bool_elo_depart_identique=True, en_population=False, rng=None) -> list[Joueur]:
     """Test: L'influence du elo initiale sur le reste de la compétition, on choisit si le niveau est identique ou decorélé en gaussienne"""
-    joueurs = []
-    # Moyenne 1500, écart-type 300
-    niveaux = np.random.normal(1500, 50, n)
-    if bool_elo_depart_identique:   
-        for i, niv in enumerate(niveaux):
-            joueurs.append(Joueur(f"J_Gauss_{i}", elo=niv, niveau_E=1500))   
-    else:
-        elo=np.random.normal(1500,300,n)
-        for i, niv in enumerate(niveaux):
-             joueurs.append(Joueur(f"J_Gauss_{i}", elo=elo[i], niveau_E=niv))                        
-    return joueurs
+    return _creer("gaussiens_elo", n, rng, en_population, bool_elo_depart_identique=bool_elo_depart_identique)
 
 # -----------------------------------------------------------
 # 8. Distribution UNIFORME en variance
 # -----------------------------------------------------------
-def creer_joueurs_uniformes_variance(n: int, elo_depart: int = 1200) -> list[Joueur]:
+def _bloc_uniformes_variance(tirage, debut, fin, n, elo_depart=1200):
+    # Même espérance (linéaire de 1000 à 2000), variance tirée autour de 1000
+    niveaux_V = tirage("niveau_V").normal(1000, 300, fin - debut)
+    return _colonnes(_lineaire(np.arange(debut, fin), n, 1000, 2000), elo_depart, niveaux_V)
+
+def creer_joueurs_uniformes_variance(n: int, elo_depart: int = 1200, en_population=False, rng=None) -> list[Joueur]:
     """Meme niveau moyen (espérance) mais variance différent"""
-    joueurs = []
-    # Répartition linéaire exacte de 0 à 1000
-    niveaux = np.random.normal(1000, 300, n)
-    niveaux2 = np.linspace(1000, 2000, n)
-    
-    for i, niv in enumerate(niveaux):
-        joueurs.append(Joueur(f"J_Unif_{i}", elo=elo_depart, niveau_E=niveaux2[i], niveau_V=niv))
-    return joueurs
+    return _creer("uniformes_variance", n, rng, en_population, elo_depart=elo_depart)
+
+
+# -----------------------------------------------------------
+# Registre paresseux des populations
+# -----------------------------------------------------------
+# distribution -> (fonction de bloc, préfixe des noms, dernier joueur nommé comme l'avant-dernier)
+FABRIQUES = {
+    "uniformes": (_bloc_uniformes, "J_Unif_", False),
+    "gaussiens": (_bloc_gaussiens, "J_Gauss_", False),
+    "bimodaux": (_bloc_bimodaux, "J_Bim_", False),
+    "asymetriques": (_bloc_asymetriques, "J_Asym_", False),
+    "anormale": (_bloc_anormale, "J_Gauss_", True),
+    "remontada": (_bloc_remontada, "J_Gauss_", True),
+    "gaussiens_elo": (_bloc_gaussiens_elo, "J_Gauss_", False),
+    "uniformes_variance": (_bloc_uniformes_variance, "J_Unif_", False),
+}
+
+COLONNES = ("niveau_E", "niveau_V", "elo")
+
+def _noms(distribution, n):
+    _, prefixe, doublon = FABRIQUES[distribution]
+    if doublon:
+        return [f"{prefixe}{i}" for i in range(n-1)] + [f"{prefixe}{n-2}"]
+    return [f"{prefixe}{i}" for i in range(n)]
+
+def _creer(distribution, n, rng, en_population, **params):
+    """Fabriques historiques : un seul bloc [0, n), toutes les colonnes tirées dans rng."""
+    bloc = FABRIQUES[distribution][0]
+    colonnes = bloc(lambda colonne: generateur(rng), 0, n, n, **params)
+    return _construire(_noms(distribution, n), colonnes["niveau_E"], colonnes["elo"],
+                       niveaux_V=colonnes["niveau_V"], en_population=en_population)
+
+
+class SpecPopulation:
+    """
+    Description d'une population (distribution, n, paramètres, graine) : rien n'est tiré
+    avant d'en avoir besoin.
+    - par_blocs(taille)  : génère les colonnes par tranches (aucun objet Joueur)
+    - tableaux()         : les colonnes complètes, calculées une fois puis gardées
+    - population()       : Population neuve sur ces tableaux ; joueurs() : liste de Joueur neuve
+    Chaque colonne a son propre flux (SeedSequence(graine) + numéro de colonne), donc
+    tableaux() et la concaténation de par_blocs() donnent exactement les mêmes valeurs.
+    """
+
+    def __init__(self, distribution, n, graine=0, **params):
+        if distribution not in FABRIQUES:
+            raise ValueError(f"Distribution inconnue: {distribution}")
+        self.distribution = distribution
+        self.n = n
+        self.graine = np.random.SeedSequence(graine).entropy   # graine=None -> tirée une fois pour toutes
+        self.params = params
+        self._tableaux = None
+
+    def _tirage(self):
+        flux = {}
+        def tirage(colonne):
+            if colonne not in flux:
+                sequence = np.random.SeedSequence(self.graine, spawn_key=(COLONNES.index(colonne),))
+                flux[colonne] = np.random.default_rng(sequence)
+            return flux[colonne]
+        return tirage
+
+    def par_blocs(self, taille_bloc=2**16):
+        bloc = FABRIQUES[self.distribution][0]
+        tirage = self._tirage()
+        for debut in range(0, self.n, taille_bloc):
+            yield bloc(tirage, debut, min(debut + taille_bloc, self.n), self.n, **self.params)
+
+    def tableaux(self):
+        if self._tableaux is None:
+            bloc = FABRIQUES[self.distribution][0]
+            self._tableaux = bloc(self._tirage(), 0, self.n, self.n, **self.params)
+        return self._tableaux
+
+    def population(self):
+        t = self.tableaux()
+        return Population(_noms(self.distribution, self.n), t["niveau_E"], t["niveau_V"], t["elo"])
+
+    def joueurs(self):
+        t = self.tableaux()
+        return _construire(_noms(self.distribution, self.n), t["niveau_E"], t["elo"], niveaux_V=t["niveau_V"])
+
+
+class RegistrePopulations:
+    """Noms d'affichage -> SpecPopulation ; seules les populations lues sont tirées."""
+
+    def __init__(self):
+        self.specs = {}
+
+    def enregistrer(self, nom, spec):
+        self.specs[nom] = spec
+        return spec
+
+    def __getitem__(self, nom):
+        return self.specs[nom]
+
+    def __contains__(self, nom):
+        return nom in self.specs
+
+    def __iter__(self):
+        return iter(self.specs)
+
+    def items(self, noms=None):
+        """(nom, spec) pour les noms demandés (tous par défaut)."""
+        return [(nom, self.specs[nom]) for nom in (noms or self.specs)]
+
+
+def registre_standard(n, graine=0):
+    """Les huit distributions de test, sous leurs noms d'affichage."""
+    registre = RegistrePopulations()
+    registre.enregistrer("Uniforme", SpecPopulation("uniformes", n, graine))
+    registre.enregistrer("Gaussienne", SpecPopulation("gaussiens", n, graine))
+    registre.enregistrer("Bimodale", SpecPopulation("bimodaux", n, graine))
+    registre.enregistrer("Asymétrique", SpecPopulation("asymetriques", n, graine))
+    registre.enregistrer("Anormale", SpecPopulation("anormale", n, graine))
+    registre.enregistrer("Remontada", SpecPopulation("remontada", n, graine))
+    registre.enregistrer("Gaussiens_elo_identique", SpecPopulation("gaussiens_elo", n, graine, bool_elo_depart_identique=True))
+    registre.enregistrer("Gaussiens_elo_aleatoire", SpecPopulation("gaussiens_elo", n, graine, bool_elo_depart_identique=False))
+    return registre
 
 
 
@@ -157,25 +299,15 @@ def visualiser_distributions():
     n = 100
     elo_depart = 1200
     
-    # Génération des 4 groupes
-    data = [
-        ("Uniforme", creer_joueurs_uniformes(n, elo_depart)),
-        ("Gaussienne", creer_joueurs_gaussiens(n, elo_depart)),
-        ("Bimodale", creer_joueurs_bimodaux(n, elo_depart)),
-        ("Asymétrique", creer_joueurs_asymetriques(n, elo_depart)),
-        ("Anormale", creer_joueurs_anormale(n, elo_depart)),
-        ("Remontada", creer_joueurs_remontada(n)),
-        ("Gaussiens_elo_identique", creer_joueurs_gaussiens_elo(n, bool_elo_depart_identique=True)),
-        ("Gaussiens_elo_aleatoire", creer_joueurs_gaussiens_elo(n, bool_elo_depart_identique=False))
-
-    ]
+    # Seules les 4 premières distributions ont une case : on ne tire que celles-là
+    data = registre_standard(n).items()[:4]
 
     fig, axs = plt.subplots(2, 2, figsize=(12, 10))
     fig.suptitle(f"Niveaux Réels des Joueurs (Elo départ fixe: {elo_depart})", fontsize=16)
 
-    for ax, (titre, joueurs) in zip(axs.flat, data):
+    for ax, (titre, spec) in zip(axs.flat, data):
         # On extrait les niveaux réels et on les trie pour voir la courbe
-        niveaux_reels = sorted([j.niveau_E for j in joueurs])
+        niveaux_reels = np.sort(spec.tableaux()["niveau_E"])
         
         # Courbe des niveaux réels
         ax.plot(niveaux_reels, color='tab:orange', label='Niveau Réel', linewidth=2)
@@ -190,20 +322,11 @@ def visualiser_distributions():
     plt.show()
 
 # --- Fonction de Visualisation ---
-def plot_distributions_histogrammes():
+def plot_distributions_histogrammes(noms=None):
     n = 100  # Nombre élevé pour avoir de beaux histogrammes
     
-    # Création des données
-    data = {
-        "Uniforme": creer_joueurs_uniformes(n),
-        "Gaussienne": creer_joueurs_gaussiens(n),
-        "Bimodale": creer_joueurs_bimodaux(n),
-        "Asymétrique": creer_joueurs_asymetriques(n),
-        "Anormale": creer_joueurs_anormale(n),
-        "Remontada": creer_joueurs_remontada(n),
-        "Gaussiens_elo_identique": creer_joueurs_gaussiens_elo(n, bool_elo_depart_identique=True),
-        "Gaussiens_elo_aleatoire": creer_joueurs_gaussiens_elo(n, bool_elo_depart_identique=False)
-    }
+    # Création des données (seulement les distributions demandées)
+    data = registre_standard(n).items(noms)
 
     # Configuration de la figure : len(data)=8 lignes (distributions), 2 colonnes (types de graphiques)
     fig, axs = plt.subplots(len(data), 2, figsize=(14, 16))
@@ -211,10 +334,10 @@ def plot_distributions_histogrammes():
     
     colors = ['#'+''.join(choices('0123456789ABCDEF', k=6)) for _ in range(len(data))]
 
-    for i, (name, joueurs) in enumerate(data.items()):
+    for i, (name, spec) in enumerate(data):
         # Extraction des niveaux réels
-        niveaux = [j.niveau_E for j in joueurs]
-        niveaux_trie = sorted(niveaux)
+        niveaux = spec.tableaux()["niveau_E"]
+        niveaux_trie = np.sort(niveaux)
         c = colors[i]
 
         # -------------------------------------------------------
@@ -244,19 +367,10 @@ def plot_distributions_histogrammes():
     plt.show()
 
 
-def plot_distributions_histogrammes_separe(savefig=False, folder="plots"):
+def plot_distributions_histogrammes_separe(savefig=False, folder="plots", noms=None):
     n = 1000
     
-    data = {
-        "Uniforme": creer_joueurs_uniformes(n),
-        "Gaussienne": creer_joueurs_gaussiens(n),
-        "Bimodale": creer_joueurs_bimodaux(n),
-        "Asymétrique": creer_joueurs_asymetriques(n),
-        "Anormale": creer_joueurs_anormale(n),
-        "Remontada": creer_joueurs_remontada(n),
-        "Gaussiens_elo_identique": creer_joueurs_gaussiens_elo(n, bool_elo_depart_identique=True),
-        "Gaussiens_elo_aleatoire": creer_joueurs_gaussiens_elo(n, bool_elo_depart_identique=False)
-    }
+    data = registre_standard(n).items(noms)
 
     def pearson_corr(x, y):
         x = np.array(x)
@@ -267,9 +381,9 @@ def plot_distributions_histogrammes_separe(savefig=False, folder="plots"):
     if savefig:
         os.makedirs(folder, exist_ok=True)
 
-    for name, joueurs in data.items():
-        niveaux = np.array([j.niveau_E for j in joueurs])
-        elos = np.array([j.elo for j in joueurs])
+    for name, spec in data:
+        niveaux = spec.tableaux()["niveau_E"]
+        elos = spec.tableaux()["elo"]
 
         # tri conjoint selon niveau
         idx = np.argsort(niveaux)
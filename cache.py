@@ -0,0 +1,158 @@
+# cache.py
+# Cache disque des résultats de simulation, adressé par le contenu : la clé est un hash de
+# tout ce qui détermine le résultat (population, type de tournoi, paramètres, mode de match,
+# graine) et du code de simulation (sources des modules du projet chargés : tournoi.py, match.py,
+# elo.py...). Une configuration déjà calculée est relue au lieu d'être resimulée ; modifier le
+# code change la clé, une entrée calculée par un ancien code n'est donc jamais relue.
+# Éviction LRU sous un budget disque : la date de modification d'une entrée est remise à jour
+# à chaque lecture, on supprime les plus anciennes quand le budget est dépassé.
+import hashlib
+import os
+import pickle
+import sys
+from functools import lru_cache
+import numpy as np
+
+VERSION = 2   # format des clés et des entrées
+DOSSIER_PROJET = os.path.dirname(os.path.abspath(__file__))
+_sources = {}   # chemin -> (date de modification, hash du fichier)
+
+
+def _hash_fichier(chemin):
+    date = os.stat(chemin).st_mtime_ns
+    if chemin not in _sources or _sources[chemin][0] != date:
+        with open(chemin, "rb") as f:
+            _sources[chemin] = (date, hashlib.sha256(f.read()).hexdigest())
+    return _sources[chemin][1]
+
+
+@lru_cache(maxsize=None)
+def _fichiers_projet(dossiers, n_modules):
+    """Sources des modules chargés situés dans dossiers (recalculé quand un module est importé)."""
+    return sorted({os.path.abspath(m.__file__) for m in list(sys.modules.values())
+                   if getattr(m, "__file__", None) and m.__file__.endswith(".py")
+                   and os.path.dirname(os.path.abspath(m.__file__)) in dossiers})
+
+
+def empreinte_code(fonction):
+    """
+    Hash des sources dont dépend fonction : son module et tous les modules du projet déjà chargés
+    (ceux du dossier de cache.py et du dossier de la fonction, par ex. v2_projet_them/).
+    """
+    dossiers = {DOSSIER_PROJET}
+    module = sys.modules.get(getattr(fonction, "__module__", None))
+    if getattr(module, "__file__", None):
+        dossiers.add(os.path.dirname(os.path.abspath(module.__file__)))
+    h = hashlib.sha256()
+    for chemin in _fichiers_projet(frozenset(dossiers), len(sys.modules)):
+        h.update(f"{os.path.relpath(chemin, DOSSIER_PROJET)}:{_hash_fichier(chemin)};".encode())
+    code = getattr(fonction, "__code__", None)
+    if code is not None:
+        h.update(code.co_code)   # fonction définie hors d'un fichier (interpréteur, notebook)
+    return h.hexdigest()
+
+
+def _empreinte(obj, h):
+    """Ajoute au hash h une représentation canonique de obj (tableaux, conteneurs, objets simples)."""
+    if isinstance(obj, np.ndarray):
+        h.update(f"nd{obj.dtype.str}{obj.shape}".encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, (list, tuple)):
+        h.update(f"{type(obj).__name__}{len(obj)}(".encode())
+        for x in obj:
+            _empreinte(x, h)
+        h.update(b")")
+    elif isinstance(obj, dict):
+        h.update(f"dict{len(obj)}(".encode())
+        for k in sorted(obj, key=repr):
+            _empreinte(k, h)
+            _empreinte(obj[k], h)
+        h.update(b")")
+    elif isinstance(obj, (str, bytes, int, float, bool, type(None), np.generic)):
+        h.update(f"{type(obj).__name__}:{obj!r};".encode())
+    elif callable(obj) and hasattr(obj, "__qualname__"):
+        h.update(f"fn:{obj.__module__}.{obj.__qualname__}@{empreinte_code(obj)};".encode())
+    else:
+        # Joueur, Population... : attributs publics seulement (les caches "_x" ne comptent pas)
+        attributs = {k: v for k, v in vars(obj).items() if not k.startswith("_")}
+        h.update(f"obj:{type(obj).__name__}".encode())
+        _empreinte(attributs, h)
+
+
+def cle(*parties):
+    """Hash hexadécimal (sha256) de la configuration."""
+    h = hashlib.sha256(f"v{VERSION};".encode())
+    _empreinte(parties, h)
+    return h.hexdigest()
+
+
+class CacheSimulation:
+    """
+    Dossier de résultats picklés, un fichier par clé (dossier/ab/abcdef....pkl).
+    - obtenir(cle, calcul) : relit l'entrée ou appelle calcul() puis l'enregistre
+    - appel(fonction, *args, contexte=(), **kwargs) : idem avec la clé calculée sur
+      la fonction, ses arguments et un contexte (population, mode de match...)
+    """
+
+    def __init__(self, dossier=".cache_simulations", budget_octets=512 * 2**20):
+        self.dossier = dossier
+        self.budget_octets = budget_octets
+        self._taille = None   # taille totale connue (calculée au premier besoin)
+
+    def _chemin(self, cle):
+        return os.path.join(self.dossier, cle[:2], cle + ".pkl")
+
+    def obtenir(self, cle, calcul):
+        chemin = self._chemin(cle)
+        try:
+            with open(chemin, "rb") as f:
+                valeur = pickle.load(f)
+            os.utime(chemin)   # utilisée récemment
+            return valeur
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            pass
+
+        valeur = calcul()
+        os.makedirs(os.path.dirname(chemin), exist_ok=True)
+        temporaire = f"{chemin}.{os.getpid()}.tmp"
+        with open(temporaire, "wb") as f:
+            pickle.dump(valeur, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporaire, chemin)
+
+        if self._taille is not None:
+            self._taille += os.path.getsize(chemin)
+        if self.taille() > self.budget_octets:
+            self.evincer()
+        return valeur
+
+    def appel(self, fonction, *args, contexte=(), **kwargs):
+        return self.obtenir(cle(fonction, contexte, args, kwargs), lambda: fonction(*args, **kwargs))
+
+    def _entrees(self):
+        entrees = []
+        for racine, _, fichiers in os.walk(self.dossier):
+            for nom in fichiers:
+                if nom.endswith(".pkl"):
+                    st = os.stat(os.path.join(racine, nom))
+                    entrees.append((st.st_mtime, st.st_size, os.path.join(racine, nom)))
+        return entrees
+
+    def taille(self):
+        if self._taille is None:
+            self._taille = sum(taille for _, taille, _ in self._entrees())
+        return self._taille
+
+    def evincer(self):
+        """Supprime les entrées les moins récemment utilisées jusqu'à repasser sous le budget."""
+        entrees = sorted(self._entrees())
+        self._taille = sum(taille for _, taille, _ in entrees)
+        for _, taille, chemin in entrees:
+            if self._taille <= self.budget_octets:
+                break
+            os.remove(chemin)
+            self._taille -= taille
+
+    def vider(self):
+        for _, _, chemin in self._entrees():
+            os.remove(chemin)
+        self._taille = 0
@@ -0,0 +1,109 @@
+# elo.py
+# Noyau partagé du score attendu Elo : E = 1 / (1 + 10^(-diff/400)), proba que le joueur 1 gagne
+# quand il a diff points de plus que le joueur 2. Forme scalaire (score_attendu) et forme
+# tableau (scores_attendus), utilisées par tous les modes de match.
+# Deux implémentations :
+#   - formule exacte, écrite 1 / (1 + exp(-c * diff)) avec c = ln(10)/400 précalculé (par défaut)
+#   - table précalculée à pas régulier + interpolation linéaire, d'erreur bornée par une tolérance
+#     (configurer_precision). Voir le micro-benchmark en bas du fichier pour choisir.
+from math import exp, log, log10, sqrt
+
+import numpy as np
+
+ECHELLE = 400
+_C = log(10) / ECHELLE     # 10^(-d/400) = exp(-_C * d)
+
+
+def score_attendu_exact(diff):
+    """Formule exacte, scalaire ou tableau."""
+    return 1 / (1 + 10 ** (-np.asarray(diff, dtype=float) / ECHELLE))
+
+
+class TableScoreAttendu:
+    """
+    Table du score attendu sur [-borne, borne], interpolée linéairement.
+    - pas   : l'erreur d'interpolation est <= pas² / 8 * max|E''|, max|E''| = (ln10/400)² / (6√3)
+    - borne : au-delà, E est à moins de tolerance de 0 ou 1, on renvoie la valeur du bord
+    L'écart à score_attendu_exact est donc <= tolerance partout.
+    """
+
+    def __init__(self, tolerance=1e-6):
+        courbure_max = _C ** 2 / (6 * sqrt(3))
+        self.tolerance = tolerance
+        self.borne = ECHELLE * log10(1 / tolerance - 1)
+        n_points = int(np.ceil(2 * self.borne / sqrt(8 * tolerance / courbure_max))) + 1
+        self.x = np.linspace(-self.borne, self.borne, n_points)
+        self.pas = self.x[1] - self.x[0]
+        self.valeurs = score_attendu_exact(self.x)
+        self._valeurs = self.valeurs.tolist()    # liste : accès scalaire plus rapide qu'un tableau
+        self._inv_pas = 1 / self.pas
+        self._dernier = n_points - 1
+
+    def __call__(self, diff):
+        """Score attendu pour une différence scalaire."""
+        position = (diff + self.borne) * self._inv_pas
+        if position <= 0:
+            return self._valeurs[0]
+        if position >= self._dernier:
+            return self._valeurs[-1]
+        i = int(position)
+        v = self._valeurs[i]
+        return v + (position - i) * (self._valeurs[i + 1] - v)
+
+    def tableau(self, diffs):
+        """Score attendu pour un tableau de différences."""
+        position = (np.asarray(diffs, dtype=float) + self.borne) * self._inv_pas
+        np.clip(position, 0, self._dernier, out=position)
+        i = np.minimum(position.astype(np.intp), self._dernier - 1)
+        v = self.valeurs[i]
+        return v + (position - i) * (self.valeurs[i + 1] - v)
+
+
+_table = None     # None : formule exacte
+
+
+def configurer_precision(tolerance):
+    """
+    tolerance > 0 : score attendu lu dans une table d'erreur <= tolerance
+    tolerance = 0 : formule exacte (par défaut)
+    """
+    global _table
+    _table = TableScoreAttendu(tolerance) if tolerance > 0 else None
+
+
+def score_attendu(diff):
+    """Proba que le joueur 1 gagne, diff = elo1 - elo2 (scalaire)."""
+    if _table is None:
+        return 1 / (1 + exp(-_C * diff))
+    return _table(diff)
+
+
+def scores_attendus(diffs):
+    """Version tableau de score_attendu."""
+    if _table is None:
+        return 1 / (1 + np.exp(-_C * np.asarray(diffs, dtype=float)))
+    return _table.tableau(diffs)
+
+
+if __name__ == "__main__":
+    # micro-benchmark : coût par match du score attendu, code d'origine / noyau exact / table
+    import timeit
+
+    diffs = np.random.normal(0, 300, 10**6)
+    liste = diffs[:10**5].tolist()
+
+    def par_match(f, donnees, repetitions=5):
+        return timeit.timeit(lambda: f(donnees), number=repetitions) / (repetitions * len(donnees)) * 1e9
+
+    avant = par_match(lambda l: [1 / (1 + 10 ** (-d / 400)) for d in l], liste)
+    exact = par_match(lambda l: [score_attendu(d) for d in l], liste)
+    avant_t = par_match(lambda d: 1 / (1 + 10 ** (-d / 400)), diffs)
+    exact_t = par_match(scores_attendus, diffs)
+    configurer_precision(1e-6)
+    table = par_match(lambda l: [score_attendu(d) for d in l], liste)
+    table_t = par_match(scores_attendus, diffs)
+
+    print(f"scalaire : avant {avant:.0f} ns/match | noyau exact {exact:.0f} | table {table:.0f}")
+    print(f"tableau  : avant {avant_t:.1f} ns/match | noyau exact {exact_t:.1f} | table {table_t:.1f}")
+    erreur = np.max(np.abs(scores_attendus(diffs) - score_attendu_exact(diffs)))
+    print(f"erreur max de la table sur 10^6 tirages : {erreur:.2e} (tolérance 1e-06, {len(_table.x)} points)")
@@ -0,0 +1,136 @@
+# gabarits.py
+# Tableaux d'élimination compilés une fois pour toutes : pour une taille n et un choix des
+# exempts (toujours le premier en mode Elo, tirés au hasard sinon), on précalcule la liste plate
+# des matchs — qui rencontre qui, où tombent les perdants, quelle place reçoit chaque sortie.
+# Simuler un tableau revient alors à parcourir quelques tableaux d'entiers.
+from functools import lru_cache
+from math import ceil
+import numpy as np
+
+
+class Gabarit:
+    """
+    Liste plate des matchs d'un tableau de n joueurs.
+    Nœuds : 0..n-1 = joueurs dans l'ordre du tableau ; n+2k = vainqueur du match k ;
+    n+2k+1 = perdant du match k.
+    - u, v       : nœuds qui s'affrontent au match k (u a le rôle de j1)
+    - sortie     : place donnée au perdant du match k (-1 : il continue dans le tableau)
+    - vainqueur  : nœud du vainqueur final, sortie_vainqueur : sa place
+    - tours      : bornes [debut, fin) des groupes de matchs indépendants, dans l'ordre de jeu
+    Construit tour par tour avec des opérations NumPy (quelques dizaines de µs), ce qui rend
+    négligeable la compilation d'un gabarit pas encore en cache.
+    """
+
+    def __init__(self, n):
+        self.n = n
+        self._u, self._v, self._sortie = [], [], []
+        self.n_matchs = 0
+        self.tours = []
+        self.vainqueur = 0
+        self.sortie_vainqueur = 0
+
+    def tour(self, j1, j2, sortie):
+        """Ajoute un tour (tableaux de nœuds j1, j2) ; renvoie les nœuds vainqueurs et perdants."""
+        debut, m = self.n_matchs, len(j1)
+        self._u.append(j1)
+        self._v.append(j2)
+        self._sortie.append(np.broadcast_to(sortie, (m,)))
+        self.n_matchs += m
+        if m:
+            self.tours.append((debut, self.n_matchs))
+        k = np.arange(debut, self.n_matchs)
+        return self.n + 2 * k, self.n + 2 * k + 1
+
+    def figer(self):
+        """Tableaux NumPy (pour les lots) et listes (pour le parcours scalaire)."""
+        vide = np.zeros(0, dtype=np.intp)
+        self.u_np = np.concatenate([vide] + self._u).astype(np.intp)
+        self.v_np = np.concatenate([vide] + self._v).astype(np.intp)
+        self.sortie_np = np.concatenate([vide] + self._sortie).astype(int)
+        self.u, self.v, self.sortie = self.u_np.tolist(), self.v_np.tolist(), self.sortie_np.tolist()
+        del self._u, self._v, self._sortie
+        return self
+
+    @property
+    def n_noeuds(self):
+        return self.n + 2 * self.n_matchs
+
+
+def nb_exempts(n):
+    """Nombre de tours à effectif impair (donc d'exempts) d'un tableau à élimination directe de n joueurs."""
+    k = 0
+    while n > 1:
+        k += n % 2
+        n = (n + 1) // 2
+    return k
+
+
+def _retirer(noeuds, i):
+    return noeuds[i], np.delete(noeuds, i)
+
+
+@lru_cache(maxsize=4096)
+def gabarit_directe(n, exempts):
+    """
+    Élimination directe (mêmes règles que Tournoi.elimination_directe) : à chaque tour, le
+    joueur d'indice exempts[t] passe si l'effectif est impair, puis i rencontre m-1-i.
+    Le perdant d'un tour reçoit la place classement_actuel (ceil(log2(n)+1) au premier tour).
+    """
+    g = Gabarit(n)
+    exempts = iter(exempts)
+    noeuds = np.arange(n)
+    rang = ceil(np.log2(n) + 1)
+    while len(noeuds) > 1:
+        exempt = None
+        if len(noeuds) % 2 == 1:
+            exempt, noeuds = _retirer(noeuds, next(exempts))
+        moitie = len(noeuds) // 2
+        vainqueurs, _ = g.tour(noeuds[:moitie], noeuds[::-1][:moitie], rang)
+        noeuds = vainqueurs if exempt is None else np.concatenate([[exempt], vainqueurs])
+        rang -= 1
+    g.vainqueur = int(noeuds[0])
+    g.sortie_vainqueur = rang
+    return g.figer()
+
+
+@lru_cache(maxsize=4096)
+def gabarit_double(n, exempts):
+    """
+    Double élimination (Tournoi.elimination_double) :
+    - tableau principal comme l'élimination directe, les perdants descendent dans le tableau bas
+      (ajoutés après ses survivants) ;
+    - après chaque tour du haut, le bas joue (j contre m-1-j, exempt = premier si impair) jusqu'à
+      ne garder que max(1, len(haut)//2) joueurs ;
+    - finale entre le vainqueur du haut et celui du bas.
+    Les places vont de 0 (premier éliminé) à n-1 (vainqueur).
+    """
+    g = Gabarit(n)
+    exempts = iter(exempts)
+    place = 0
+    haut = np.arange(n)
+    bas = np.zeros(0, dtype=int)
+    while len(haut) > 1:
+        exempt = None
+        if len(haut) % 2 == 1:
+            exempt, haut = _retirer(haut, next(exempts))
+        moitie = len(haut) // 2
+        vainqueurs, perdants = g.tour(haut[:moitie], haut[::-1][:moitie], -1)
+        haut = vainqueurs if exempt is None else np.concatenate([[exempt], vainqueurs])
+        bas = np.concatenate([bas, perdants])
+
+        while len(bas) > max(1, len(haut) // 2):
+            exempt = None
+            if len(bas) % 2 == 1:
+                exempt, bas = _retirer(bas, 0)
+            moitie = len(bas) // 2
+            vainqueurs, _ = g.tour(bas[:moitie], bas[::-1][:moitie], place + np.arange(moitie))
+            place += moitie
+            bas = vainqueurs if exempt is None else np.concatenate([[exempt], vainqueurs])
+
+    if len(bas):
+        vainqueurs, _ = g.tour(haut[:1], bas[:1], place)
+        place += 1
+        haut = vainqueurs
+    g.vainqueur = int(haut[0])
+    g.sortie_vainqueur = place
+    return g.figer()
@@ -0,0 +1,124 @@
+# grille.py
+# Moteur d'expériences en grille pour l'étude de robustesse de stats.py.
+# Pour une configuration (n_joueurs, ecart_entre_joueurs), tous les tournois de tout un bloc
+# (valeurs de V x tournois simulés) sont tirés en un seul appel NumPy puis classés d'un coup.
+from itertools import product
+
+import numpy as np
+
+import metriques_rang
+from accumulateur import StatistiqueCourante
+
+METRIQUES_GRILLE = ("mae", "kendall", "spearman")
+
+
+def classer_avec_departage(points, duel):
+    """
+    Classements du pire au meilleur (lignes, n) à partir des points (lignes, n), ex aequo départagés
+    comme stats.tournoi_points_round_robin_tiebreaker_is_match : les joueurs arrivent dans l'ordre
+    des indices ; un nouveau venu à égalité joue contre la tête du groupe (le moins bien placé des
+    ex aequo déjà classés) : s'il perd il devient la nouvelle tête, s'il gagne il se place juste
+    après elle. Tri stable par points, puis une passe linéaire sur les colonnes.
+    - duel(nouveau, tete, lignes) : tableau booléen, vrai si le joueur nouveau bat le joueur tete
+      (appelé seulement sur les lignes où il y a égalité)
+    """
+    points = np.atleast_2d(points)
+    n_lignes, n = points.shape
+    lignes = np.arange(n_lignes)
+    ordre = np.argsort(points, axis=-1, kind="stable")
+    tries = np.take_along_axis(points, ordre, axis=-1)
+
+    # cle[ligne, joueur] : place dans son groupe d'ex aequo. La tête finale est la plus basse, puis
+    # les vainqueurs des duels successifs, le dernier vainqueur juste au-dessus de la tête.
+    cle = np.zeros((n_lignes, n), dtype=np.intp)
+    tete = ordre[:, 0].copy()
+    for k in range(1, n):
+        nouveau = ordre[:, k]
+        egalite = tries[:, k] == tries[:, k - 1]
+        cle[lignes[~egalite], tete[~egalite]] = -n - 1   # groupe terminé : sa tête est fixée
+        tete[~egalite] = nouveau[~egalite]
+        l = lignes[egalite]
+        gagne = np.asarray(duel(nouveau[l], tete[l], l), dtype=bool)
+        cle[l, np.where(gagne, nouveau[l], tete[l])] = -k
+        tete[l] = np.where(gagne, tete[l], nouveau[l])
+    cle[lignes, tete] = -n - 1
+    return np.lexsort((cle, points), axis=-1)
+
+
+def round_robin_tiebreaker_lot(niveaux_E, valeurs_V, n_tournois, rng=np.random):
+    """
+    Version tableau de stats.tournoi_points_round_robin_tiebreaker_is_match.
+    - niveaux_E : espérance du niveau de chaque joueur (n,)
+    - valeurs_V : écart-type des performances, une valeur par ligne du bloc (v,)
+    Renvoie les classements (v, n_tournois, n), du pire au meilleur.
+
+    Chaque match compare deux performances N(E_i, V) et N(E_j, V) ; on tire directement leur
+    différence N(E_i - E_j, V*sqrt(2)), même loi, un seul nombre par match.
+    Départage des ex aequo : la même règle que stats (classer_avec_departage), chaque duel contre
+    la tête du groupe étant tiré de la même façon, N(E_nouveau - E_tete, V*sqrt(2)) > 0.
+    """
+    niveaux_E = np.asarray(niveaux_E, dtype=float)
+    valeurs_V = np.asarray(valeurs_V, dtype=float)
+    n = len(niveaux_E)
+    n_lignes = len(valeurs_V) * n_tournois
+
+    fort, faible = np.triu_indices(n, k=1)[::-1]   # comme stats : le joueur d'indice haut contre les autres
+    ecart_type = (valeurs_V * np.sqrt(2))[:, None, None]
+    diff = rng.normal(niveaux_E[fort] - niveaux_E[faible], ecart_type,
+                      size=(len(valeurs_V), n_tournois, len(fort)))
+    fort_gagne = (diff > 0).reshape(n_lignes, -1)
+
+    # points : une somme par (ligne, joueur) via un bincount sur des indices aplatis
+    decalage = (np.arange(n_lignes) * n)[:, None]
+    points = np.bincount((decalage + fort).ravel(), weights=fort_gagne.ravel(), minlength=n_lignes * n)
+    points += np.bincount((decalage + faible).ravel(), weights=~fort_gagne.ravel(), minlength=n_lignes * n)
+    points = points.reshape(n_lignes, n)
+
+    # égalités de points départagées par des matchs contre la tête du groupe (comme stats)
+    ecart_ligne = np.repeat(valeurs_V * np.sqrt(2), n_tournois)
+    duel = lambda nouveau, tete, lignes: rng.normal(niveaux_E[nouveau] - niveaux_E[tete], ecart_ligne[lignes]) > 0
+    classements = classer_avec_departage(points, duel)
+    return classements.reshape(len(valeurs_V), n_tournois, n)
+
+
+def experience_grille(valeurs_V, n_tournois_simules, n_joueurs=(20,), ecart_entre_joueurs=(1,),
+                      max_tirages=2 * 10**7, rng=np.random):
+    """
+    Balaye la grille n_joueurs x ecart_entre_joueurs x valeurs_V. Le joueur i a le niveau
+    i * ecart ; le classement de référence est range(n) (du pire au meilleur).
+    Les valeurs de V sont traitées par blocs d'au plus max_tirages matchs tirés d'un coup.
+    Renvoie {métrique: {"moyenne": tableau, "std": tableau}} de forme
+    (len(n_joueurs), len(ecart_entre_joueurs), len(valeurs_V)).
+    """
+    valeurs_V = np.asarray(valeurs_V, dtype=float)
+    forme = (len(n_joueurs), len(ecart_entre_joueurs), len(valeurs_V))
+    resultats = {m: {"moyenne": np.zeros(forme), "std": np.zeros(forme)} for m in METRIQUES_GRILLE}
+
+    for (a, n), (b, ecart) in product(enumerate(n_joueurs), enumerate(ecart_entre_joueurs)):
+        niveaux_E = np.arange(n) * ecart
+        reference = np.arange(n)
+        matchs_par_V = n_tournois_simules * n * (n - 1) // 2
+        bloc_V = max(1, max_tirages // matchs_par_V)
+        bloc_tournois = n_tournois_simules if bloc_V > 1 else max(1, max_tirages // (n * (n - 1) // 2))
+
+        for debut in range(0, len(valeurs_V), bloc_V):
+            V = valeurs_V[debut:debut + bloc_V]
+            stats = {m: StatistiqueCourante((len(V),)) for m in METRIQUES_GRILLE}
+            for t in range(0, n_tournois_simules, bloc_tournois):
+                classements = round_robin_tiebreaker_lot(niveaux_E, V, min(bloc_tournois, n_tournois_simules - t), rng)
+                valeurs = {
+                    "mae": metriques_rang.mae(reference, classements),
+                    "kendall": metriques_rang.kendall_tau(reference, classements),
+                    "spearman": metriques_rang.spearman(reference, classements),
+                }
+                for m, v in valeurs.items():
+                    partiel = StatistiqueCourante((len(V),))
+                    partiel.n = v.shape[1]
+                    partiel.moyenne = v.mean(axis=1)
+                    partiel.m2 = v.var(axis=1) * v.shape[1]
+                    stats[m].fusionner(partiel)
+            for m in METRIQUES_GRILLE:
+                resultats[m]["moyenne"][a, b, debut:debut + bloc_V] = stats[m].moyenne
+                resultats[m]["std"][a, b, debut:debut + bloc_V] = stats[m].ecart_type
+
+    return resultats
@@ -7,12 +7,12 @@ import numpy as np
 from random import choices
 import matplotlib.pyplot as plt
 import pandas as pd
-from copy import deepcopy
 
 from bdd import *
-from match import match
 from joueur import Joueur
-from tournoi import Tournoi, J1_GAGNE, J2_GAGNE
+from monte_carlo import etude_parallele
+from arret import ArretIntervalle, economie
+from resultats import MagasinResultats
 
 from analytics import snapshots_to_df, rank_round, metrics, topk_accuracy
 
@@ -26,15 +26,15 @@ data = {
         "Remontada": creer_joueurs_remontada(n),
         "Gaussiens_elo_identique": creer_joueurs_gaussiens_elo(n, bool_elo_depart_identique=True),
         "Gaussiens_elo_aleatoire": creer_joueurs_gaussiens_elo(n, bool_elo_depart_identique=False),
-        "Uniforme_variance": creer_joueurs_uniformes_variance(n)
+        "Uniforme_variance": creer_joueurs_uniformes_variance(n, en_population=True)
     }
 """
 
-def etude_tournoi(tournoi_selectionne, nb_execution, savefig=False, folder="plots"):
+def etude_tournoi(tournoi_selectionne, nb_execution, savefig=False, folder="plots", n_workers=None, graine=0, magasin=None, arret=None):
     n = 400
 
     data = {
-        "Uniforme_variance": creer_joueurs_uniformes_variance(n)
+        "Uniforme_variance": creer_joueurs_uniformes_variance(n, en_population=True)
     }
 
     if savefig:
@@ -42,35 +42,27 @@ def etude_tournoi(tournoi_selectionne, nb_execution, savefig=False, folder="plot
 
     for name, joueurs_initiaux in data.items():
 
-        noms = [j.nom for j in joueurs_initiaux]
-        niveaux_base = np.array([j.niveau_E for j in joueurs_initiaux])
-        elos_base = np.array([j.elo for j in joueurs_initiaux])
-
-        rang_cumul = np.zeros(n)  # cumul des rangs
-        rang_sq_cumul = np.zeros(n)  # cumul des carrés pour variance
-
-        for _ in range(nb_execution):
-            joueurs = [deepcopy(j) for j in joueurs_initiaux]
-
-            tournoi = Tournoi(participants=joueurs, match=match("NIVEAU"))
-            methode = getattr(tournoi, tournoi_selectionne)
-            classement = methode()
-
-            rang_dict = {}
-            rang = len(classement) - 1
-            for sous_liste in classement:
-                for j in sous_liste:
-                    rang_dict[j.nom] = rang
-                rang -= 1
-
-            for i, nom in enumerate(noms):
-                r = rang_dict[nom]
-                rang_cumul[i] += r
-                rang_sq_cumul[i] += r**2
-
-        rang_mean = rang_cumul / nb_execution
-        rang_var = (rang_sq_cumul / nb_execution) - rang_mean**2
-        rang_std = np.sqrt(rang_var)
+        niveaux_base = joueurs_initiaux.niveau_E.copy()
+        elos_base = joueurs_initiaux.elo.copy()
+
+        # runs répartis sur n_workers processus, chacun ne renvoie que son accumulateur partiel
+        accumulateur = etude_parallele(
+            joueurs_initiaux, tournoi_selectionne, "NIVEAU", nb_execution,
+            n_workers=n_workers, graine=graine, arret=arret,
+        )
+        runs = accumulateur.n   # < nb_execution si arret a été atteint avant
+        if arret is not None:
+            e = economie(runs, nb_execution)
+            print(f"{name} : {runs} runs sur {nb_execution} ({e['economises']} économisés)")
+        rang_mean = accumulateur.rangs.moyenne
+        rang_std = accumulateur.rangs.ecart_type
+
+        if magasin is not None:   # rang moyen / écart-type par joueur, pour retracer sans resimuler
+            magasin.ecrire({
+                "niveau_E": niveaux_base, "niveau_V": joueurs_initiaux.niveau_V, "elo": joueurs_initiaux.elo,
+                "rang_moyen": rang_mean, "rang_std": rang_std, "runs": [runs] * n,
+                "type_match": ["NIVEAU"] * n,
+            }, format=tournoi_selectionne, distribution=name, graine=graine)
 
         idx = np.argsort(niveaux_base)
         niveaux_trie = niveaux_base[idx]
@@ -82,7 +74,7 @@ def etude_tournoi(tournoi_selectionne, nb_execution, savefig=False, folder="plot
         spearman_elo = np.corrcoef(np.argsort(elos_base), rang_mean)[0,1]
 
         fig, axs = plt.subplots(2, 2, figsize=(12, 8))
-        fig.suptitle(f"{name} (N={n}, runs={nb_execution})", fontsize=15)
+        fig.suptitle(f"{name} (N={n}, runs={runs})", fontsize=15)
 
         c = '#' + ''.join(choices('0123456789ABCDEF', k=6))
 
@@ -118,11 +110,11 @@ def etude_tournoi(tournoi_selectionne, nb_execution, savefig=False, folder="plot
 
 
 
-def etude_variance(tournoi_selectionne, nb_execution, savefig=False, folder="plots"):
+def etude_variance(tournoi_selectionne, nb_execution, savefig=False, folder="plots", n_workers=None, graine=0, magasin=None, arret=None):
     n = 400
 
     data = {
-        "Uniforme_variance": creer_joueurs_uniformes_variance(n)
+        "Uniforme_variance": creer_joueurs_uniformes_variance(n, en_population=True)
     }
 
     if savefig:
@@ -130,35 +122,27 @@ def etude_variance(tournoi_selectionne, nb_execution, savefig=False, folder="plo
 
     for name, joueurs_initiaux in data.items():
 
-        noms = [j.nom for j in joueurs_initiaux]
-        niveaux_base = np.array([j.niveau_E for j in joueurs_initiaux])
-        niveaux_v_base = np.array([j.niveau_V for j in joueurs_initiaux])
-
-        rang_cumul = np.zeros(n)  # cumul des rangs
-        rang_sq_cumul = np.zeros(n)  # cumul des carrés pour variance
-
-        for _ in range(nb_execution):
-            joueurs = [deepcopy(j) for j in joueurs_initiaux]
-
-            tournoi = Tournoi(participants=joueurs, match=match("INTRINSEQUE"))
-            methode = getattr(tournoi, tournoi_selectionne)
-            classement = methode()
-
-            rang_dict = {}
-            rang = len(classement) - 1
-            for sous_liste in classement:
-                for j in sous_liste:
-                    rang_dict[j.nom] = rang
-                rang -= 1
-
-            for i, nom in enumerate(noms):
-                r = rang_dict[nom]
-                rang_cumul[i] += r
-                rang_sq_cumul[i] += r**2
-
-        rang_mean = rang_cumul / nb_execution
-        rang_var = (rang_sq_cumul / nb_execution) - rang_mean**2
-        rang_std = np.sqrt(rang_var)
+        niveaux_base = joueurs_initiaux.niveau_E.copy()
+        niveaux_v_base = joueurs_initiaux.niveau_V.copy()
+
+        # runs répartis sur n_workers processus, chacun ne renvoie que son accumulateur partiel
+        accumulateur = etude_parallele(
+            joueurs_initiaux, tournoi_selectionne, "INTRINSEQUE", nb_execution,
+            n_workers=n_workers, graine=graine, arret=arret,
+        )
+        runs = accumulateur.n   # < nb_execution si arret a été atteint avant
+        if arret is not None:
+            e = economie(runs, nb_execution)
+            print(f"{name} : {runs} runs sur {nb_execution} ({e['economises']} économisés)")
+        rang_mean = accumulateur.rangs.moyenne
+        rang_std = accumulateur.rangs.ecart_type
+
+        if magasin is not None:   # rang moyen / écart-type par joueur, pour retracer sans resimuler
+            magasin.ecrire({
+                "niveau_E": niveaux_base, "niveau_V": joueurs_initiaux.niveau_V, "elo": joueurs_initiaux.elo,
+                "rang_moyen": rang_mean, "rang_std": rang_std, "runs": [runs] * n,
+                "type_match": ["INTRINSEQUE"] * n,
+            }, format=tournoi_selectionne, distribution=name, graine=graine)
 
         # tri par niveau_E pour affichage
         idx = np.argsort(niveaux_base)
@@ -171,7 +155,7 @@ def etude_variance(tournoi_selectionne, nb_execution, savefig=False, folder="plo
         spearman_niv_V = np.corrcoef(np.argsort(niveaux_v_base), rang_mean)[0,1]
 
         fig, axs = plt.subplots(2, 2, figsize=(12, 8))
-        fig.suptitle(f"{name} (N={n}, runs={nb_execution})", fontsize=15)
+        fig.suptitle(f"{name} (N={n}, runs={runs})", fontsize=15)
 
         c = '#' + ''.join(choices('0123456789ABCDEF', k=6))
 
@@ -210,8 +194,13 @@ def etude_variance(tournoi_selectionne, nb_execution, savefig=False, folder="plo
         plt.show()
 
 
-#etude_tournoi("elimination_direct", 100, savefig=False)
+# garde nécessaire : les workers du ProcessPoolExecutor peuvent ré-importer ce module
+if __name__ == "__main__":
+    #etude_tournoi("elimination_direct", 100, savefig=False)
 
-etude_variance("elimination_double", 100, savefig=False)
+    # jusqu'à 100 runs, arrêt dès que le spearman moyen est connu à ±0.015 près
+    # (écart type du spearman ~0.05 pour 400 joueurs : il en faut ~40-50)
+    etude_variance("elimination_double", 100, savefig=False, magasin=MagasinResultats("resultats_hasard"),
+                   arret=ArretIntervalle(0.015, critere="spearman"))
 
 
@@ -1,8 +1,12 @@
 # joueur.py
-import numpy as np
+from performance import TamponPerformance
 
 class Joueur:
     #TODO ajouter un critère d'égalité avec le niveau intrinsèque gaussien
+    _tampon = None          # réserve de tirages de performance (créée à la première lecture de niveau)
+    _niveau_fige = None     # performance figée pour le match en cours (voir figer_performance)
+    _graine_propre = False  # vrai après graine() : le ContexteAleatoire d'un tournoi ne remplace pas la réserve
+
     def __init__(self, nom, niveau_E=0, niveau_V=0, K=40, elo=1500):
         """
         Représente un joueur avec :
@@ -19,4 +23,22 @@ class Joueur:
 
     @property
     def niveau(self):
-        return np.random.normal(self.niveau_E, self.niveau_V)
+        """Performance du jour : tirage N(niveau_E, niveau_V), pioché dans la réserve du joueur."""
+        if self._niveau_fige is not None:
+            return self._niveau_fige
+        if self._tampon is None:
+            self._tampon = TamponPerformance()
+        return self.niveau_E + self.niveau_V * self._tampon.suivant()
+
+    def graine(self, graine=None, taille=256):
+        """Donne au joueur son propre générateur de performances (reproductible si graine est fixée)."""
+        self._tampon = TamponPerformance(taille, graine=graine)
+        self._graine_propre = True
+
+    def figer_performance(self):
+        """Tire une performance et la renvoie à chaque lecture de niveau jusqu'à liberer_performance."""
+        self._niveau_fige = None
+        self._niveau_fige = self.niveau
+
+    def liberer_performance(self):
+        self._niveau_fige = None
@@ -1,6 +1,4 @@
 # main.py
-import random
-from statistics import mean, pstdev
 from collections import Counter
 
 import os
@@ -14,16 +12,22 @@ from match import Match
 from joueur import Joueur
 from tournoi import Tournoi, J1_GAGNE, J2_GAGNE
 
+from snapshots import EnregistreurSnapshots
 from analytics import snapshots_to_df, rank_round, metrics, topk_accuracy
+from accumulateur import AccumulateurRangs
+from aleatoire import ContexteAleatoire
+from monte_carlo import classement_en_rangs, CLASSEMENTS_INVERSES
+from resultats import MagasinResultats
+from cache import CacheSimulation
 
 # ---------- 1. SIMULATION D'UN TOURNOI SUISSE ----------
 
 def simuler_un_tournoi(nb_rondes: int, seed: int | None = None):
-    if seed is not None:
-        random.seed(seed)
+    rng = ContexteAleatoire(seed)
 
     joueurs = joueurs_belloy()
-    tournoi = Tournoi(participants=joueurs, match=Match("NIVEAU"))
+    tournoi = Tournoi(participants=joueurs, match=Match("NIVEAU", rng),
+                      snapshots=EnregistreurSnapshots(final_seulement=True))   # seule la dernière ronde sert
 
     for r in range(1, nb_rondes + 1):
         tournoi.jouer_ronde(r)
@@ -46,18 +50,17 @@ def simuler_un_tournoi(nb_rondes: int, seed: int | None = None):
 # ---------- 2. SIMULATION ROUND-ROBIN ----------
 
 def simuler_un_tournoi_round_robin(seed: int | None = None):
-    if seed is not None:
-        random.seed(seed)
+    rng = ContexteAleatoire(seed)
 
     joueurs = joueurs_belloy()
-    tournoi = Tournoi(participants=joueurs, match=Match("NIVEAU"))
+    tournoi = Tournoi(participants=joueurs, match=Match("NIVEAU", rng))
 
     n = len(joueurs)
     matchs = []
     for i in range(n):
         for j in range(i + 1, n):
             matchs.append((joueurs[i], joueurs[j]))
-    random.shuffle(matchs)
+    rng.melanger(matchs)
 
     for j1, j2 in matchs:
         resultat = tournoi.match.resultat(j1, j2)
@@ -89,55 +92,51 @@ def simuler_un_tournoi_round_robin(seed: int | None = None):
 # ---------- 3. BOUCLES D’EXPÉRIENCES GLOBALES ----------
 
 def run_experiences(n_experiences, nb_rondes):
-    spearmans, maes, top3s = [], [], []
+    accumulateur = AccumulateurRangs(len(joueurs_belloy()))   # moyennes / variances en flux
     top1_corrects = 0
 
     for t in range(n_experiences):
         s, mae, top3, top1_ok = simuler_un_tournoi(nb_rondes, seed=t)
-        spearmans.append(s)
-        maes.append(mae)
-        top3s.append(top3)
+        accumulateur.ajouter_metriques(spearman=s, mae=mae, topk=top3)
         if top1_ok:
             top1_corrects += 1
 
     print(f"\n=== Résumé sur {n_experiences} tournois de {nb_rondes} rondes ===")
-    print(f"Spearman moyen      : {mean(spearmans):.3f} (écart-type {pstdev(spearmans):.3f})")
-    print(f"MAE de rang moyenne : {mean(maes):.2f} (écart-type {pstdev(maes):.2f})")
-    print(f"Top-3 accuracy moy. : {mean(top3s):.2f}")
+    print(f"Spearman moyen      : {accumulateur.moyenne('spearman'):.3f} (écart-type {accumulateur.ecart_type('spearman'):.3f})")
+    print(f"MAE de rang moyenne : {accumulateur.moyenne('mae'):.2f} (écart-type {accumulateur.ecart_type('mae'):.2f})")
+    print(f"Top-3 accuracy moy. : {accumulateur.moyenne('topk'):.2f}")
     print(f"Top-1 correct       : {top1_corrects}/{n_experiences} = {top1_corrects/n_experiences:.2%}")
 
-    return spearmans, maes, top3s, top1_corrects
+    return accumulateur, top1_corrects
 
 
 def run_experiences_round_robin(n_experiences):
-    spearmans, maes, top3s = [], [], []
+    accumulateur = AccumulateurRangs(len(joueurs_belloy()))   # moyennes / variances en flux
     top1_corrects = 0
 
     for t in range(n_experiences):
         s, mae, top3, top1_ok = simuler_un_tournoi_round_robin(seed=t)
-        spearmans.append(s)
-        maes.append(mae)
-        top3s.append(top3)
+        accumulateur.ajouter_metriques(spearman=s, mae=mae, topk=top3)
         if top1_ok:
             top1_corrects += 1
 
     print(f"\n=== Round-robin : Résumé sur {n_experiences} tournois toutes-rondes ===")
-    print(f"Spearman moyen      : {mean(spearmans):.3f} (écart-type {pstdev(spearmans):.3f})")
-    print(f"MAE de rang moyenne : {mean(maes):.2f} (écart-type {pstdev(maes):.2f})")
-    print(f"Top-3 accuracy moy. : {mean(top3s):.2f}")
+    print(f"Spearman moyen      : {accumulateur.moyenne('spearman'):.3f} (écart-type {accumulateur.ecart_type('spearman'):.3f})")
+    print(f"MAE de rang moyenne : {accumulateur.moyenne('mae'):.2f} (écart-type {accumulateur.ecart_type('mae'):.2f})")
+    print(f"Top-3 accuracy moy. : {accumulateur.moyenne('topk'):.2f}")
     print(f"Top-1 correct       : {top1_corrects}/{n_experiences} = {top1_corrects/n_experiences:.2%}")
 
-    return spearmans, maes, top3s, top1_corrects
+    return accumulateur, top1_corrects
 
 
 # ---------- 4. ANALYSE DU RANG DE MANUEL ----------
 
 def rang_manuel_suisse(nb_rondes: int, seed: int | None = None) -> int:
-    if seed is not None:
-        random.seed(seed)
+    rng = ContexteAleatoire(seed)
 
     joueurs = joueurs_belloy()
-    tournoi = Tournoi(participants=joueurs, match=Match("NIVEAU"))
+    tournoi = Tournoi(participants=joueurs, match=Match("NIVEAU", rng),
+                      snapshots=EnregistreurSnapshots(final_seulement=True))   # seule la dernière ronde sert
 
     for r in range(1, nb_rondes + 1):
         tournoi.jouer_ronde(r)
@@ -150,18 +149,17 @@ def rang_manuel_suisse(nb_rondes: int, seed: int | None = None) -> int:
 
 
 def rang_manuel_round_robin(seed: int | None = None) -> int:
-    if seed is not None:
-        random.seed(seed)
+    rng = ContexteAleatoire(seed)
 
     joueurs = joueurs_belloy()
-    tournoi = Tournoi(participants=joueurs, match=Match("NIVEAU"))
+    tournoi = Tournoi(participants=joueurs, match=Match("NIVEAU", rng))
 
     n = len(joueurs)
     matchs = []
     for i in range(n):
         for j in range(i + 1, n):
             matchs.append((joueurs[i], joueurs[j]))
-    random.shuffle(matchs)
+    rng.melanger(matchs)
 
     for j1, j2 in matchs:
         resultat = tournoi.match.resultat(j1, j2)
@@ -182,12 +180,19 @@ def rang_manuel_round_robin(seed: int | None = None) -> int:
     return int(df_last.loc[df_last["nom"] == "MARINI Manuel", "rang"].iloc[0])
 
 
-def distrib_rang_manuel_suisse(nb_rondes: int, n_experiences: int):
-    return [rang_manuel_suisse(nb_rondes, seed=t) for t in range(n_experiences)]
+# Le rang de Manuel pour une graine donnée ne dépend que des joueurs, du mode de match et
+# des paramètres : chaque (paramètres, graine) est calculé une fois puis relu dans le cache.
+CACHE = CacheSimulation()
 
 
-def distrib_rang_manuel_round_robin(n_experiences: int):
-    return [rang_manuel_round_robin(seed=t) for t in range(n_experiences)]
+def distrib_rang_manuel_suisse(nb_rondes: int, n_experiences: int, cache=CACHE):
+    contexte = (joueurs_belloy(), "NIVEAU")
+    return [cache.appel(rang_manuel_suisse, nb_rondes, seed=t, contexte=contexte) for t in range(n_experiences)]
+
+
+def distrib_rang_manuel_round_robin(n_experiences: int, cache=CACHE):
+    contexte = (joueurs_belloy(), "NIVEAU")
+    return [cache.appel(rang_manuel_round_robin, seed=t, contexte=contexte) for t in range(n_experiences)]
 
 
 def print_stats_rangs(label: str, rangs: list[int]):
@@ -251,66 +256,61 @@ if 0:# __name__ == "__main__":
 # ---------- 6. PLOT TOURNOI ----------
 
 
-def plot_distributions_tournoi(tournoi_selectionne, savefig=False, folder="plots"):
-    n = 500
-
-    data = {
-        "Uniforme": creer_joueurs_uniformes(n),
-        "Gaussienne": creer_joueurs_gaussiens(n),
-        "Bimodale": creer_joueurs_bimodaux(n),
-        "Asymétrique": creer_joueurs_asymetriques(n),
-        "Anormale": creer_joueurs_anormale(n),
-        "Remontada": creer_joueurs_remontada(n),
-        "Gaussiens_elo_identique": creer_joueurs_gaussiens_elo(n, bool_elo_depart_identique=True),
-        "Gaussiens_elo_aleatoire": creer_joueurs_gaussiens_elo(n, bool_elo_depart_identique=False)
-    }
+# Noms d'affichage des distributions de bdd.registre_standard (rien n'est tiré ici)
+DISTRIBUTIONS = list(registre_standard(0))
 
-    if savefig:
-        os.makedirs(folder, exist_ok=True)
 
-    for name, joueurs in data.items():
-        niveaux = np.array([j.niveau_E for j in joueurs])
-        elos = np.array([j.elo for j in joueurs])
-
-        idx = np.argsort(niveaux)
-        niveaux_trie = niveaux[idx]
-        elos_trie = elos[idx]
+def simuler_distributions_tournoi(tournoi_selectionne, magasin, n=500, graine=0, noms=None):
+    """
+    Joue un tournoi par distribution de joueurs (toutes, ou seulement noms) et ajoute au
+    magasin une ligne par joueur (niveau_E, elo, rang ; rang 0 = meilleur).
+    """
+    for name, spec in registre_standard(n, graine).items(noms):
+        rng = ContexteAleatoire(graine)
+        joueurs = spec.population()
+        tournoi = Tournoi(participants=joueurs, match=Match("NIVEAU", rng))
 
-
-        # --- lancement d’un tournoi ---
-        tournoi = Tournoi(participants=joueurs, match=Match("NIVEAU"))
-        
         # Vérifie que la méthode existe
         if not hasattr(tournoi, tournoi_selectionne):
             raise ValueError(f"La méthode '{tournoi_selectionne}' n'existe pas dans l'objet Tournoi.")
 
         # Appel dynamique de la méthode
-        methode = getattr(tournoi, tournoi_selectionne)
-        classement_dico = methode()  # le classement est une liste de liste [[les 1er si égalités], [ les 2imes], [ les 3ièmes] ...]
-        classement = []
-        for j,rang in classement.items():
-            pass
-        joueurs_aplatis = []
-        rang_values = []
+        classement = getattr(tournoi, tournoi_selectionne)()
+        rangs = classement_en_rangs(classement, tournoi.participants, tournoi_selectionne in CLASSEMENTS_INVERSES)
+
+        magasin.ecrire({
+            "nom": joueurs.noms,
+            "niveau_E": joueurs.niveau_E,
+            "elo": joueurs.elo,
+            "rang": rangs,
+        }, format=tournoi_selectionne, distribution=name, graine=graine)
 
-        for i, sous_liste in enumerate(classement):
-            # rang = plus petit pour le vainqueur
-            rang = len(classement) - 1 - i  # inverse l'ordre
-            for j in sous_liste:
-                joueurs_aplatis.append(j)
-                rang_values.append(rang)
 
-        rang_values = np.array(rang_values)
+def plot_distributions_tournoi(tournoi_selectionne, savefig=False, folder="plots", magasin=None, graine=0, noms=None):
+    """Graphes par distribution, lus dans le magasin de résultats (simulés seulement s'ils manquent)."""
+    magasin = magasin or MagasinResultats()
+    noms = noms or DISTRIBUTIONS
+    manquants = [nom for nom in noms if not magasin.existe(format=tournoi_selectionne, distribution=nom, graine=graine)]
+    if manquants:
+        simuler_distributions_tournoi(tournoi_selectionne, magasin, graine=graine, noms=manquants)
+
+    if savefig:
+        os.makedirs(folder, exist_ok=True)
 
-        # Suite du code : histogrammes, plots, Spearman, etc.
-                
-        niveaux_cl = np.array([j.niveau_E for j in joueurs_aplatis])
-        elos_cl = np.array([j.elo for j in joueurs_aplatis])
+    for name in noms:
+        table = magasin.lire(["niveau_E", "elo", "rang"], format=tournoi_selectionne, distribution=name, graine=graine)
+        niveaux = table.column("niveau_E").to_numpy()
+        elos = table.column("elo").to_numpy()
+        rang_values = table.column("rang").to_numpy()
+        n = len(niveaux)
 
+        idx = np.argsort(niveaux)
+        niveaux_trie = niveaux[idx]
+        elos_trie = elos[idx]
 
         # Spearman niveau→rang et elo→rang
-        spearman_niv = np.corrcoef(np.argsort(niveaux_cl), rang_values)[0,1]
-        spearman_elo = np.corrcoef(np.argsort(elos_cl), rang_values)[0,1]
+        spearman_niv = np.corrcoef(np.argsort(niveaux), rang_values)[0,1]
+        spearman_elo = np.corrcoef(np.argsort(elos), rang_values)[0,1]
 
         fig, axs = plt.subplots(2, 2, figsize=(12, 8))
         fig.suptitle(f"{name} (N={n})", fontsize=15)
@@ -334,7 +334,7 @@ def plot_distributions_tournoi(tournoi_selectionne, savefig=False, folder="plots
         axs[0,1].legend()
 
         # --- Elo vs Rang ---
-        axs[1,0].scatter(elos_cl, rang_values)
+        axs[1,0].scatter(elos, rang_values)
         axs[1,0].invert_yaxis()
         axs[1,0].set_title("Elo → Rang tournoi")
         axs[1,0].set_xlabel("Elo")
@@ -343,7 +343,7 @@ def plot_distributions_tournoi(tournoi_selectionne, savefig=False, folder="plots
         axs[1,0].text(0.05, 0.9, f"Spearman: {spearman_elo:.3f}", transform=axs[1,0].transAxes)
 
         # --- Niveau vs Rang ---
-        axs[1,1].scatter(niveaux_cl, rang_values)
+        axs[1,1].scatter(niveaux, rang_values)
         axs[1,1].invert_yaxis()
         axs[1,1].set_title("Niveau → Rang tournoi")
         axs[1,1].set_xlabel("Niveau")
@@ -360,4 +360,5 @@ def plot_distributions_tournoi(tournoi_selectionne, savefig=False, folder="plots
         plt.show()
 
 
-plot_distributions_tournoi("elimination_directe")
+if __name__ == "__main__":
+    plot_distributions_tournoi("elimination_directe")
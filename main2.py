@@ -4,6 +4,7 @@ from match import Match
 from math import ceil
 import numpy as np
 import attribution as att
+from metriques_rang import permutation_inverse
 import matplotlib.pyplot as plt
 
 n_joueurs = 32
@@ -22,21 +23,13 @@ for i in range(ceil(np.log2(n_joueurs))+1, 0, -1):
 
 n_tournois = 3
 n_iter = 1000
-points = {j:0 for j in participants}
-classement_moyen = {j:0 for j in participants}    # moyenne du rang sur chaque saison
-classements_par_joueur = {j:[] for j in participants}    # les classements obtenus apres chaque iteration
-for _ in range(n_iter):
-    # saison
-    for _ in range(n_tournois):
-        t = Tournoi(participants,m)
-        classement = t.elimination_directe(False)
-        points_temp = att.attribution_linéaire(classement)
-        for j in participants:
-            points[j]+=points_temp[j]
-    classement_final = sorted(points.items(), key=lambda item: item[1])       # classement à la fin de la saison
-    classement_final={classement_final[i][0]:i for i in range(len(classement_final))}
-    for j in participants:
-        classements_par_joueur[j].append(classement_final[j])
+# toutes les saisons d'un coup : n_iter*n_tournois tableaux simulés ensemble (un par ligne),
+# puis une seule opération matricielle pour les points
+rangs = t.elimination_directe_lot(n_iter * n_tournois, avec_elo=False).reshape(n_iter, n_tournois, n_joueurs)
+points = np.cumsum(att.points_saison(rangs, "lineaire"), axis=0)    # points cumulés après chaque saison
+ordre = np.argsort(points, axis=1, kind="stable")                   # classement à la fin de la saison
+rangs_saison = permutation_inverse(ordre)                          # rang de chaque joueur après chaque itération
+classements_par_joueur = {j:rangs_saison[:, i] for i, j in enumerate(participants)}    # les classements obtenus apres chaque iteration
 
 # par joueur : on compile les rangs obtenus à chaque itération (=classements_par_joueur)
 # on calcule moyenne et écart type
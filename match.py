@@ -1,4 +1,7 @@
-from random import random
+import numpy as np
+from population import Population
+from aleatoire import ContexteAleatoire
+from elo import score_attendu, scores_attendus
 
 J1_GAGNE = 1
 J2_GAGNE = -1
@@ -7,8 +10,10 @@ J2_GAGNE = -1
 
 class Match:
 
-    def __init__(self,type_match):
+    def __init__(self,type_match, rng=None):
         self.type_match=type_match
+        # source unique d'aléatoire ; par défaut semée depuis np.random (np.random.seed reste valable)
+        self.rng = rng if rng is not None else ContexteAleatoire.depuis_etat_global()
         self.types={
             "NIVEAU":self.niveau,
             "ELO":self.elo,
@@ -21,8 +26,8 @@ class Match:
         (basée ici sur le niveau intrasec des joueurs) et met à jour les Elo.
         """
         diff = j1.niveau_E - j2.niveau_E
-        expected_score = 1 / (1 + 10 ** (-diff / 400))   # proba que j1 gagne
-        u = random()
+        expected_score = score_attendu(diff)   # proba que j1 gagne
+        u = self.rng.uniforme()
 
         if expected_score > u:
             # Victoire j1
@@ -41,8 +46,8 @@ class Match:
         et met à jour les Elo des deux joueurs.
         """
         diff = j1.elo - j2.elo
-        expected_score = 1 / (1 + 10 ** (-diff / 400))   # proba que j1 gagne
-        u = random()
+        expected_score = score_attendu(diff)   # proba que j1 gagne
+        u = self.rng.uniforme()
 
         if expected_score > u:
             # Victoire j1
@@ -58,8 +63,90 @@ class Match:
     def intrinseque(self, j1, j2):
         return J2_GAGNE if j2.niveau>j1.niveau else J1_GAGNE
 
+    @property
+    def elo_dynamique(self):
+        """Vrai si l'issue d'un match dépend des Elo mis à jour pendant le tournoi (ordre des matchs important)."""
+        return self.type_match == "ELO"
+
     def resultat(self, j1, j2):
         """Execute the selected match type and return its result."""
         return self.types[self.type_match](j1, j2)
 
-            
\ No newline at end of file
+    # ---------- version vectorisée ----------
+
+    def resultats(self, joueurs, idx1, idx2, maj_elo=True):
+        """
+        Joue d'un coup tous les matchs joueurs[idx1[k]] contre joueurs[idx2[k]].
+        - joueurs    : liste de Joueur ou Population (travail direct sur ses tableaux)
+        - idx1, idx2 : indices des joueurs dans la liste (ou liste de paires via indices_appariements)
+        Renvoie un tableau de J1_GAGNE / J2_GAGNE, comme resultat match par match.
+
+        Les variations d'Elo sont calculées avec les Elo d'avant le lot puis sommées :
+        c'est exactement le chemin scalaire quand chaque joueur apparaît au plus une fois
+        dans le lot (une ronde), sinon c'est une mise à jour par "période".
+        maj_elo=False : on ne fait que tirer les issues (un système de classement s'en charge).
+        """
+        if isinstance(joueurs, Population):
+            return jouer_lot(self.type_match, joueurs.niveau_E, joueurs.niveau_V,
+                             joueurs.elo, joueurs.K, idx1, idx2, self.rng.generateur, maj_elo)
+
+        niveau_E = np.array([j.niveau_E for j in joueurs], dtype=float)
+        niveau_V = np.array([j.niveau_V for j in joueurs], dtype=float)
+        elo = np.array([j.elo for j in joueurs], dtype=float)
+        K = np.array([j.K for j in joueurs], dtype=float)
+
+        res = jouer_lot(self.type_match, niveau_E, niveau_V, elo, K, idx1, idx2, self.rng.generateur, maj_elo)
+
+        for j, e in zip(joueurs, elo.tolist()):
+            j.elo = e
+        return res
+
+
+def indices_appariements(joueurs, appariements):
+    """Transforme une liste de paires (j1, j2) en deux tableaux d'indices dans joueurs (exempts ignorés)."""
+    if isinstance(joueurs, Population):
+        joueurs = joueurs.joueurs()
+    position = {id(j): i for i, j in enumerate(joueurs)}
+    paires = [(position[id(j1)], position[id(j2)]) for j1, j2 in appariements if j2 is not None]
+    if not paires:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    idx = np.array(paires, dtype=np.intp)
+    return idx[:, 0], idx[:, 1]
+
+
+def jouer_lot(type_match, niveau_E, niveau_V, elo, K, idx1, idx2, rng=np.random, maj_elo=True):
+    """
+    Noyau tableau de Match.resultats : tire toutes les issues en un appel NumPy (générateur rng)
+    et applique les variations d'Elo directement dans le tableau elo.
+    Lot de plusieurs simulations : elo (simulations x joueurs) et idx1, idx2 (simulations x matchs),
+    chaque ligne ayant ses propres Elo (Tournoi.elimination_directe_lot).
+    """
+    idx1 = np.asarray(idx1, dtype=np.intp)
+    idx2 = np.asarray(idx2, dtype=np.intp)
+    # en lot, chaque match est repéré dans le tableau aplati des Elo (ligne * n_joueurs + joueur)
+    decalage = np.arange(idx1.shape[0])[:, None] * elo.shape[-1] if idx1.ndim == 2 else 0
+    plat1, plat2 = idx1 + decalage, idx2 + decalage
+
+    if type_match == "INTRINSEQUE":
+        perf1 = rng.normal(niveau_E[idx1], niveau_V[idx1])
+        perf2 = rng.normal(niveau_E[idx2], niveau_V[idx2])
+        return np.where(perf2 > perf1, J2_GAGNE, J1_GAGNE)
+
+    if type_match == "NIVEAU":
+        diff = niveau_E[idx1] - niveau_E[idx2]
+    elif type_match == "ELO":
+        diff = elo.ravel()[plat1] - elo.ravel()[plat2]
+    else:
+        raise ValueError(f"Type de match inconnu : {type_match}")
+
+    expected_score = scores_attendus(diff)   # proba que j1 gagne
+    j1_gagne = expected_score > rng.random(idx1.shape)
+    if not maj_elo:
+        return np.where(j1_gagne, J1_GAGNE, J2_GAGNE)
+
+    # gain de j1 (négatif s'il perd), j2 prend l'opposé pondéré par son propre K
+    delta = np.where(j1_gagne, 1 - expected_score, -expected_score)
+    elo += np.bincount(plat1.ravel(), weights=(K[idx1] * delta).ravel(), minlength=elo.size).reshape(elo.shape)
+    elo -= np.bincount(plat2.ravel(), weights=(K[idx2] * delta).ravel(), minlength=elo.size).reshape(elo.shape)
+
+    return np.where(j1_gagne, J1_GAGNE, J2_GAGNE)
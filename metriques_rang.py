@@ -0,0 +1,76 @@
+# metriques_rang.py
+# Métriques entre classements en O(n log n), à partir des permutations inverses.
+# Un classement est une permutation des identifiants 0..n-1 : classement[k] = joueur à la place k.
+# Toutes les fonctions acceptent un classement (1-D) ou un lot de classements (2-D ou plus, un
+# classement par ligne selon le dernier axe) ; a et b sont diffusés l'un contre l'autre (ex. une référence contre 500 tournois).
+import numpy as np
+
+
+def permutation_inverse(classements):
+    """inverse[..., joueur] = place du joueur dans le classement."""
+    classements = np.asarray(classements)
+    inverse = np.empty_like(classements)
+    np.put_along_axis(inverse, classements, np.arange(classements.shape[-1]), axis=-1)
+    return inverse
+
+
+def _places(a, b):
+    """Places des joueurs dans a et dans b (mêmes joueurs en colonne), diffusées à la même forme."""
+    pa, pb = permutation_inverse(a), permutation_inverse(b)
+    return np.broadcast_arrays(pa, pb)
+
+
+def mae(a, b):
+    """Écart moyen absolu entre la place de chaque joueur dans a et dans b."""
+    pa, pb = _places(a, b)
+    return np.abs(pa - pb).mean(axis=-1)
+
+
+def spearman(a, b):
+    """Corrélation de Spearman entre deux classements sans ex-aequo : 1 - 6 Σd² / (n(n²-1))."""
+    pa, pb = _places(a, b)
+    n = pa.shape[-1]
+    d2 = ((pa - pb).astype(float) ** 2).sum(axis=-1)
+    return 1 - 6 * d2 / (n * (n**2 - 1))
+
+
+def kendall_tau(a, b):
+    """Tau de Kendall entre deux classements sans ex-aequo : 1 - 4 * inversions / (n(n-1))."""
+    pa, pb = _places(a, b)
+    n = pa.shape[-1]
+    # place dans a des joueurs pris dans l'ordre de b : chaque inversion = une paire discordante
+    sequence = np.take_along_axis(pa, permutation_inverse(pb), axis=-1)
+    return 1 - 4 * compter_inversions(sequence) / (n * (n - 1))
+
+
+def compter_inversions(x):
+    """
+    Nombre de paires i < j avec x[i] > x[j] (valeurs distinctes), par tri fusion ascendant
+    vectorisé : à chaque niveau, tous les blocs de toutes les lignes sont fusionnés d'un coup.
+    """
+    x = np.asarray(x)
+    forme_lot = x.shape[:-1]
+    x = x.reshape(-1, x.shape[-1]).astype(float)
+    lignes, n = x.shape
+
+    # complète à une puissance de 2 avec des valeurs croissantes plus grandes que tout :
+    # placées à la fin, elles n'ajoutent aucune inversion
+    taille = 1
+    while taille < n:
+        taille *= 2
+    bourrage = x.max() + 1 + np.arange(taille - n)
+    x = np.concatenate([x, np.broadcast_to(bourrage, (lignes, taille - n))], axis=1)
+
+    inversions = np.zeros(lignes, dtype=np.int64)
+    s = 1
+    while s < taille:
+        blocs = x.reshape(lignes, taille // (2 * s), 2 * s)   # [bloc gauche trié | bloc droit trié]
+        ordre = np.argsort(blocs, axis=-1, kind="stable")
+        de_gauche = ordre < s
+        # pour chaque élément du bloc droit : nombre d'éléments du bloc gauche plus grands que lui
+        gauche_restants = s - np.cumsum(de_gauche, axis=-1)
+        inversions += np.where(de_gauche, 0, gauche_restants).sum(axis=(1, 2))
+        x = np.take_along_axis(blocs, ordre, axis=-1).reshape(lignes, taille)
+        s *= 2
+
+    return inversions.reshape(forme_lot)[()]
@@ -0,0 +1,115 @@
+# monte_carlo.py
+# Exécution parallèle des études Monte Carlo de hasard.py :
+# les nb_execution tournois indépendants sont répartis en tranches sur un ProcessPoolExecutor,
+# chaque tournoi a sa propre graine dérivée de (graine, numéro du run) -> résultats identiques
+# quel que soit le nombre de workers. Chaque tranche renvoie seulement un AccumulateurRangs partiel.
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from accumulateur import AccumulateurRangs
+from aleatoire import ContexteAleatoire
+from match import Match
+from tournoi import Tournoi
+
+# méthodes de Tournoi qui renvoient leur classement du pire au meilleur
+CLASSEMENTS_INVERSES = {"elimination_double"}
+
+
+def classement_en_rangs(classement, participants, inverse=False):
+    """
+    Convertit la sortie d'une méthode de Tournoi en tableau de rangs (0 = meilleur),
+    dans l'ordre de participants :
+    - dict {joueur: rang} (rang 1 = vainqueur, ex-aequo possibles)
+    - liste de joueurs, ou liste de listes de joueurs (paliers d'ex-aequo)
+    inverse=True si la liste va du pire au meilleur.
+    """
+    position = {id(j): i for i, j in enumerate(participants)}
+    rangs = np.empty(len(participants))
+
+    if isinstance(classement, dict):
+        for j, rang in classement.items():
+            rangs[position[id(j)]] = rang - 1
+        return rangs
+
+    paliers = [p if isinstance(p, list) else [p] for p in classement]
+    if inverse:
+        paliers = paliers[::-1]
+    for rang, palier in enumerate(paliers):
+        for j in palier:
+            rangs[position[id(j)]] = rang
+    return rangs
+
+
+def rangs_reference(population):
+    """Classement "vrai" : rang selon niveau_E décroissant (0 = meilleur)."""
+    rangs = np.empty(len(population))
+    rangs[np.argsort(-population.niveau_E, kind="stable")] = np.arange(len(population))
+    return rangs
+
+
+def _executer_tranche(population, tournoi_selectionne, type_match, graine, debut, fin):
+    """Joue les runs [debut, fin) et renvoie l'accumulateur partiel de leurs rangs."""
+    inverse = tournoi_selectionne in CLASSEMENTS_INVERSES
+    reference = rangs_reference(population)
+    accumulateur = AccumulateurRangs(len(population))
+
+    for run_id in range(debut, fin):
+        rng = ContexteAleatoire.pour_run(graine, run_id)   # flux propre au run : ne dépend que de (graine, run_id)
+        tournoi = Tournoi(participants=population.copy(), match=Match(type_match, rng))
+        classement = getattr(tournoi, tournoi_selectionne)()
+        accumulateur.ajouter_rangs(classement_en_rangs(classement, tournoi.participants, inverse), reference)
+
+    return accumulateur
+
+
+def etude_parallele(population, tournoi_selectionne, type_match, nb_execution,
+                    n_workers=None, graine=0, taille_tranche=None, arret=None):
+    """
+    Lance nb_execution tournois sur la Population donnée, répartis sur n_workers processus.
+    Renvoie l'AccumulateurRangs fusionné (rang moyen / variance par joueur, histogramme des
+    rangs, spearman / kendall / mae / top-k par rapport au classement selon niveau_E).
+    arret (arret.ArretIntervalle) : les tranches (taille fixe, nb_execution // 64 par défaut) sont
+    lancées par vagues de n_workers et fusionnées dans l'ordre des run_id ; l'étude s'arrête à la
+    première tranche où la précision demandée est atteinte, quel que soit n_workers.
+    accumulateur.n donne alors le nombre de runs réellement joués (nb_execution reste le maximum).
+    """
+    n_workers = n_workers or os.cpu_count()
+    if taille_tranche is None and arret is None:
+        taille_tranche = max(1, nb_execution // (4 * n_workers))   # ~4 tranches par worker pour équilibrer
+    elif taille_tranche is None:
+        # avec arrêt : découpage fixe, indépendant du nombre de workers, pour que le point
+        # d'arrêt (et donc l'estimation) soit le même sur toutes les machines
+        taille_tranche = max(1, nb_execution // 64)
+    bornes = [(d, min(d + taille_tranche, nb_execution)) for d in range(0, nb_execution, taille_tranche)]
+    vague = n_workers if arret is not None else len(bornes)
+
+    accumulateur = AccumulateurRangs(len(population))
+
+    def fusionner(partiel):
+        """Fusionne une tranche (toujours dans l'ordre des run_id) ; vrai s'il faut s'arrêter."""
+        accumulateur.fusionner(partiel)
+        return arret is not None and arret.atteint(accumulateur)
+
+    if n_workers == 1:
+        for d, f in bornes:
+            if fusionner(_executer_tranche(population, tournoi_selectionne, type_match, graine, d, f)):
+                break
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            arrete = False
+            for debut in range(0, len(bornes), vague):
+                futures = [
+                    executor.submit(_executer_tranche, population, tournoi_selectionne, type_match, graine, d, f)
+                    for d, f in bornes[debut:debut + vague]
+                ]
+                for future in futures:   # test après chaque tranche ; le reste de la vague est abandonné
+                    if arrete:
+                        future.cancel()
+                    elif fusionner(future.result()):
+                        arrete = True
+                if arrete:
+                    break
+
+    return accumulateur
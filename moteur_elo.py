@@ -0,0 +1,83 @@
+# moteur_elo.py
+# Mise à jour des Elo par lots, avec un facteur K qui dépend du joueur.
+# Une ronde (ou une période) est un lot de matchs idx1[k] contre idx2[k] de score s1[k] pour j1 :
+# toutes les variations sont calculées avec les Elo d'avant le lot puis sommées (bincount),
+# comme dans match.jouer_lot. La Population garde le nombre de parties et l'incertitude rd
+# de chaque joueur ; la politique de K choisit le K de chacun à partir de ces tableaux.
+# Nouvelles politiques : @politique("nom").
+from math import log
+
+import numpy as np
+
+from elo import ECHELLE, scores_attendus
+from population import RD_INITIAL
+
+Q = log(10) / ECHELLE   # constante q de Glicko
+
+POLITIQUES = {}
+
+def politique(nom):
+    """Enregistre f(population, info, **params) -> K par joueur sous le nom donné."""
+    def enregistrer(f):
+        POLITIQUES[nom] = f
+        return f
+    return enregistrer
+
+@politique("fixe")
+def _k_fixe(population, info):
+    """K propre à chaque joueur (population.K), constant."""
+    return population.K
+
+@politique("fide")
+def _k_fide(population, info, nouveau=40, standard=20, elite=10, n_parties=30, seuil_elite=2400):
+    """Paliers FIDE : nouveau tant que moins de n_parties parties, elite au-dessus de seuil_elite."""
+    return np.where(population.parties < n_parties, nouveau,
+                    np.where(population.elo < seuil_elite, standard, elite))
+
+@politique("incertitude")
+def _k_incertitude(population, info, k_min=0):
+    """
+    K de Glicko : q / (1/rd² + 1/d²), avec 1/d² = info = q² Σ E(1-E) sur les matchs du lot.
+    Grand pour un joueur mal connu (rd grand), il diminue à mesure que rd se resserre.
+    """
+    return np.maximum(Q / (1 / population.rd**2 + info), k_min)
+
+
+class MoteurElo:
+    """
+    - politique : nom dans POLITIQUES ("fixe", "fide", "incertitude")
+    - rd_min    : plancher de l'incertitude (sinon K tend vers 0 avec "incertitude")
+    - c         : augmentation de l'incertitude entre deux lots (inactivité, Glicko), 0 par défaut
+    - params    : paramètres de la politique (ex. nouveau=40 pour "fide")
+    """
+
+    def __init__(self, politique="fixe", rd_min=30.0, c=0.0, **params):
+        self.politique = POLITIQUES[politique]
+        self.nom = politique
+        self.rd_min = rd_min
+        self.c = c
+        self.params = params
+
+    def appliquer(self, population, idx1, idx2, score1):
+        """
+        Applique un lot de matchs (score1 = 1 si j1 gagne, 0 s'il perd, 0.5 nul) :
+        met à jour elo, parties et rd de la population ; renvoie les variations d'Elo.
+        """
+        idx1 = np.asarray(idx1, dtype=np.intp)
+        idx2 = np.asarray(idx2, dtype=np.intp)
+        n = len(population)
+        attendu = scores_attendus(population.elo[idx1] - population.elo[idx2])
+
+        # information apportée par le lot sur chaque joueur (1/d² de Glicko)
+        variance = attendu * (1 - attendu)
+        info = Q**2 * (np.bincount(idx1, variance, n) + np.bincount(idx2, variance, n))
+
+        K = np.broadcast_to(self.politique(population, info, **self.params), (n,))
+        delta = np.asarray(score1, dtype=float) - attendu
+        variation = np.bincount(idx1, K[idx1] * delta, n) - np.bincount(idx2, K[idx2] * delta, n)
+
+        population.elo += variation
+        population.parties += np.bincount(idx1, minlength=n) + np.bincount(idx2, minlength=n)
+        rd2 = 1 / (1 / population.rd**2 + info) + self.c**2
+        population.rd = np.clip(np.sqrt(rd2), self.rd_min, RD_INITIAL)
+        return variation
@@ -0,0 +1,52 @@
+# performance.py
+# Tirage des performances des joueurs (niveau = N(niveau_E, niveau_V)) par blocs :
+# au lieu d'un appel np.random.normal par lecture de Joueur.niveau, chaque joueur pioche dans
+# une réserve circulaire de tirages N(0, 1) remplie d'un coup, et on renvoie niveau_E + niveau_V * z.
+# La réserve ne dépend pas de niveau_E / niveau_V : rien à invalider si ceux-ci changent.
+from contextlib import contextmanager
+
+import numpy as np
+
+
+class TamponPerformance:
+    """
+    Réserve circulaire de `taille` tirages N(0, 1), re-remplie en bloc quand elle est épuisée.
+    - rng=None  : tirages sur l'état global de np.random (np.random.seed reste valable)
+    - graine    : générateur propre au joueur, pour rejouer ses performances
+    """
+
+    def __init__(self, taille=256, graine=None, rng=None):
+        if rng is None and graine is not None:
+            rng = np.random.default_rng(graine)
+        self.rng = rng if rng is not None else np.random
+        self.taille = taille
+        self._tirages = []
+        self._position = 0
+
+    def _remplir(self):
+        self._tirages = self.rng.standard_normal(self.taille).tolist()   # liste : lecture scalaire rapide
+        self._position = 0
+
+    def suivant(self):
+        """Prochain tirage N(0, 1)."""
+        if self._position >= len(self._tirages):
+            self._remplir()
+        z = self._tirages[self._position]
+        self._position += 1
+        return z
+
+
+@contextmanager
+def performances_figees(*joueurs):
+    """
+    Fige la performance des joueurs le temps d'un match :
+        with performances_figees(j1, j2):
+            ... j1.niveau renvoie toujours la même valeur ...
+    """
+    for j in joueurs:
+        j.figer_performance()
+    try:
+        yield
+    finally:
+        for j in joueurs:
+            j.liberer_performance()
@@ -0,0 +1,133 @@
+# population.py
+import numpy as np
+from joueur import Joueur
+
+RD_INITIAL = 350.0   # incertitude d'un joueur sans partie (valeur de Glicko)
+VOLATILITE_INITIALE = 0.06
+
+
+class Population:
+    """
+    Population de joueurs stockée en colonnes (un tableau NumPy par attribut) :
+    - noms                          : liste de str (+ index nom -> position)
+    - niveau_E, niveau_V, elo, K    : tableaux float de taille n
+    - score                         : score courant dans le tournoi
+    - parties, rd                   : nombre de parties jouées et écart type de l'Elo (incertitude,
+                                      voir moteur_elo.py)
+    - volatilite                    : volatilité de Glicko-2 (systemes_classement.py)
+    Copier une population = copier 8 tableaux, trier par elo = un argsort.
+    Les anciens appelants récupèrent des vues Joueur avec joueurs().
+    """
+
+    def __init__(self, noms, niveau_E, niveau_V=None, elo=None, K=None, score=None, parties=None, rd=None, volatilite=None):
+        n = len(noms)
+        self.noms = list(noms)
+        self.index = {nom: i for i, nom in enumerate(self.noms)}
+        self.niveau_E = np.asarray(niveau_E, dtype=float).copy()
+        self.niveau_V = np.zeros(n) if niveau_V is None else np.asarray(niveau_V, dtype=float).copy()
+        self.elo = np.full(n, 1500.0) if elo is None else np.asarray(elo, dtype=float).copy()
+        self.K = np.full(n, 40.0) if K is None else np.asarray(K, dtype=float).copy()
+        self.score = np.zeros(n) if score is None else np.asarray(score, dtype=float).copy()
+        self.parties = np.zeros(n, dtype=int) if parties is None else np.asarray(parties, dtype=int).copy()
+        self.rd = np.full(n, RD_INITIAL) if rd is None else np.asarray(rd, dtype=float).copy()
+        self.volatilite = np.full(n, VOLATILITE_INITIALE) if volatilite is None else np.asarray(volatilite, dtype=float).copy()
+        self._vues = None
+
+    @classmethod
+    def depuis_joueurs(cls, joueurs):
+        """Construit une population à partir d'une liste de Joueur."""
+        return cls(
+            [j.nom for j in joueurs],
+            [j.niveau_E for j in joueurs],
+            [j.niveau_V for j in joueurs],
+            [j.elo for j in joueurs],
+            [j.K for j in joueurs],
+        )
+
+    def __len__(self):
+        return len(self.noms)
+
+    def __getitem__(self, i):
+        return self.joueurs()[i]
+
+    def copy(self):
+        """Copie indépendante (une copie de tableau par colonne, pas de deepcopy)."""
+        return Population(self.noms, self.niveau_E, self.niveau_V, self.elo, self.K, self.score, self.parties, self.rd, self.volatilite)
+
+    def sous_population(self, indices):
+        """Nouvelle population restreinte aux indices donnés (copie)."""
+        indices = np.asarray(indices, dtype=np.intp)
+        return Population(
+            [self.noms[i] for i in indices],
+            self.niveau_E[indices],
+            self.niveau_V[indices],
+            self.elo[indices],
+            self.K[indices],
+            self.score[indices],
+            self.parties[indices],
+            self.rd[indices],
+            self.volatilite[indices],
+        )
+
+    def joueurs(self):
+        """Vues Joueur sur la population (créées une seule fois, identités stables)."""
+        if self._vues is None:
+            self._vues = [JoueurVue(self, i) for i in range(len(self))]
+        return self._vues
+
+    def ordre_elo(self, decroissant=True):
+        """Indices des joueurs triés par elo (du meilleur au moins bon par défaut)."""
+        cle = -self.elo if decroissant else self.elo
+        return np.argsort(cle, kind="stable")   # stable : même ordre des ex-aequo que sorted
+
+    def tries_par_elo(self, decroissant=True):
+        """Vues Joueur triées par elo."""
+        vues = self.joueurs()
+        return [vues[i] for i in self.ordre_elo(decroissant)]
+
+
+class JoueurVue(Joueur):
+    """Joueur dont les attributs lisent et écrivent dans les tableaux d'une Population."""
+
+    def __init__(self, population, i):
+        self.population = population
+        self.i = i
+
+    def __repr__(self):
+        return f"JoueurVue({self.nom!r}, elo={self.elo:.0f})"
+
+    @property
+    def nom(self):
+        return self.population.noms[self.i]
+
+    @property
+    def niveau_E(self):
+        return self.population.niveau_E[self.i]
+
+    @niveau_E.setter
+    def niveau_E(self, valeur):
+        self.population.niveau_E[self.i] = valeur
+
+    @property
+    def niveau_V(self):
+        return self.population.niveau_V[self.i]
+
+    @niveau_V.setter
+    def niveau_V(self, valeur):
+        self.population.niveau_V[self.i] = valeur
+
+    @property
+    def elo(self):
+        return self.population.elo[self.i]
+
+    @elo.setter
+    def elo(self, valeur):
+        self.population.elo[self.i] = valeur
+
+    @property
+    def K(self):
+        return self.population.K[self.i]
+
+    @K.setter
+    def K(self, valeur):
+        self.population.K[self.i] = valeur
@@ -0,0 +1,88 @@
+# resultats.py
+# Stockage sur disque des résultats de simulation : un dataset Parquet partitionné
+# (format / distribution / attribution / graine, à la Hive), écrit en ajout seul.
+# Chaque écriture crée un nouveau fichier : plusieurs workers peuvent écrire en même temps
+# sans verrou. Les lectures filtrent sur les partitions (seuls les fichiers utiles sont lus)
+# et un extrait peut être exporté en Arrow IPC pour être relu en mmap par les graphes.
+import glob
+import os
+import shutil
+import uuid
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+CLES = ("format", "distribution", "attribution", "graine")
+
+
+class MagasinResultats:
+    """
+    Dataset de résultats sous racine/format=.../distribution=.../attribution=.../graine=.../
+    Une ligne par joueur (et par run / saison selon l'étude) ; les colonnes libres sont
+    celles passées à ecrire.
+    """
+
+    def __init__(self, racine="resultats"):
+        self.racine = racine
+
+    def _dossier(self, cles):
+        parties = [f"{c}={cles[c]}" for c in CLES]
+        return os.path.join(self.racine, *parties)
+
+    def ecrire(self, colonnes, format, distribution, attribution="rang", graine=0):
+        """Ajoute un fichier Parquet (colonnes : dict nom -> tableau) dans sa partition."""
+        cles = {"format": format, "distribution": distribution, "attribution": attribution, "graine": graine}
+        dossier = self._dossier(cles)
+        os.makedirs(dossier, exist_ok=True)
+        table = pa.table(colonnes)
+        nom = f"part-{uuid.uuid4().hex}.parquet"
+        chemin = os.path.join(dossier, nom)
+        temporaire = os.path.join(dossier, "_" + nom)   # préfixe "_" : ignoré par les lecteurs
+        pq.write_table(table, temporaire)
+        os.replace(temporaire, chemin)   # le fichier n'apparaît qu'une fois complet
+        return chemin
+
+    def supprimer(self, **cles):
+        """Supprime les partitions dont les clés données valent cles (ex. graine=42) ; renvoie leur nombre."""
+        motif = [f"{c}={cles[c]}" if c in cles else "*" for c in CLES]
+        dossiers = glob.glob(os.path.join(self.racine, *motif))
+        for dossier in dossiers:
+            shutil.rmtree(dossier)
+        return len(dossiers)
+
+    def existe(self, **filtres):
+        return os.path.isdir(self.racine) and self._dataset().count_rows(filter=self._filtre(filtres)) > 0
+
+    def _dataset(self):
+        return ds.dataset(self.racine, format="parquet", partitioning="hive")
+
+    @staticmethod
+    def _filtre(filtres):
+        """format="suisse", graine=[0, 1] ... -> expression pyarrow (égalité ou appartenance)."""
+        expression = None
+        for cle, valeur in filtres.items():
+            if isinstance(valeur, (list, tuple, set)):
+                terme = ds.field(cle).isin(list(valeur))
+            else:
+                terme = ds.field(cle) == valeur
+            expression = terme if expression is None else expression & terme
+        return expression
+
+    def lire(self, colonnes=None, **filtres):
+        """Table Arrow des lignes vérifiant les filtres (poussés jusqu'aux partitions / row groups)."""
+        return self._dataset().to_table(columns=colonnes, filter=self._filtre(filtres))
+
+    def vers_df(self, colonnes=None, **filtres):
+        return self.lire(colonnes, **filtres).to_pandas()
+
+    def exporter_ipc(self, chemin, colonnes=None, **filtres):
+        """Écrit l'extrait filtré au format Arrow IPC (fichier relisible en mmap)."""
+        table = self.lire(colonnes, **filtres)
+        with pa.OSFile(chemin, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        return chemin
+
+
+def ouvrir_ipc(chemin):
+    """Table Arrow adossée au fichier IPC en mmap (pas de copie en mémoire)."""
+    return pa.ipc.open_file(pa.memory_map(chemin, "r")).read_all()
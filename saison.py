@@ -1,17 +1,144 @@
+# saison.py
+# Saison = suite de tournois joués par les mêmes joueurs.
+# Les descriptions de tournois ("type,avec_elo,taille_poule,n_qualifies,n_rondes") sont lues une
+# seule fois en ConfigTournoi, puis compilées en étapes : fonction (Tournoi) -> tableau des rangs.
+# Toutes les étapes travaillent sur la même Population (les Elo évoluent d'un tournoi à l'autre)
+# et les rangs sont obtenus par permutation inverse de l'ordre d'arrivée, sans list.index.
+# Participation : les inscriptions de toute la saison sont tirées d'un coup en un masque
+# (tournois x joueurs) selon le taux de participation et la richesse (frais d'inscription) ;
+# le champ d'un tournoi est la sous-population des colonnes vraies.
+from functools import partial
 from random import random
-from tournoi import Tournoi
+from typing import NamedTuple
+import time
+
+import numpy as np
+import pandas as pd
+
+import attribution as att
 from joueur import Joueur
+from match import Match
+from metriques_rang import permutation_inverse, spearman
+from population import Population
+from snapshots import EnregistreurSnapshots
+from tournoi import Tournoi
+
+
+COLONNES_CLASSEMENT = ("elo", "rd", "volatilite", "parties")   # état des joueurs qui évolue pendant la saison
+
+
+class ConfigTournoi(NamedTuple):
+    type: str
+    avec_elo: bool = True
+    taille_poule: int = 4
+    n_qualifies: int = 8
+    n_rondes: int = 6
+    frais: float = 0   # frais d'inscription
+
+    @classmethod
+    def depuis_texte(cls, texte):
+        """"swiss_round,True,4,8,6,10" -> ConfigTournoi (champs absents = valeurs par défaut)."""
+        champs = [c.strip() for c in texte.split(",")]
+        types = [bool, int, int, int, float]
+        valeurs = [f(v) if f is not bool else _booleen(v) for f, v in zip(types, champs[1:])]
+        return cls(champs[0], *valeurs)
+
+
+def _booleen(texte):
+    if texte.lower() in ("true", "1", "vrai", "oui"):
+        return True
+    if texte.lower() in ("false", "0", "faux", "non"):
+        return False
+    raise ValueError(f"Booléen attendu : {texte!r}")
+
+
+# ---------- étapes : (tournoi, config) -> rangs[joueur] (1 = premier, 0 = absent) ----------
+
+def _rangs_ordre(classement, n):
+    """Liste de joueurs du meilleur au pire -> rangs, par permutation inverse."""
+    ordre = np.fromiter((j.i for j in classement), dtype=np.intp, count=n)
+    return permutation_inverse(ordre) + 1
+
+def _rangs_places(places, n):
+    """{joueur: place} (ex-aequo possibles) -> rangs ; les joueurs absents du dict ont 0."""
+    rangs = np.zeros(n, dtype=int)
+    for j, place in places.items():
+        rangs[j.i] = place
+    return rangs
+
+def _etape_classement(methode, tournoi, config):
+    n = len(tournoi.participants)
+    if methode == "swiss_round":
+        return _rangs_ordre(tournoi.swiss_round(config.n_rondes, config.avec_elo), n)
+    return _rangs_ordre(getattr(tournoi, methode)(config.avec_elo), n)
+
+def _etape_elimination_directe(tournoi, config):
+    return _rangs_places(tournoi.elimination_directe(config.avec_elo), len(tournoi.participants))
+
+def _etape_elimination_double(tournoi, config):
+    # renvoyé du premier éliminé au vainqueur
+    return _rangs_ordre(tournoi.elimination_double(config.avec_elo)[::-1], len(tournoi.participants))
+
+def _etape_poule(tournoi, config):
+    """Rang dans sa poule ; les joueurs qui ne rentrent dans aucune poule sont absents (0)."""
+    rangs = np.zeros(len(tournoi.participants), dtype=int)
+    for places in tournoi.poule_elimination_directe(config.avec_elo, config.taille_poule):
+        rangs += _rangs_places(places, len(rangs))
+    return rangs
+
+def _etape_ligue_playoff(tournoi, config):
+    """Qualifiés classés par le playoff, les autres par leur place en ligue (après les qualifiés)."""
+    ligue = tournoi.ligue_1(config.avec_elo)
+    rangs = _rangs_ordre(ligue, len(ligue))
+    playoff = Tournoi(ligue[:config.n_qualifies], tournoi.match, tournoi.rng)
+    for j, place in playoff.elimination_directe(config.avec_elo).items():
+        rangs[j.i] = place
+    return rangs
+
+ETAPES = {
+    "swiss_round": partial(_etape_classement, "swiss_round"),
+    "round_robin": partial(_etape_classement, "round_robin"),
+    "ligue_1": partial(_etape_classement, "ligue_1"),
+    "elimination_directe": _etape_elimination_directe,
+    "elimination_double": _etape_elimination_double,
+    "poule_elimination_directe": _etape_poule,
+    "ligue_playoff": _etape_ligue_playoff,
+}
+
+def compiler(config):
+    """ConfigTournoi -> étape (tournoi) -> rangs ; un type inconnu est signalé dès la compilation."""
+    if config.type not in ETAPES:
+        raise ValueError(f"Type de tournoi inconnu : {config.type}")
+    return partial(ETAPES[config.type], config=config)
+
 
 class Saison:
-    def __init__(self, joueurs: list, tournois: list):
+    """
+    - joueurs   : liste de Joueur (copiés dans une Population partagée par tous les tournois)
+    - tournois  : ConfigTournoi ou textes "type,avec_elo,taille_poule,n_qualifies,n_rondes,frais"
+    - match     : Match utilisé pour tous les tournois (NIVEAU par défaut)
+    - attribution : schéma de points de attribution.SCHEMAS
+    - taux_participation, richesse : par joueur (tableau) ou communs à tous (nombre) ; richesse
+                  infinie par défaut (les frais ne limitent personne)
+    - systeme   : système de classement passé aux tournois (systemes_classement.py), None = Elo de Match
+    """
+
+    def __init__(self, joueurs: list, tournois: list, match=None, attribution="lineaire", taux_participation=1, richesse=np.inf, systeme=None):
+        n = len(joueurs)
+        self.taux_participation = np.broadcast_to(np.asarray(taux_participation, dtype=float), (n,))
+        self.richesse = np.broadcast_to(np.asarray(richesse, dtype=float), (n,))
         self.participants = []# Liste des participants de la saison
-        for j in joueurs:
-            self.participants.append(self.Participant(j, taux_participation=1, richesse=0))#par défaut les joueurs participent à tous les tournois
-        self.tournois = []# Liste des tournois de la saison
-        for t in tournois:
-            param= t.split(",")#récupère les paramètres du tournoi (Type, avecbool, taille_poule, n_qualifies, n_rondes)
-            self.tournois.append(param)
-    
+        for j, taux, richesse_j in zip(joueurs, self.taux_participation.tolist(), self.richesse.tolist()):
+            self.participants.append(self.Participant(j.nom, j.niveau_E, j.niveau_V, j.K, j.elo, taux_participation=taux, richesse=richesse_j))#par défaut les joueurs participent à tous les tournois
+        self.population = Population.depuis_joueurs(self.participants)
+        self._initiale = self.population.copy()
+        self.tournois = [ConfigTournoi.depuis_texte(t) if isinstance(t, str) else ConfigTournoi(*t) for t in tournois]
+        self.etapes = [compiler(c) for c in self.tournois]
+        self.match = match if match is not None else Match("NIVEAU")
+        self.attribution = attribution
+        self.systeme = systeme
+        self.frais = np.array([c.frais for c in self.tournois], dtype=float)
+
     class Participant(Joueur): # Classe interne représentant un participant à la saison avec son taux de participation et sa richesse( capacité à payer les frais d'inscription)
         def __init__(self, nom, niveau_E=0, niveau_V=0, K=40, elo=1500, taux_participation=1, richesse=0):
             super().__init__(nom, niveau_E, niveau_V, K, elo)
@@ -22,16 +149,103 @@ class Saison:
 
         def participe(self):
             return random() < self.probabilite_participation
-    
-    def complete(self,participants):# tout le monde participe à tous les tournois
-        for tournoi in self.tournois:
-            T=Tournoi(participants)
-            if len(tournoi)==1:
-                classement_intermediaire=T.type(tournoi[0])
-            elif len(tournoi)==2:
-                classement_intermediaire=T.type(tournoi[0],exec(tournoi[1]))
-            elif len(tournoi)==3:
-                classement_intermediaire=T.type(tournoi[0],exec(tournoi[1]), exec(tournoi[2]))
-            for j,p in enumerate(self.participants):
-                p.classement=classement_intermediaire.index(p.joueur)+1
-            Classement=T.type(tournoi[0],avec_elo=bool(tournoi[1]), taille_poule=int(tournoi[2]), n_qualifies=int(tournoi[3]), n_rondes=int(tournoi[4]))
\ No newline at end of file
+
+    def tirer_participations(self):
+        """
+        Masque (n_tournois, n_joueurs) des inscriptions de toute la saison : les envies sont
+        tirées en une fois (un joueur veut participer avec sa probabilité), puis on suit le
+        calendrier en payant les frais de chaque tournoi voulu qu'il peut encore se permettre
+        (un tournoi trop cher est sauté, un suivant moins cher reste possible).
+        Une opération NumPy sur tous les joueurs par tournoi.
+        """
+        envie = self.match.rng.generateur.random(self._forme()) < self.taux_participation
+        inscrits = np.zeros_like(envie)
+        depenses = np.zeros(len(self.population))
+        for k, frais in enumerate(self.frais.tolist()):
+            inscrits[k] = envie[k] & (depenses + frais <= self.richesse)
+            depenses += inscrits[k] * frais
+        return inscrits
+
+    def _forme(self):
+        """(n_tournois, n_joueurs)."""
+        return len(self.etapes), len(self.population)
+
+    def _jouer(self, participations=None):
+        """
+        Joue toutes les étapes sur la population partagée ; renvoie les rangs (n_tournois, n_joueurs).
+        participations : masque des inscrits (None = tout le monde) ; un absent a le rang 0.
+        Le champ d'un tournoi est une sous-population, dont les Elo (et rd...) sont recopiés ensuite.
+        """
+        rangs = np.zeros(self._forme(), dtype=int)
+        for k, etape in enumerate(self.etapes):
+            champ = self.population
+            if participations is not None and not participations[k].all():
+                inscrits = np.flatnonzero(participations[k])
+                if len(inscrits) < 2:
+                    rangs[k, inscrits] = 1   # seul inscrit : premier sans jouer
+                    continue
+                champ = self.population.sous_population(inscrits)
+            tournoi = Tournoi(champ, self.match, snapshots=EnregistreurSnapshots(final_seulement=True), systeme=self.systeme)
+            if champ is self.population:
+                rangs[k] = etape(tournoi)
+            else:
+                rangs[k, inscrits] = etape(tournoi)
+                for colonne in COLONNES_CLASSEMENT:
+                    getattr(self.population, colonne)[inscrits] = getattr(champ, colonne)
+        return rangs
+
+    def points(self, rangs):
+        """Points de la saison par joueur (..., n_joueurs) ; un joueur absent (rang 0) ne marque rien."""
+        rangs = np.asarray(rangs)
+        return np.where(rangs > 0, att.attribuer(rangs, self.attribution), 0).sum(axis=-2)
+
+    def complete(self, participations=None):# par défaut tout le monde participe à tous les tournois
+        """
+        Une saison à partir de l'état courant ; met à jour point, classement et elo des participants.
+        participations : masque (n_tournois, n_joueurs), par exemple tirer_participations().
+        """
+        rangs = self._jouer(participations)
+        points = self.points(rangs)
+        classement = permutation_inverse(np.argsort(-points, kind="stable")) + 1
+        for i, p in enumerate(self.participants):
+            p.point = points[i]
+            p.classement = classement[i]
+            p.elo = self.population.elo[i]
+        return rangs
+
+    def simuler(self, n_saisons, avec_participation=False):
+        """
+        n_saisons saisons indépendantes (Elo, rd... remis à leur valeur initiale avant chacune).
+        avec_participation : inscriptions tirées à chaque saison (sinon tout le monde joue tout).
+        Renvoie les rangs (n_saisons, n_tournois, n_joueurs) ; points(rangs) donne les totaux.
+        """
+        rangs = np.zeros((n_saisons,) + self._forme(), dtype=int)
+        for s in range(n_saisons):
+            for colonne in COLONNES_CLASSEMENT:
+                getattr(self.population, colonne)[:] = getattr(self._initiale, colonne)
+            rangs[s] = self._jouer(self.tirer_participations() if avec_participation else None)
+        return rangs
+
+
+def etude_participation(joueurs, tournois, taux=(1, 0.75, 0.5, 0.25), n_saisons=200, match=None, **kwargs):
+    """
+    Effet de la taille des champs sur le coût et la justesse d'une saison, pour chaque taux
+    de participation : taille moyenne des champs, saisons simulées par seconde, et corrélation
+    de Spearman entre le classement final aux points et le classement par niveau réel.
+    """
+    lignes = []
+    for t in taux:
+        saison = Saison(joueurs, tournois, match=match, taux_participation=t, **kwargs)
+        debut = time.perf_counter()
+        rangs = saison.simuler(n_saisons, avec_participation=True)
+        duree = time.perf_counter() - debut
+
+        ordre = np.argsort(-saison.points(rangs), axis=-1, kind="stable")
+        reference = np.argsort(-saison.population.niveau_E, kind="stable")
+        lignes.append({
+            "taux_participation": t,
+            "champ_moyen": (rangs > 0).sum(axis=-1).mean(),
+            "saisons_par_s": n_saisons / duree,
+            "spearman": spearman(ordre, reference).mean(),
+        })
+    return pd.DataFrame(lignes)
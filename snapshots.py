@@ -0,0 +1,127 @@
+# snapshots.py
+# Enregistrement en colonnes de l'état d'un tournoi ronde après ronde.
+# Au lieu d'une liste de dicts par ronde, on remplit des tableaux NumPy typés (rondes x joueurs)
+# préalloués, puis le DataFrame long est construit à partir d'eux. Au-delà d'un budget
+# mémoire, les rondes déjà enregistrées sont écrites sur disque (.npy) et relues en mmap ;
+# un dossier temporaire créé pour ça est supprimé par fermer() (ou à la sortie d'un with,
+# ou au plus tard quand l'enregistreur est détruit).
+import os
+import shutil
+import tempfile
+import weakref
+import numpy as np
+import pandas as pd
+
+COLONNES = ("score", "elo", "niveau_reel")
+
+
+class EnregistreurSnapshots:
+    """
+    Enregistre (score, elo, niveau_reel) de chaque joueur à certaines rondes.
+    - tous_les       : on ne garde que les rondes multiples de tous_les
+    - final_seulement: une seule ligne, écrasée à chaque ronde (= état final)
+    - budget_octets  : au-delà, le tampon est vidé sur disque dans dossier (dossier temporaire
+                       si None, supprimé par fermer())
+    Le Tournoi appelle lier(noms) puis enregistrer(...) après chaque ronde.
+    """
+
+    def __init__(self, tous_les=1, final_seulement=False, budget_octets=None, dossier=None, capacite=8):
+        self.tous_les = tous_les
+        self.final_seulement = final_seulement
+        self.budget_octets = budget_octets
+        self.dossier = dossier
+        self.capacite = 1 if final_seulement else capacite
+        self.noms = None
+        self.morceaux = []   # numéros des morceaux déjà écrits sur disque
+        self.n_sur_disque = 0
+        self._nettoyage = None   # suppression du dossier temporaire, s'il a été créé
+
+    def lier(self, noms):
+        self.noms = list(noms)
+        n = len(self.noms)
+        self.n_lignes = 0
+        self.rondes = np.zeros(self.capacite, dtype=np.int32)
+        self.tableaux = {c: np.zeros((self.capacite, n)) for c in COLONNES}
+
+    def __len__(self):
+        """Nombre de rondes enregistrées (en mémoire et sur disque)."""
+        return self.n_sur_disque + self.n_lignes
+
+    @property
+    def nbytes(self):
+        return self.rondes.nbytes + sum(t.nbytes for t in self.tableaux.values())
+
+    def enregistrer(self, n_ronde, score, elo, niveau_reel):
+        if n_ronde % self.tous_les != 0:
+            return
+        if self.final_seulement:
+            self.n_lignes = 0
+        elif self.n_lignes == len(self.rondes):
+            self._agrandir()
+        i = self.n_lignes
+        self.rondes[i] = n_ronde
+        self.tableaux["score"][i] = score
+        self.tableaux["elo"][i] = elo
+        self.tableaux["niveau_reel"][i] = niveau_reel
+        self.n_lignes += 1
+
+    def _agrandir(self):
+        if self.budget_octets is not None and 2 * self.nbytes > self.budget_octets:
+            self._vider_sur_disque()
+            return
+        capacite = 2 * len(self.rondes)
+        self.rondes = np.resize(self.rondes, capacite)
+        self.tableaux = {c: np.resize(t, (capacite, t.shape[1])) for c, t in self.tableaux.items()}
+
+    def _vider_sur_disque(self):
+        if self.dossier is None:
+            self.dossier = tempfile.mkdtemp(prefix="snapshots_")
+            self._nettoyage = weakref.finalize(self, shutil.rmtree, self.dossier, ignore_errors=True)
+        k = len(self.morceaux)
+        np.save(os.path.join(self.dossier, f"rondes_{k}.npy"), self.rondes[:self.n_lignes])
+        for c, t in self.tableaux.items():
+            np.save(os.path.join(self.dossier, f"{c}_{k}.npy"), t[:self.n_lignes])
+        self.morceaux.append(k)
+        self.n_sur_disque += self.n_lignes
+        self.n_lignes = 0
+
+    def _chemins(self, colonne):
+        return [os.path.join(self.dossier, f"{colonne}_{k}.npy") for k in self.morceaux]
+
+    def _colonne(self, colonne):
+        """Tableau (rondes x joueurs) complet : les morceaux disque sont relus en mmap."""
+        en_memoire = self.rondes if colonne == "rondes" else self.tableaux[colonne]
+        en_memoire = en_memoire[:self.n_lignes]
+        if not self.morceaux:
+            return en_memoire
+        morceaux = [np.load(c, mmap_mode="r") for c in self._chemins(colonne)]
+        if self.n_lignes == 0 and len(morceaux) == 1:
+            return morceaux[0]
+        return np.concatenate(morceaux + [en_memoire])
+
+    def vers_df(self):
+        """DataFrame long (une ligne par joueur et par ronde) construit sur les tableaux."""
+        rondes = self._colonne("rondes")
+        n_rondes, n = len(rondes), len(self.noms)
+        colonnes = {
+            "ronde": np.repeat(rondes, n),
+            "nom": pd.Categorical.from_codes(np.tile(np.arange(n), n_rondes), categories=self.noms),
+        }
+        for c in COLONNES:
+            colonnes[c] = self._colonne(c).reshape(-1)
+        return pd.DataFrame(colonnes)
+
+    def fermer(self):
+        """Supprime le dossier temporaire des morceaux disque (les rondes qui y étaient sont perdues)."""
+        if self._nettoyage is not None:
+            self._nettoyage()
+            self._nettoyage = None
+            self.dossier = None
+            self.morceaux = []
+            self.n_sur_disque = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
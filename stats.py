@@ -15,23 +15,18 @@
 
 
 
-from joueur import Joueur
+from grille import experience_grille, classer_avec_departage
 import numpy as np
 from random import shuffle
-from scipy.stats import spearmanr, kendalltau
+import metriques_rang
 import matplotlib.pyplot as plt
 
 ### fonctions utiles ###
 
 def MAE(a, b):
     assert len(a)==len(b)
-    S=0
-    for idx,elt in enumerate(a):
-        i=0
-        while b[i]!=elt:
-            i+=1
-        S+=abs(idx-i)
-    return S/len(a)
+    # via les permutations inverses : O(n) au lieu de chercher chaque élément de a dans b
+    return metriques_rang.mae(a, b)
 
 ### simulations de configurations ###
 # chacune de ces fonctions renvoie un classement des joueurs
@@ -53,21 +48,10 @@ def tournoi_points_round_robin_tiebreaker_is_match(joueurs):
                 points[joueur]+=1
             else:
                 points[j]+=1
-    classement = []
-    classement.append(joueurs2[0])
-    for j in joueurs2[1:]:
-        i=0
-        while i<len(classement) and points[j]>points[classement[i]]:
-            i+=1
-        if i<len(classement) and points[j]==points[classement[i]]:
-            # tiebreaker : match
-            if j.niveau > classement[i].niveau:
-                classement.insert(i+1, j)
-            else:
-                classement.insert(i, j)
-        else:
-            classement.insert(i, j)
-    return classement
+    # du pire au meilleur : tri par points, ex aequo départagés par des matchs contre la tête du groupe
+    duel = lambda nouveaux, tetes, lignes: [joueurs2[a].niveau > joueurs2[b].niveau for a, b in zip(nouveaux, tetes)]
+    ordre = classer_avec_departage(np.array([[points[j] for j in joueurs2]]), duel)[0]
+    return [joueurs2[i] for i in ordre]
 
 n_joueurs = 20
 n_tournois_simules = 500
@@ -75,42 +59,18 @@ ecart_entre_joueurs = 1
 
 valeurs_V = np.linspace(0, 3, 50)
 
-# métriques relevées à chaque tournoi, reset pour chaque nouvelle valeur de V
-historique_MAE = []
-historique_Kendall = []
-historique_Spearman = []
-
 # valeurs statistiques relevées pour chaque valeur de V, calculées avec les séries de n_tournois_simules tournois
-moyenne_MAE = []
-std_MAE = []
-moyenne_Kendall = []
-std_Kendall = []
-moyenne_Spearman = []
-std_Spearman = []
-
-
-classement_tournoi = []
-for V in valeurs_V:
-    joueurs = {Joueur(str(i), i*ecart_entre_joueurs, V):i for i in range(n_joueurs)}  # chaque joueur représenté identifié par un nombre : utile pour utiliser
-                                                                                      # les methodes spearmanr et kendalltau
-    classement_reference = list(range(n_joueurs))   # joueurs classés du pire au meilleur
-    historique_MAE = []
-    historique_Kendall = [] 
-    historique_Spearman = []
-    for idx_tournoi in range(n_tournois_simules):
-        classement_tournoi = tournoi_points_round_robin_tiebreaker_is_match(list(joueurs.keys()))
-        classement_tournoi_num = [joueurs[joueur] for joueur in classement_tournoi]
-        # calcul des metriques
-        historique_Kendall.append(kendalltau(classement_reference, classement_tournoi_num))
-        historique_Spearman.append(spearmanr(classement_reference, classement_tournoi_num))
-        historique_MAE.append(MAE(classement_reference, classement_tournoi_num))
-    moyenne_MAE.append(np.mean(historique_MAE))
-    std_MAE.append(np.std(historique_MAE))
-    moyenne_Kendall.append(np.mean(historique_Kendall))
-    std_Kendall.append(np.std(historique_Kendall))
-    moyenne_Spearman.append(np.mean(historique_Spearman))
-    std_Spearman.append(np.std(historique_Spearman))
-
+# tout le balayage est tiré par blocs (V x tournois x matchs) dans grille.py, la grille peut aussi
+# balayer plusieurs n_joueurs / ecart_entre_joueurs : resultats[...][idx_n, idx_ecart, idx_V]
+resultats = experience_grille(valeurs_V, n_tournois_simules,
+                              n_joueurs=[n_joueurs], ecart_entre_joueurs=[ecart_entre_joueurs])
+
+moyenne_MAE = resultats["mae"]["moyenne"][0, 0]
+std_MAE = resultats["mae"]["std"][0, 0]
+moyenne_Kendall = resultats["kendall"]["moyenne"][0, 0]
+std_Kendall = resultats["kendall"]["std"][0, 0]
+moyenne_Spearman = resultats["spearman"]["moyenne"][0, 0]
+std_Spearman = resultats["spearman"]["std"][0, 0]
 
 plt.title("moyenne MAE")
 plt.plot(valeurs_V, moyenne_MAE)
@@ -0,0 +1,152 @@
+# systemes_classement.py
+# Systèmes de classement interchangeables pour Tournoi : Elo (moteur_elo.MoteurElo), Glicko-2 et
+# un système gaussien à la TrueSkill. Tous ont la même interface :
+#     systeme.appliquer(population, idx1, idx2, score1) -> variation des Elo
+# qui met à jour une période de classement (une ronde) d'un coup sur les tableaux de la
+# Population (elo, rd, volatilite, parties) : les sommes par joueur sont des bincount, il n'y a
+# pas de boucle Python sur les matchs.
+from math import log, pi, sqrt
+
+import numpy as np
+from scipy.special import log_ndtr
+
+from elo import ECHELLE
+from moteur_elo import MoteurElo
+from population import RD_INITIAL
+
+ECHELLE_GLICKO = ECHELLE / log(10)   # 173.7178 : passage Elo <-> échelle de Glicko-2
+
+
+def _compter_parties(population, idx1, idx2):
+    n = len(population)
+    population.parties += np.bincount(idx1, minlength=n) + np.bincount(idx2, minlength=n)
+
+
+class Glicko2:
+    """
+    Glicko-2 (Glickman, 2012) : une ronde = une période de classement.
+    - tau       : contrainte sur l'évolution de la volatilité (0.3 à 1.2)
+    - epsilon   : tolérance de l'itération d'Illinois sur la volatilité
+    Les joueurs qui ne jouent pas dans la période voient seulement leur rd augmenter.
+    """
+
+    def __init__(self, tau=0.5, epsilon=1e-6):
+        self.tau = tau
+        self.epsilon = epsilon
+
+    def appliquer(self, population, idx1, idx2, score1):
+        idx1 = np.asarray(idx1, dtype=np.intp)
+        idx2 = np.asarray(idx2, dtype=np.intp)
+        score1 = np.asarray(score1, dtype=float)
+        n = len(population)
+        mu = population.elo / ECHELLE_GLICKO
+        phi = population.rd / ECHELLE_GLICKO
+        g = 1 / np.sqrt(1 + 3 * phi**2 / pi**2)
+
+        # chaque match vu de j1 (adversaire j2) puis de j2 (adversaire j1)
+        e1 = 1 / (1 + np.exp(-g[idx2] * (mu[idx1] - mu[idx2])))
+        e2 = 1 / (1 + np.exp(-g[idx1] * (mu[idx2] - mu[idx1])))
+        inv_v = (np.bincount(idx1, g[idx2]**2 * e1 * (1 - e1), n)
+                 + np.bincount(idx2, g[idx1]**2 * e2 * (1 - e2), n))
+        somme = (np.bincount(idx1, g[idx2] * (score1 - e1), n)
+                 + np.bincount(idx2, g[idx1] * (1 - score1 - e2), n))
+
+        joue = inv_v > 0
+        sigma = population.volatilite.copy()
+        phi_etoile = np.sqrt(phi**2 + sigma**2)
+        phi_nouveau = phi_etoile.copy()
+        mu_nouveau = mu.copy()
+        if joue.any():
+            v = 1 / inv_v[joue]
+            sigma[joue] = self._volatilite(sigma[joue], phi[joue], v, v * somme[joue])
+            phi_etoile[joue] = np.sqrt(phi[joue]**2 + sigma[joue]**2)
+            phi_nouveau[joue] = 1 / np.sqrt(1 / phi_etoile[joue]**2 + inv_v[joue])
+            mu_nouveau[joue] = mu[joue] + phi_nouveau[joue]**2 * somme[joue]
+
+        variation = (mu_nouveau - mu) * ECHELLE_GLICKO
+        population.elo += variation
+        population.rd = np.minimum(phi_nouveau * ECHELLE_GLICKO, RD_INITIAL)
+        population.volatilite = sigma
+        _compter_parties(population, idx1, idx2)
+        return variation
+
+    def _volatilite(self, sigma, phi, v, delta):
+        """Nouvelle volatilité de chaque joueur : racine de f par la méthode d'Illinois, tous les joueurs en parallèle."""
+        a = np.log(sigma**2)
+        tau2 = self.tau**2
+
+        def f(x):
+            ex = np.exp(x)
+            return ex * (delta**2 - phi**2 - v - ex) / (2 * (phi**2 + v + ex)**2) - (x - a) / tau2
+
+        grand = delta**2 > phi**2 + v
+        A = a.copy()
+        B = np.where(grand, np.log(np.where(grand, delta**2 - phi**2 - v, 1)), a - self.tau)
+        descend = ~grand & (f(B) < 0)
+        while descend.any():
+            B[descend] -= self.tau
+            descend &= f(B) < 0
+
+        fA, fB = f(A), f(B)
+        actif = np.abs(B - A) > self.epsilon
+        with np.errstate(divide="ignore", invalid="ignore"):
+            while actif.any():
+                C = A + (A - B) * fA / (fB - fA)
+                fC = f(C)
+                bascule = fC * fB <= 0
+                A = np.where(actif & bascule, B, A)
+                fA = np.where(actif, np.where(bascule, fB, fA / 2), fA)
+                B = np.where(actif, C, B)
+                fB = np.where(actif, fC, fB)
+                actif &= np.abs(B - A) > self.epsilon
+        return np.exp(A / 2)
+
+
+class TrueSkill:
+    """
+    Système gaussien à la TrueSkill pour des matchs à deux, sur l'échelle Elo :
+    chaque joueur a une moyenne (elo) et un écart type (rd).
+    - beta : écart type de la performance d'un match (200 ~ l'échelle logistique de l'Elo)
+    - tau  : bruit ajouté à rd avant chaque période (le niveau peut bouger)
+    Mise à jour par passage de messages d'un match (fonctions v et w de la loi normale tronquée) ;
+    dans une période, les pas de chaque joueur sont sommés et les réductions de variance multipliées.
+    Les nuls (score 0.5) ne modifient rien.
+    """
+
+    def __init__(self, beta=200.0, tau=0.0):
+        self.beta = beta
+        self.tau = tau
+
+    def appliquer(self, population, idx1, idx2, score1):
+        idx1 = np.asarray(idx1, dtype=np.intp)
+        idx2 = np.asarray(idx2, dtype=np.intp)
+        signe = np.sign(np.asarray(score1, dtype=float) - 0.5)   # +1 si j1 gagne, -1 s'il perd
+        n = len(population)
+
+        var = population.rd**2 + self.tau**2
+        c2 = 2 * self.beta**2 + var[idx1] + var[idx2]
+        c = np.sqrt(c2)
+        t = signe * (population.elo[idx1] - population.elo[idx2]) / c
+        v = np.exp(-t**2 / 2 - log(sqrt(2 * pi)) - log_ndtr(t)) * (signe != 0)   # pdf(t) / cdf(t)
+        w = v * (v + t)
+
+        variation = (np.bincount(idx1, signe * var[idx1] / c * v, n)
+                     - np.bincount(idx2, signe * var[idx2] / c * v, n))
+        log_facteur = (np.bincount(idx1, np.log1p(-var[idx1] / c2 * w), n)
+                       + np.bincount(idx2, np.log1p(-var[idx2] / c2 * w), n))
+
+        population.elo += variation
+        population.rd = np.sqrt(var * np.exp(log_facteur))
+        _compter_parties(population, idx1, idx2)
+        return variation
+
+
+SYSTEMES = {
+    "elo": MoteurElo,
+    "glicko2": Glicko2,
+    "trueskill": TrueSkill,
+}
+
+def systeme(nom, **params):
+    """Système de classement par son nom : systeme("glicko2", tau=0.5), systeme("elo", politique="fide")..."""
+    return SYSTEMES[nom](**params)
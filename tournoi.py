@@ -1,8 +1,11 @@
 # tournoi.py
-from random import random, shuffle, randint
 import numpy as np
-from match import Match
+from match import Match, indices_appariements, jouer_lot
+from population import Population
+from snapshots import EnregistreurSnapshots
+from gabarits import gabarit_directe, gabarit_double, nb_exempts
 from math import ceil
+from itertools import groupby
 
 J1_GAGNE = 1
 J2_GAGNE = -1
@@ -11,68 +14,91 @@ J2_GAGNE = -1
 class Tournoi:
     """
     Gère un tournoi (pour l'instant : système suisse).
-    - participants : liste de Joueur
+    - participants : liste de Joueur ou Population (on travaille alors sur ses vues Joueur)
     - resultats[j.nom] : score courant
-    - snapshots : historique des rondes pour l'analyse (DataFrame ensuite)
+    - snapshots : historique des rondes pour l'analyse (EnregistreurSnapshots -> DataFrame)
+    - systeme   : système de classement (systemes_classement.py) ; s'il est donné, les matchs
+                  d'une ronde sont tirés ensemble et les classements mis à jour en un lot par ronde,
+                  au lieu de la mise à jour Elo match par match de Match (demande une Population)
     """
 
-    def __init__(self, participants: list, match):
+    def __init__(self, participants: list, match, rng=None, snapshots=None, systeme=None):
         assert isinstance(match, Match)
+        self.rng = rng if rng is not None else match.rng   # ContexteAleatoire partagé avec le match
+        self.population = None
+        if isinstance(participants, Population):
+            self.population = participants
+            participants = participants.joueurs()
+        elif systeme is not None:
+            raise ValueError("Un système de classement demande des participants en Population")
+        self.systeme = systeme
         self.participants = participants              # liste des joueurs
-        self.historique_rencontres = {}              # qui a joué contre qui
+        self.historique_rencontres = {}              # qui a joué contre qui (set d'adversaires)
+        self.exemptes = set()                        # joueurs ayant déjà eu l'exempt
         self.n_rondes = 6                            # non utilisé pour l'instant
         self.resultats = {}                          # score par nom
         self.match = match                      # pas encore utilisé
 
-        self.snapshots = []                          # pour analytics
+        self.snapshots = snapshots if snapshots is not None else EnregistreurSnapshots()   # pour analytics
+        self.snapshots.lier([j.nom for j in self.participants])
         
         self.init_results()
         self.init_historique_rencontres()
+        self.rng.semer_joueurs(self.participants)     # performances (niveau) tirées dans le même flux
 
     # ---------- initialisation ----------
 
     def type(self, tournoi, avec_elo:bool=True, taille_poule:int=4, n_qualifies:int=8,n_rondes:int=6):
+        """Lance le tournoi de type donné (seul celui-ci est joué)."""
         type_tournoi ={
-            "swiss_round": self.swiss_rounde(avec_elo,n_rondes), 
-            "elimination_directe": self.elimination_directe(avec_elo),
-            "round_robin": self.round_robin(avec_elo),
-            "poule_elimination_directe": self.poule_elimination_directe(avec_elo,taille_poule),
-            "elemination_double": self.elimination_double(avec_elo),
-            "ligue_1": self.ligue_1(avec_elo),
-            "ligue_playoff": self.ligue_playoff(avec_elo,n_qualifies),
+            "swiss_round": lambda: self.swiss_round(n_rondes, avec_elo),
+            "elimination_directe": lambda: self.elimination_directe(avec_elo),
+            "round_robin": lambda: self.round_robin(avec_elo),
+            "poule_elimination_directe": lambda: self.poule_elimination_directe(avec_elo,taille_poule),
+            "elimination_double": lambda: self.elimination_double(avec_elo),
+            "ligue_1": lambda: self.ligue_1(avec_elo),
+            "ligue_playoff": lambda: self.ligue_playoff(avec_elo,n_qualifies),
             }  # type de tournoi
-        return type_tournoi[tournoi]
+        if tournoi not in type_tournoi:
+            raise ValueError(f"Type de tournoi inconnu : {tournoi}")
+        return type_tournoi[tournoi]()
+
     def init_historique_rencontres(self):
         for participant in self.participants:
-            self.historique_rencontres[participant] = []
+            self.historique_rencontres[participant] = set()
 
     def init_results(self):
         for participant in self.participants:
             self.resultats[participant.nom] = 0
 
+    def _tries_par_elo(self):
+        """Participants du meilleur au moins bon elo (un argsort si on a une Population)."""
+        if self.population is not None:
+            return self.population.tries_par_elo()
+        return sorted(self.participants, key=lambda j: (j.elo), reverse=True)
+
     def _capture_snapshot(self, n_ronde: int):
         """Sauvegarde l’état du tournoi après la ronde n_ronde."""
-        snap = []
-        for j in self.participants:
-            snap.append({
-                "ronde": n_ronde,
-                "nom": j.nom,
-                "score": self.resultats[j.nom],
-                "elo": j.elo,
-                "niveau_reel": getattr(j, "_niveau", None),
-            })
-        self.snapshots.append(snap)
+        if self.population is not None:
+            elo, niveau = self.population.elo, self.population.niveau_E
+        else:
+            elo = [j.elo for j in self.participants]
+            niveau = [j.niveau_E for j in self.participants]
+        score = [self.resultats[j.nom] for j in self.participants]
+        self.snapshots.enregistrer(n_ronde, score, elo, niveau)
 
     # ---------- simulation d'un match ----------
 
     def créer_apparaiement_ronde_suisse(self, avec_elo: bool = True):
         """
         Crée les appariements d'une ronde suisse :
-        - tri par (score, elo)
-        - on essaie d'éviter les re-matches en utilisant historique_rencontres
-        - dernier joueur non apparié -> exempt (None)
+        - tri par (score, elo), puis découpage en groupes de même score
+        - dans chaque groupe on apparie chaque joueur au premier suivant qu'il n'a pas déjà
+          rencontré (historique_rencontres est un set : test en O(1))
+        - les joueurs sans adversaire dans leur groupe "flottent" vers le groupe suivant
+        - nombre impair -> le moins bien classé n'ayant pas encore été exempt est exempt (None)
+        Pas de re-match, sauf s'il n'existe aucun appariement sans re-match.
         """
-        n_participants = len(self.participants)
         if avec_elo:
             participants_classés = sorted(
             self.participants,
@@ -85,54 +111,111 @@ class Tournoi:
             key=lambda j: (self.resultats[j.nom]),
             reverse=True,
             )  # classemeent en fonction du nombre de points uniquement
-        
+
+        exempt = None
+        if len(participants_classés) % 2 == 1:
+            idx_exempt = len(participants_classés) - 1
+            for i in range(len(participants_classés) - 1, -1, -1):
+                if participants_classés[i] not in self.exemptes:
+                    idx_exempt = i
+                    break
+            exempt = participants_classés.pop(idx_exempt)
+            self.exemptes.add(exempt)
+
         appariements = []
-        deja_paires = set()
-        i = 0
+        flottants = []
+        for _, groupe in groupby(participants_classés, key=lambda j: self.resultats[j.nom]):
+            flottants = self._apparier_groupe(flottants + list(groupe), appariements)
 
-        while i < n_participants:
-            j1 = participants_classés[i]
+        if flottants:
+            appariements = self._reparer_fin(appariements, flottants)
 
-            if j1 in deja_paires:
-                i += 1
-                continue
+        if exempt is not None:
+            appariements.append((exempt, None))
 
-            candidats_restants = [
-                j for j in participants_classés[i + 1:]
-                if j not in deja_paires
-            ]
+        # mise à jour historique
+        for j1, j2 in appariements:
+            if j2 is not None:
+                self.historique_rencontres[j1].add(j2)
+                self.historique_rencontres[j2].add(j1)
 
-            if not candidats_restants:
-                appariements.append((j1, None))
-                deja_paires.add(j1)
-                break
+        return appariements
 
+    def _apparier_groupe(self, joueurs, appariements):
+        """
+        Apparie un groupe de score (dans l'ordre du classement) en ajoutant les paires à appariements.
+        Renvoie les joueurs restés sans adversaire (flottants pour le groupe suivant).
+        """
+        libres = [True] * len(joueurs)
+        flottants = []
+        debut = 0   # premier indice encore libre : évite de re-parcourir le début du groupe
+        for i, j1 in enumerate(joueurs):
+            if not libres[i]:
+                continue
+            libres[i] = False
+            deja_vus = self.historique_rencontres[j1]
             adversaire = None
-            for candidat in candidats_restants:
-                if candidat not in self.historique_rencontres[j1]:
-                    adversaire = candidat
+            for k in range(max(i + 1, debut), len(joueurs)):
+                if libres[k] and joueurs[k] not in deja_vus:
+                    adversaire = k
                     break
             if adversaire is None:
-                adversaire = candidats_restants[0]
-
-            appariements.append((j1, adversaire))
-            deja_paires.add(j1)
-            deja_paires.add(adversaire)
+                flottants.append(j1)
+                continue
+            libres[adversaire] = False
+            appariements.append((j1, joueurs[adversaire]))
+            while debut < len(joueurs) and not libres[debut]:
+                debut += 1
+        return flottants
 
-            i += 1
+    def _reparer_fin(self, appariements, flottants):
+        """
+        Les derniers flottants n'ont plus d'adversaire possible : on défait les dernières paires
+        (fenêtre doublée à chaque échec) et on cherche un couplage maximum sans re-match sur ce
+        bout (algorithme d'Edmonds, O(m³) pour m joueurs dans la fenêtre : polynomial, sans
+        recherche exhaustive). Si même le champ entier n'admet pas d'appariement sans re-match,
+        on garde le couplage maximum et seuls les joueurs restants sont appariés dans l'ordre.
+        """
+        taille = 1
+        while True:
+            taille = min(taille, len(appariements))
+            fin = appariements[len(appariements) - taille:]
+            paires, restants = self._apparier_sans_revanche(fin, flottants)
+            if not restants or taille == len(appariements):
+                break
+            taille *= 2
 
-        # mise à jour historique
-        for j1, j2 in appariements:
-            if j2 is not None:
-                self.historique_rencontres[j1].append(j2)
-                self.historique_rencontres[j2].append(j1)
+        for i in range(0, len(restants) - 1, 2):   # re-matchs inévitables, limités aux restants
+            paires.append((restants[i], restants[i + 1]))
+        return appariements[:len(appariements) - taille] + paires
 
-        return appariements
+    def _apparier_sans_revanche(self, paires, flottants):
+        """
+        Couplage maximum du graphe "pas encore rencontré" sur les joueurs des paires et les
+        flottants, en partant des paires existantes (elles sont gardées autant que possible).
+        Renvoie (paires dans l'ordre du classement, joueurs restés sans adversaire).
+        """
+        joueurs = [j for paire in paires for j in paire] + flottants
+        position = {j: i for i, j in enumerate(joueurs)}
+        voisins = [[k for k, j2 in enumerate(joueurs) if k != i and j2 not in self.historique_rencontres[j1]]
+                   for i, j1 in enumerate(joueurs)]
+        couple = [-1] * len(joueurs)
+        for j1, j2 in paires:
+            couple[position[j1]], couple[position[j2]] = position[j2], position[j1]
+        couple = couplage_maximum(voisins, couple)
+
+        nouvelles = [(joueurs[i], joueurs[k]) for i, k in enumerate(couple) if i < k]
+        restants = [j for i, j in enumerate(joueurs) if couple[i] == -1]
+        return nouvelles, restants
 
     # ---------- déroulement d'une ronde ----------
 
     def jouer_ronde(self, n_ronde: int,avec_elo: bool = True):
         appariements = self.créer_apparaiement_ronde_suisse(avec_elo)
+        if self.systeme is not None:
+            self._jouer_ronde_systeme(appariements)
+            self._capture_snapshot(n_ronde)
+            return
 
         for j1, j2 in appariements:
             if j2 is None:
@@ -148,64 +231,173 @@ class Tournoi:
     
         self._capture_snapshot(n_ronde)
 
+    def _ronde_systeme(self, idx1, idx2):
+        """Tire les matchs idx1 contre idx2 sans toucher aux Elo, puis met à jour le système en un lot."""
+        res = self.match.resultats(self.population, idx1, idx2, maj_elo=False)
+        self.systeme.appliquer(self.population, idx1, idx2, (res == J1_GAGNE).astype(float))
+        return res
+
+    def _jouer_ronde_systeme(self, appariements):
+        for j1, j2 in appariements:
+            if j2 is None:
+                self.resultats[j1.nom] += 1
+        idx1, idx2 = indices_appariements(self.population, appariements)
+        res = self._ronde_systeme(idx1, idx2)
+        for i in np.where(res == J1_GAGNE, idx1, idx2).tolist():
+            self.resultats[self.population.noms[i]] += 1
+
         # ---------- élimination direct ----------
 
     def elimination_directe(self,avec_elo=True): #Si on choisi avec elo, alors le favori jouera avec le pire joueur etc. Sinon : aléatoire
-        classement_de_sortie={}     # joueur:classement
-        classement_actuel = ceil(np.log2(len(self.participants))+1)   # si un joueur perd à ce round il aura ce classement
-        joueurs_actuels=[]
+        """
+        Renvoie {joueur: classement} (1 = vainqueur ; les perdants d'un même tour partagent
+        la même place). Le tableau (qui rencontre qui, quel exempt, quelle place) est un
+        gabarit compilé une fois par (n, exempts) puis réutilisé.
+        """
+        joueurs_actuels = self._ordre_tableau(avec_elo)
+        gabarit = gabarit_directe(len(joueurs_actuels), self._exempts(len(joueurs_actuels), avec_elo))
+        return dict(self._parcourir(gabarit, joueurs_actuels))
+
+    def _ordre_tableau(self, avec_elo):
+        if avec_elo:
+            return self._tries_par_elo() #du meilleur au moins bon
+        joueurs_actuels = self.participants.copy()
+        self.rng.melanger(joueurs_actuels)
+        return joueurs_actuels
+
+    def _exempts(self, n, avec_elo):
+        """Indice de l'exempt à chaque tour impair : le premier (meilleur Elo) ou tiré au hasard."""
         if avec_elo:
-            joueurs_actuels=sorted(
-                self.participants,
-                key=lambda j: (j.elo),
-                reverse=True
-            ) #du meilleur au moins bon
+            return (0,) * nb_exempts(n)
+        exempts = []
+        while n > 1:
+            if n % 2 == 1:
+                exempts.append(self.rng.entier(0, n - 1))
+            n = (n + 1) // 2
+        return tuple(exempts)
+
+    def _parcourir(self, gabarit, joueurs):
+        """Joue les matchs du gabarit dans l'ordre ; renvoie [(joueur, place)] des sorties, vainqueur en dernier."""
+        if self.systeme is not None:
+            return self._parcourir_systeme(gabarit, joueurs)
+        n = gabarit.n
+        noeuds = list(joueurs) + [None] * (2 * len(gabarit.u))
+        sorties = []
+        for k, (a, b, sortie) in enumerate(zip(gabarit.u, gabarit.v, gabarit.sortie)):
+            j1, j2 = noeuds[a], noeuds[b]
+            if self.match.resultat(j1, j2) == J1_GAGNE:
+                gagnant, perdant = j1, j2
+            else:
+                gagnant, perdant = j2, j1
+            noeuds[n + 2 * k] = gagnant
+            noeuds[n + 2 * k + 1] = perdant
+            if sortie >= 0:
+                sorties.append((perdant, sortie))
+        sorties.append((noeuds[gabarit.vainqueur], gabarit.sortie_vainqueur))
+        return sorties
+
+    def _parcourir_systeme(self, gabarit, joueurs):
+        """_parcourir avec un système de classement : chaque tour du gabarit est une ronde jouée en lot."""
+        n = gabarit.n
+        noeuds = np.empty(gabarit.n_noeuds, dtype=np.intp)   # indices dans la population
+        noeuds[:n] = [j.i for j in joueurs]
+        for debut, fin in gabarit.tours:
+            j1, j2 = noeuds[gabarit.u_np[debut:fin]], noeuds[gabarit.v_np[debut:fin]]
+            j1_gagne = self._ronde_systeme(j1, j2) == J1_GAGNE
+            noeuds[n + 2 * debut:n + 2 * fin:2] = np.where(j1_gagne, j1, j2)
+            noeuds[n + 2 * debut + 1:n + 2 * fin:2] = np.where(j1_gagne, j2, j1)
+
+        vues = self.population.joueurs()
+        sorties = [(vues[noeuds[n + 2 * k + 1]], place) for k, place in enumerate(gabarit.sortie) if place >= 0]
+        sorties.append((vues[noeuds[gabarit.vainqueur]], gabarit.sortie_vainqueur))
+        return sorties
+    
+    def elimination_directe_lot(self, n_tirages:int, avec_elo:bool=True):
+        """
+        Simule n_tirages tableaux d'élimination directe indépendants en même temps.
+        Chaque ligne d'une matrice (n_tirages x n) contient un tableau ; chaque tour divise
+        le nombre de colonnes par deux avec un tirage vectorisé de tous les matchs.
+        Même règles que elimination_directe (meilleur contre pire si avec_elo, sinon mélange
+        aléatoire ; exempt = premier de la liste ou joueur au hasard quand le nombre est impair).
+        Renvoie la matrice (n_tirages x n) des classements de sortie, colonnes dans l'ordre
+        de self.participants. Les Elo des participants ne sont pas modifiés.
+        """
+        population = self.population if self.population is not None else Population.depuis_joueurs(self.participants)
+        n = len(population)
+        lignes = np.arange(n_tirages)
+
+        if avec_elo or nb_exempts(n) == 0:   # même tableau pour toutes les lignes : gabarit compilé
+            return self._elimination_directe_gabarit(population, n_tirages, avec_elo)
+
+        # tirage au sort avec exempts : un tableau différent par ligne
+        joueurs_actuels = np.argsort(self.rng.generateur.random((n_tirages, n)), axis=1)   # une permutation par ligne
+
+        elo = np.tile(population.elo, (n_tirages, 1))   # Elo propre à chaque tableau (mode ELO)
+        classement_de_sortie = np.zeros((n_tirages, n), dtype=int)
+        classement_actuel = ceil(np.log2(n)+1)
+
+        while joueurs_actuels.shape[1] > 1:
+            m = joueurs_actuels.shape[1]
+            isoles = None
+            if m % 2 == 1:
+                idx_isole = self.rng.generateur.integers(0, m, n_tirages)
+                isoles = joueurs_actuels[lignes, idx_isole]
+                garde = np.ones((n_tirages, m), dtype=bool)
+                garde[lignes, idx_isole] = False
+                joueurs_actuels = joueurs_actuels[garde].reshape(n_tirages, m - 1)
+                m -= 1
+
+            moitie = m // 2
+            j1 = joueurs_actuels[:, :moitie]               # i
+            j2 = joueurs_actuels[:, ::-1][:, :moitie]      # n-1-i
+            j1_gagne = _tirer_victoires(self.match.type_match, population, elo, j1, j2, self.rng.generateur)
+
+            gagnants = np.where(j1_gagne, j1, j2)
+            perdants = np.where(j1_gagne, j2, j1)
+            classement_de_sortie[lignes[:, None], perdants] = classement_actuel
+
+            joueurs_actuels = gagnants if isoles is None else np.column_stack([isoles, gagnants])
+            classement_actuel -= 1
+
+        classement_de_sortie[lignes, joueurs_actuels[:, 0]] = classement_actuel   # dernier joueur, gagnant ultime
+        return classement_de_sortie
+
+    def _elimination_directe_gabarit(self, population, n_tirages, avec_elo):
+        """elimination_directe_lot quand toutes les lignes suivent le même gabarit : un tirage vectorisé par tour."""
+        n = len(population)
+        lignes = np.arange(n_tirages)[:, None]
+        gabarit = gabarit_directe(n, (0,) * nb_exempts(n))
+
+        # noeuds[nœud, ligne] : une ligne par nœud du gabarit, donc chaque tour lit et écrit des lignes contiguës
+        noeuds = np.empty((gabarit.n_noeuds, n_tirages), dtype=np.intp)
+        if avec_elo:
+            noeuds[:n] = population.ordre_elo()[:, None]   #du meilleur au moins bon
         else:
-            joueurs_actuels=self.participants.copy()
-            shuffle(joueurs_actuels)
-
-        while len(joueurs_actuels)>1:
-            perdant=[]
-            n=len(joueurs_actuels)
-            joueurs_suivants=[]
-            joueur_isole=-1
-            if len(joueurs_actuels)%2==1:
-                if avec_elo:
-                    joueur_isole=0
-                else:
-                    joueur_isole=randint(0,len(joueurs_actuels)-1)
-                joueurs_suivants.append(joueurs_actuels[joueur_isole])
-                #del joueurs_actuels[joueur_isole]
-                joueurs_actuels.pop(joueur_isole)
-                n=n-1
-            
-            for i in range(n//2):
-                if self.match.resultat(joueurs_actuels[i],joueurs_actuels[n-1-i])==J1_GAGNE:
-                    joueurs_suivants.append(joueurs_actuels[i])
-                    classement_de_sortie[joueurs_actuels[n-i-1]]=classement_actuel
-                    perdant.append(joueurs_actuels[n-1-i])
-                else:
-                    joueurs_suivants.append(joueurs_actuels[n-1-i])
-                    classement_de_sortie[joueurs_actuels[i]]=classement_actuel
-                    perdant.append(joueurs_actuels[i])
-            joueurs_actuels=joueurs_suivants
-            classement_actuel-=1
-        classement_de_sortie[joueurs_actuels[0]] = classement_actuel   # dernier joueur, gagnant ultime
+            noeuds[:n] = np.argsort(self.rng.generateur.random((n_tirages, n)), axis=1).T   # une permutation par ligne
+
+        elo = np.tile(population.elo, (n_tirages, 1))   # Elo propre à chaque tableau (mode ELO)
+        classement_de_sortie = np.zeros((n_tirages, n), dtype=int)
+        for debut, fin in gabarit.tours:
+            j1 = noeuds[gabarit.u_np[debut:fin]].T
+            j2 = noeuds[gabarit.v_np[debut:fin]].T
+            j1_gagne = _tirer_victoires(self.match.type_match, population, elo, j1, j2, self.rng.generateur)
+            perdants = np.where(j1_gagne, j2, j1)
+            noeuds[n + 2 * debut:n + 2 * fin:2] = np.where(j1_gagne, j1, j2).T
+            noeuds[n + 2 * debut + 1:n + 2 * fin:2] = perdants.T
+            classement_de_sortie[lignes, perdants] = gabarit.sortie_np[debut:fin]
+
+        classement_de_sortie[lignes[:, 0], noeuds[gabarit.vainqueur]] = gabarit.sortie_vainqueur   # gagnant ultime
         return classement_de_sortie
-    
+
     def poule_elimination_directe(self, avec_elo:bool=True, taille_poule:int=4):
         classement_de_sortie=[]
         joueurs_actuels=[]
 
         if avec_elo:
-            joueurs_actuels=sorted(
-                self.participants,
-                key=lambda j: (j.elo),
-                reverse=True
-            ) #du meilleur au moins bon
+            joueurs_actuels=self._tries_par_elo() #du meilleur au moins bon
         else:
-            joueurs_actuels=self.participants
-            random.shuffle(joueurs_actuels)
+            joueurs_actuels=self.participants.copy()
+            self.rng.melanger(joueurs_actuels)
 
         nombre_de_poule=len(joueurs_actuels)//taille_poule
         poules=[]
@@ -214,70 +406,23 @@ class Tournoi:
             poules.append(joueurs_actuels[i*taille_poule:(i+1)*taille_poule])
         
         for poule in poules:
-            tournoi_poule=Tournoi(poule,self.match)
-            tournoi_poule.elimination_direct(avec_elo)
-            classement_de_sortie.append(tournoi_poule.classement_de_sortie)
+            tournoi_poule=Tournoi(poule,self.match,self.rng)
+            classement_de_sortie.append(tournoi_poule.elimination_directe(avec_elo))
         
         return classement_de_sortie
     
     def elimination_double(self,avec_elo:bool=True):
-        classement_finale=[]
-        joueur_haut=[]
-        joueur_bas=[]
-        if avec_elo:
-            joueur_haut=sorted(
-                self.participants,
-                key=lambda j: (j.elo),
-                reverse=True
-            ) #du meilleur au moins bon
-        else:
-            joueur_haut=self.participants
-            random.shuffle(joueur_haut)
-        while len(joueur_haut)>1:
-            n=len(joueur_haut)
-            joueur_survivant=[]
-            for i in range(n//2):
-                
-                if J1_GAGNE==self.match.resultat(joueur_haut[i],joueur_haut[n-i-1]):
-                    joueur_bas.append(joueur_haut[n-i-1])
-                    joueur_survivant.append(joueur_haut[i])
-                else:
-                    joueur_bas.append(joueur_haut[i])
-                    joueur_survivant.append(joueur_haut[n-i-1])
-            joueur_haut=joueur_survivant
-            m= len(joueur_bas)
-            joueur_survivant_bas=[]
-            while len(joueur_bas)!=len(joueur_haut)/2:
-                m=len(joueur_bas)
-                joueur_survivant_bas=[]
-                for j in range(m//2):
-                    if J1_GAGNE==self.match.resultat(joueur_bas[j],joueur_bas[m-j-1]):
-                        classement_finale.append(joueur_bas[m-j-1])
-                        joueur_survivant_bas.append(joueur_bas[j])
-                    else:
-                        classement_finale.append(joueur_bas[j])
-                        joueur_survivant_bas.append(joueur_bas[m-j-1])
-                joueur_bas=joueur_survivant_bas
-        classement_finale.append(joueur_haut[0])
-        return classement_finale
+        """
+        Double élimination (voir gabarits.gabarit_double) : renvoie la liste des joueurs du
+        premier éliminé au vainqueur.
+        """
+        joueurs = self._ordre_tableau(avec_elo)
+        gabarit = gabarit_double(len(joueurs), self._exempts(len(joueurs), avec_elo))
+        return [j for j, _ in self._parcourir(gabarit, joueurs)]
     
     def ligue_1(self,avec_elo:bool=True): #TODO: attribué des niveau selon domicile ou exterieur
-        classement_finale=[]
-        score = { j.nom:0 for j in self.participants 
-                    }
-        for i in range (len(self.participants)):#Match aller
-            for j in range (i+1,len(self.participants)):
-                if J1_GAGNE==self.match.resultat(self.participants[i],self.participants[j]):
-                    score[self.participants[i].nom]+=1
-                else:
-                    score[self.participants[j].nom]+=1
-        
-        for i in range(len(self.participants)): #Match retour
-            for j in range (i+1,len(self.participants)):
-                if J1_GAGNE==self.match.resultat(self.participants[i],self.participants[j]):
-                    score[self.participants[i].nom]+=1
-                else:
-                    score[self.participants[j].nom]+=1
+        scores = self._scores_tous_contre_tous(n_passes=2)   # matchs aller puis retour
+        score = {j.nom: scores[i] for i, j in enumerate(self.participants)}
         classement_finale=sorted(
             self.participants,
             key=lambda j: (score[j.nom]),
@@ -289,8 +434,8 @@ class Tournoi:
     def ligue_playoff(self, avec_elo:bool=True, n_qualifies:int=8):
         classement_temporaire=self.ligue_1(avec_elo)
         qualifies=classement_temporaire[:n_qualifies]
-        tournoi_playoff=Tournoi(qualifies,self.match)
-        classement_finale=tournoi_playoff.elimination_direct(avec_elo)
+        tournoi_playoff=Tournoi(qualifies,self.match,self.rng)
+        classement_finale=tournoi_playoff.elimination_directe(avec_elo)
         return classement_finale
 
     def swiss_round(self, n_rondes:int=6, avec_elo:bool=True):
@@ -304,15 +449,148 @@ class Tournoi:
         return classement_finale
 
     def round_robin(self, avec_elo:bool=True):
-        for i in range (len(self.participants)):
-            for j in range (i+1,len(self.participants)):
-                if J1_GAGNE==self.match.resultat(self.participants[i],self.participants[j]):
-                    self.resultats[self.participants[i].nom]+=1
-                else:
-                    self.resultats[self.participants[j].nom]+=1
+        scores = self._scores_tous_contre_tous()
+        for i, j in enumerate(self.participants):
+            self.resultats[j.nom] += scores[i]
         classement_finale=sorted(
             self.participants,
             key=lambda j: (self.resultats[j.nom], j.elo),
             reverse=True
         )
-        return classement_finale
\ No newline at end of file
+        return classement_finale
+
+    def _scores_tous_contre_tous(self, n_passes:int=1):
+        """
+        Joue n_passes fois toutes les paires (i, j), i < j, et renvoie le tableau des victoires.
+        Si l'issue ne dépend pas de l'Elo courant (modes NIVEAU et INTRINSEQUE), les matchs
+        sont indépendants : tout le calendrier est tiré en un seul appel à Match.resultats et
+        les scores sont des sommes par ligne / colonne. En mode ELO on garde l'ordre séquentiel.
+        """
+        n = len(self.participants)
+        scores = np.zeros(n)
+
+        if self.systeme is not None:   # une période de classement par ronde du calendrier
+            for _ in range(n_passes):
+                for idx1, idx2 in rondes_round_robin(n):
+                    j1_gagne = self._ronde_systeme(idx1, idx2) == J1_GAGNE
+                    scores += np.bincount(idx1, weights=j1_gagne, minlength=n)
+                    scores += np.bincount(idx2, weights=~j1_gagne, minlength=n)
+            return scores
+
+        if self.match.elo_dynamique:
+            for _ in range(n_passes):
+                for i in range (n):
+                    for j in range (i+1,n):
+                        if J1_GAGNE==self.match.resultat(self.participants[i],self.participants[j]):
+                            scores[i]+=1
+                        else:
+                            scores[j]+=1
+            return scores
+
+        idx1, idx2 = np.triu_indices(n, k=1)
+        idx1 = np.tile(idx1, n_passes)
+        idx2 = np.tile(idx2, n_passes)
+        joueurs = self.population if self.population is not None else self.participants
+        j1_gagne = self.match.resultats(joueurs, idx1, idx2) == J1_GAGNE
+
+        scores += np.bincount(idx1, weights=j1_gagne, minlength=n)
+        scores += np.bincount(idx2, weights=~j1_gagne, minlength=n)
+        return scores
+
+
+def couplage_maximum(voisins, couple=None):
+    """
+    Couplage de cardinal maximum d'un graphe quelconque (algorithme des fleurs d'Edmonds, O(n³)).
+    - voisins : listes d'adjacence sur 0..n-1
+    - couple  : couplage de départ (couple[i] = partenaire ou -1), augmenté sur place
+    Renvoie couple.
+    """
+    n = len(voisins)
+    couple = [-1] * n if couple is None else couple
+
+    def ancetre_commun(a, b, base, parent):
+        vus = [False] * n
+        while True:
+            a = base[a]
+            vus[a] = True
+            if couple[a] == -1:
+                break
+            a = parent[couple[a]]
+        while True:
+            b = base[b]
+            if vus[b]:
+                return b
+            b = parent[couple[b]]
+
+    def chemin_augmentant(racine):
+        utilise = [False] * n
+        parent = [-1] * n
+        base = list(range(n))
+        utilise[racine] = True
+        file = [racine]
+        tete = 0
+        while tete < len(file):
+            v = file[tete]
+            tete += 1
+            for u in voisins[v]:
+                if base[v] == base[u] or couple[v] == u:
+                    continue
+                if u == racine or (couple[u] != -1 and parent[couple[u]] != -1):
+                    # cycle impair : on contracte la fleur sur sa base
+                    b = ancetre_commun(v, u, base, parent)
+                    fleur = [False] * n
+                    for x, enfant in ((v, u), (u, v)):
+                        while base[x] != b:
+                            fleur[base[x]] = fleur[base[couple[x]]] = True
+                            parent[x] = enfant
+                            enfant = couple[x]
+                            x = parent[couple[x]]
+                    for i in range(n):
+                        if fleur[base[i]]:
+                            base[i] = b
+                            if not utilise[i]:
+                                utilise[i] = True
+                                file.append(i)
+                elif parent[u] == -1:
+                    parent[u] = v
+                    if couple[u] == -1:
+                        return u, parent
+                    utilise[couple[u]] = True
+                    file.append(couple[u])
+        return -1, parent
+
+    for racine in range(n):
+        if couple[racine] != -1:
+            continue
+        u, parent = chemin_augmentant(racine)
+        while u != -1:   # inversion du chemin augmentant
+            v = parent[u]
+            suivant = couple[v]
+            couple[u], couple[v] = v, u
+            u = suivant
+    return couple
+
+
+def rondes_round_robin(n):
+    """
+    Calendrier d'un round robin par la méthode du cercle : n-1 rondes (n pair) où chaque joueur
+    joue une fois ; avec n impair, un joueur fictif donne l'exempt. Liste de (idx1, idx2).
+    """
+    m = n + n % 2
+    cercle = np.arange(m)
+    rondes = []
+    for _ in range(m - 1):
+        idx1, idx2 = cercle[:m // 2], cercle[::-1][:m // 2]
+        garde = (idx1 < n) & (idx2 < n)
+        rondes.append((idx1[garde], idx2[garde]))
+        cercle = np.concatenate([cercle[:1], np.roll(cercle[1:], 1)])
+    return rondes
+
+
+def _tirer_victoires(type_match, population, elo, j1, j2, rng=np.random):
+    """
+    Tire en bloc les matchs j1[r, k] contre j2[r, k] (indices dans la population, une ligne par
+    simulation) avec match.jouer_lot. elo est la matrice (simulations x joueurs) des Elo, mise à
+    jour sur place comme dans Match. Renvoie la matrice booléenne "j1 gagne".
+    """
+    return jouer_lot(type_match, population.niveau_E, population.niveau_V, elo, population.K, j1, j2, rng) == J1_GAGNE
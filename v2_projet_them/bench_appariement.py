@@ -0,0 +1,38 @@
+# bench_appariement.py
+# Coût par ronde de l'appariement suisse (couplage de poids maximal) de 32 à 1024 joueurs.
+import random
+import time
+
+import numpy as np
+
+from joueur import Joueur
+from tournoi import Tournoi
+
+
+def bench(n_joueurs, n_rondes=11, graine=0):
+    random.seed(graine)
+    joueurs = [Joueur(f"J{i}", niveau=random.gauss(1500, 200)) for i in range(n_joueurs)]
+    t = Tournoi(joueurs)
+
+    temps_appariement = []
+    # même déroulé que systeme_suisse, en chronométrant uniquement l'appariement
+    for r in range(n_rondes):
+        joueurs_round = t._trier_joueurs_suisse()
+        debut = time.perf_counter()
+        paires = t._trouver_appariements(joueurs_round)
+        temps_appariement.append(time.perf_counter() - debut)
+        assert paires is not None
+        for j1, j2 in paires:
+            assert j2 not in t.deja_joue[j1]
+            t.deja_joue[j1].add(j2)
+            t.deja_joue[j2].add(j1)
+            t.scores[j1 if random.random() < 0.5 else j2] += 1.0
+
+    return np.mean(temps_appariement), np.max(temps_appariement)
+
+
+if __name__ == "__main__":
+    print(f"{'joueurs':>8} | {'ms/ronde':>9} | {'µs/joueur':>9} | {'pire ronde (ms)':>15}")
+    for n in (32, 64, 128, 256, 512, 1024):
+        moyen, pire = bench(n)
+        print(f"{n:>8} | {moyen*1e3:>9.1f} | {moyen/n*1e6:>9.1f} | {pire*1e3:>15.1f}")
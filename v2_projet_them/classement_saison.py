@@ -0,0 +1,72 @@
+# classement_saison.py
+import numpy as np
+
+
+class ClassementSaison:
+    """
+    Index des classements de saison, mis à jour tournoi par tournoi.
+
+    Pour chaque système de points on garde :
+      - les totaux courants (un tableau, indexé comme la liste des joueurs),
+      - l'ordre des joueurs par total (indices, égalités par indice) -> classement / top-k,
+      - les rangs obtenus à chaque tournoi,
+      - moyenne et M2 (Welford) des rangs de chaque joueur -> volatilité en O(n).
+    Points = pénalité : plus le total est petit, mieux c'est.
+    """
+
+    def __init__(self, joueurs, systemes):
+        self.joueurs = list(joueurs)
+        self.index = {j: i for i, j in enumerate(self.joueurs)}
+        n = len(self.joueurs)
+        self.totaux = {s: np.zeros(n) for s in systemes}
+        self.ordres = {s: np.arange(n) for s in systemes}
+        self.rangs = {s: [] for s in systemes}
+        self._moyenne_rang = {s: np.zeros(n) for s in systemes}
+        self._m2_rang = {s: np.zeros(n) for s in systemes}
+
+    def __contains__(self, systeme):
+        return systeme in self.totaux
+
+    def nb_tournois(self, systeme):
+        return len(self.rangs[systeme])
+
+    def enregistrer(self, systeme, points):
+        """Ajoute les points d'un tournoi (séquence alignée sur self.joueurs)."""
+        points = np.asarray(points, dtype=float)
+        totaux = self.totaux[systeme]
+        totaux += points
+
+        # un seul tri des totaux par tournoi, O(n log n) (tri stable : égalités par indice)
+        self.ordres[systeme] = np.argsort(totaux, kind="stable")
+
+        # Rang du tournoi (1 = moins de points, égalités départagées par l'ordre de la liste)
+        rang = np.empty(len(points), dtype=int)
+        rang[np.argsort(points, kind="stable")] = np.arange(1, len(points) + 1)
+        self.rangs[systeme].append(rang)
+
+        # Welford
+        t = len(self.rangs[systeme])
+        moyenne, m2 = self._moyenne_rang[systeme], self._m2_rang[systeme]
+        delta = rang - moyenne
+        moyenne += delta / t
+        m2 += delta * (rang - moyenne)
+
+    def total(self, systeme, joueur):
+        return self.totaux[systeme][self.index[joueur]]
+
+    def classement(self, systeme):
+        """Joueurs du meilleur (moins de points) au moins bon."""
+        return [self.joueurs[i] for i in self.ordres[systeme]]
+
+    def top(self, systeme, k):
+        return [self.joueurs[i] for i in self.ordres[systeme][:k]]
+
+    def bas(self, systeme, k):
+        return [self.joueurs[i] for i in self.ordres[systeme][-k:]]
+
+    def volatilite_rangs(self, systeme):
+        """Écart-type des rangs de chaque joueur sur les tournois joués (tableau)."""
+        t = len(self.rangs[systeme])
+        if t == 0:
+            return np.zeros(len(self.joueurs))
+        return np.sqrt(self._m2_rang[systeme] / t)
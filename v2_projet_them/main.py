@@ -1,15 +1,27 @@
+import os
 import random
 import numpy as np
 import matplotlib.pyplot as plt
 
 # Tes modules
+import racine  # noqa: F401 (import pour son effet : ajoute la racine du dépôt, où sont cache.py et resultats.py, à sys.path)
 from joueur import Joueur
 from saison import Saison
 from metrics import MetricsAnalyzer
+from cache import CacheSimulation
+from resultats import MagasinResultats
 
 # Fixer la graine pour la reproductibilité
-random.seed(42)
-np.random.seed(42)
+GRAINE = 42
+random.seed(GRAINE)
+np.random.seed(GRAINE)
+
+# Résultats sur disque (resultats.MagasinResultats : Parquet partitionné, en ajout seul)
+DOSSIER_RESULTATS = "resultats"
+DISTRIBUTION = "normale"   # niveaux tirés par generer_niveaux_fixes
+
+# Saisons déjà simulées (clé = hash de la configuration complète), éviction LRU sous budget disque
+CACHE = CacheSimulation()
 
 def generer_niveaux_fixes(n=32):
     """Génère l'ADN des joueurs (Niveau intrinsèque)."""
@@ -27,6 +39,42 @@ def creer_population_fraiche(niveaux_adn, elo_depart=1200):
         joueurs.append(j)
     return joueurs
 
+def magasin(dossier, nom):
+    """Dataset dossier/nom ("metriques" ou "joueurs")."""
+    return MagasinResultats(os.path.join(dossier, nom))
+
+def enregistrer_resultats(dossier, nom, lignes):
+    """
+    Ajoute des lignes (liste de dicts d'une même saison et d'un même format) au dataset dossier/nom :
+    un fichier par attribution, les clés format / attribution / graine servent de partition.
+    """
+    cles = ("format", "attribution", "graine")
+    for dist in dict.fromkeys(l["attribution"] for l in lignes):
+        groupe = [l for l in lignes if l["attribution"] == dist]
+        colonnes = {c: [l[c] for l in groupe] for c in groupe[0] if c not in cles}
+        magasin(dossier, nom).ecrire(colonnes, groupe[0]["format"], DISTRIBUTION, dist, groupe[0]["graine"])
+
+def charger_resultats(dossier, formats, distributions, graine=GRAINE):
+    """
+    Relit les datasets écrits par main() (filtres poussés sur les partitions) et reconstruit
+    metrics_globales et player_stats pour l'affichage, sans resimuler.
+    """
+    filtres = {"format": formats, "attribution": distributions, "graine": graine}
+    df_metriques = magasin(dossier, "metriques").vers_df(**filtres)
+    df_joueurs = magasin(dossier, "joueurs").vers_df(**filtres)
+
+    metrics_globales = {}
+    player_stats = {}
+    for (fmt, dist), groupe in df_metriques.groupby(["format", "attribution"], observed=True):
+        groupe = groupe.sort_values("saison")
+        metrics_globales[(fmt, dist)] = {c: groupe[c].tolist() for c in ["spearman", "top3", "bot3", "vol_mean", "vol_std"]}
+    for (fmt, dist), groupe in df_joueurs.groupby(["format", "attribution"], observed=True):
+        groupe = groupe.sort_values(["joueur", "saison"])
+        player_stats[(fmt, dist)] = {
+            int(idx): list(zip(g["points_moy"], g["points_std"])) for idx, g in groupe.groupby("joueur")
+        }
+    return metrics_globales, player_stats
+
 def afficher_tableau_console(metrics_globales, formats, distributions):
     """Affiche le tableau récapitulatif dans la console."""
     print("\n" + "="*140)
@@ -137,7 +185,7 @@ def afficher_graphes_points_vs_niveau_coherent(player_stats, metrics_globales, f
     plt.tight_layout(rect=[0, 0.03, 1, 0.96])
     plt.show()
 
-def main():
+def main(simuler=True, dossier=DOSSIER_RESULTATS):
     # --- PARAMÈTRES ---
     NB_SAISONS = 50      
     NB_TOURNOIS = 5     
@@ -148,64 +196,83 @@ def main():
     DISTRIBUTIONS = ["lineaire", "exponentielle", "logarithmique"]
     
     niveaux_adn = generer_niveaux_fixes(NB_JOUEURS)
-    
-    # Stockage
-    metrics_globales = {}
-    player_stats = {}
-
-    for fmt in FORMATS:
-        for dist in DISTRIBUTIONS:
-            k = (fmt, dist)
-            metrics_globales[k] = {
-                "spearman": [], "top3": [], "bot3": [], 
-                "vol_mean": [], "vol_std": []
-            }
-            player_stats[k] = {i: [] for i in range(NB_JOUEURS)}
-
-    print(f"=== DÉBUT SIMULATION ({NB_SAISONS} saisons) ===")
-
-    for s in range(NB_SAISONS):
-        for fmt in FORMATS:
-            # A. Jeu
-            population = creer_population_fraiche(niveaux_adn, ELO_DEPART)
-            ma_saison = Saison(population)
-
-            for t in range(NB_TOURNOIS):
-                ma_saison.jouer_tournoi(fmt)
-            
-            # B. Analyse
-            analyzer = MetricsAnalyzer(population)
-            
-            for dist in DISTRIBUTIONS:
-                key = (fmt, dist)
-                
-                # Metrics (Calculées sur les Rangs pour la volatilité)
-                sp = analyzer.calculate_spearman(dist)
-                top, bot = analyzer.top_bottom_accuracy(dist, k=3)
-                vol_mean, vol_std = analyzer.volatility_analysis(dist)
-                
-                metrics_globales[key]["spearman"].append(sp)
-                metrics_globales[key]["top3"].append(top)
-                metrics_globales[key]["bot3"].append(bot)
-                metrics_globales[key]["vol_mean"].append(vol_mean)
-                metrics_globales[key]["vol_std"].append(vol_std)
-                
-                # Points (Pour le graphe)
-                for idx, joueur in enumerate(population):
-                    historique = joueur.historique_points[dist]
-                    if len(historique) > 0:
-                        moy = np.mean(historique)
-                        std = np.std(historique)
-                        player_stats[key][idx].append((moy, std))
 
-        if (s+1) % 10 == 0:
-            print(f" -> Saison {s+1}/{NB_SAISONS} terminée.")
+    if simuler:
+        simuler_saisons(dossier, niveaux_adn, NB_SAISONS, NB_TOURNOIS, ELO_DEPART, FORMATS, DISTRIBUTIONS)
 
-    # --- AFFICHAGE ---
+    # --- AFFICHAGE (depuis le disque) ---
+    metrics_globales, player_stats = charger_resultats(dossier, FORMATS, DISTRIBUTIONS)
     afficher_tableau_console(metrics_globales, FORMATS, DISTRIBUTIONS)
     
     print("\nGénération des graphiques cohérents (Axe Y inversé)...")
     afficher_graphes_points_vs_niveau_coherent(player_stats, metrics_globales, FORMATS, DISTRIBUTIONS, niveaux_adn)
 
+def simuler_une_saison(niveaux_adn, elo_depart, fmt, nb_tournois, distributions, s):
+    """
+    Joue la saison s au format fmt et renvoie (lignes_metriques, lignes_joueurs).
+    Le hasard est re-semé à partir de (GRAINE, s, fmt) : le résultat ne dépend que des
+    arguments, ce qui permet de le mettre en cache.
+    """
+    random.seed(f"{GRAINE}/{s}/{fmt}")
+
+    # A. Jeu
+    population = creer_population_fraiche(niveaux_adn, elo_depart)
+    ma_saison = Saison(population)
+
+    for t in range(nb_tournois):
+        ma_saison.jouer_tournoi(fmt)
+    
+    # B. Analyse
+    analyzer = MetricsAnalyzer(population, ma_saison.classement)
+    lignes_metriques = []
+    lignes_joueurs = []
+    
+    for dist in distributions:
+        # Metrics (Calculées sur les Rangs pour la volatilité)
+        sp = analyzer.calculate_spearman(dist)
+        top, bot = analyzer.top_bottom_accuracy(dist, k=3)
+        vol_mean, vol_std = analyzer.volatility_analysis(dist)
+        
+        lignes_metriques.append({
+            "format": fmt, "attribution": dist, "graine": GRAINE, "saison": s,
+            "spearman": sp, "top3": top, "bot3": bot, "vol_mean": vol_mean, "vol_std": vol_std,
+        })
+        
+        # Points (Pour le graphe)
+        for idx, joueur in enumerate(population):
+            historique = joueur.historique_points[dist]
+            if len(historique) > 0:
+                moy = np.mean(historique)
+                std = np.std(historique)
+                lignes_joueurs.append({
+                    "format": fmt, "attribution": dist, "graine": GRAINE, "saison": s,
+                    "joueur": idx, "niveau": joueur.niveau, "points_moy": moy, "points_std": std,
+                })
+
+    return lignes_metriques, lignes_joueurs
+
+def simuler_saisons(dossier, niveaux_adn, nb_saisons, nb_tournois, elo_depart, formats, distributions, cache=CACHE):
+    """
+    Joue les saisons et écrit métriques et points par joueur dans dossier, saison par saison.
+    Les saisons déjà jouées avec la même configuration sont relues dans le cache.
+    """
+    # Une nouvelle simulation remplace les résultats déjà écrits pour cette graine
+    for nom in ("metriques", "joueurs"):
+        magasin(dossier, nom).supprimer(graine=GRAINE)
+
+    print(f"=== DÉBUT SIMULATION ({nb_saisons} saisons) ===")
+
+    for s in range(nb_saisons):
+        for fmt in formats:
+            lignes_metriques, lignes_joueurs = cache.appel(
+                simuler_une_saison, niveaux_adn, elo_depart, fmt, nb_tournois, distributions, s,
+                contexte=(GRAINE, "NIVEAU"),
+            )
+            enregistrer_resultats(dossier, "metriques", lignes_metriques)
+            enregistrer_resultats(dossier, "joueurs", lignes_joueurs)
+
+        if (s+1) % 10 == 0:
+            print(f" -> Saison {s+1}/{nb_saisons} terminée.")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,5 +1,7 @@
 # match.py
 import random
+import racine  # noqa: F401 (import pour son effet : ajoute la racine du dépôt, où est elo.py, à sys.path)
+from elo import score_attendu
 
 class Match:
     @staticmethod
@@ -13,7 +15,7 @@ class Match:
         diff = j2.niveau - j1.niveau
         
         # Probabilité que J1 gagne : 1 / (1 + 10^(diff/400))
-        proba_j1 = 1 / (1 + 10 ** (diff / 400))
+        proba_j1 = score_attendu(-diff)
         
         # Tirage aléatoire
         if random.random() < proba_j1:
@@ -28,7 +30,7 @@ class Match:
         Ici, le calcul se base sur l'Elo (perception) et non le niveau.
         """
         diff = perdant.elo - gagnant.elo
-        attendu_gagnant = 1 / (1 + 10 ** (diff / 400))
+        attendu_gagnant = score_attendu(-diff)
         
         # Mise à jour
         gain = k * (1 - attendu_gagnant)
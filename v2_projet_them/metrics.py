@@ -3,17 +3,24 @@ import matplotlib.pyplot as plt
 from scipy import stats
 
 class MetricsAnalyzer:
-    def __init__(self, joueurs):
+    def __init__(self, joueurs, classement=None):
         self.joueurs = joueurs
+        # Index de saison (ClassementSaison) : évite de resommer / retrier l'historique
+        self.classement = classement
         # Vérité Terrain : Le meilleur a le plus haut niveau (Tri décroissant)
         self.joueurs_tries_par_niveau = sorted(joueurs, key=lambda j: j.niveau, reverse=True)
 
+    def _indexe(self, system_name):
+        return self.classement is not None and system_name in self.classement
+
     def _get_ranking_by_system(self, system_name):
         """
         Retourne la liste des joueurs classés selon le système choisi.
         """
         if system_name == "elo":
             return sorted(self.joueurs, key=lambda j: j.elo, reverse=True)
+        elif self._indexe(system_name):
+            return self.classement.classement(system_name)
         else:
             # Points = RANG (donc plus c'est petit, mieux c'est)
             return sorted(self.joueurs, key=lambda j: sum(j.historique_points[system_name]), reverse=False)
@@ -27,6 +34,8 @@ class MetricsAnalyzer:
         
         if system_name == "elo":
             resultats = [j.elo for j in self.joueurs]
+        elif self._indexe(system_name):
+            resultats = [self.classement.total(system_name, j) for j in self.joueurs]
         else:
             resultats = [sum(j.historique_points[system_name]) for j in self.joueurs]
             
@@ -34,13 +43,16 @@ class MetricsAnalyzer:
         return corr
 
     def top_bottom_accuracy(self, system_name, k=3):
-        ranking_sys = self._get_ranking_by_system(system_name)
-        
         true_top = set(self.joueurs_tries_par_niveau[:k])
         true_bot = set(self.joueurs_tries_par_niveau[-k:])
         
-        sys_top = set(ranking_sys[:k])
-        sys_bot = set(ranking_sys[-k:])
+        if self._indexe(system_name):
+            sys_top = set(self.classement.top(system_name, k))
+            sys_bot = set(self.classement.bas(system_name, k))
+        else:
+            ranking_sys = self._get_ranking_by_system(system_name)
+            sys_top = set(ranking_sys[:k])
+            sys_bot = set(ranking_sys[-k:])
         
         acc_top = len(true_top.intersection(sys_top)) / k
         acc_bot = len(true_bot.intersection(sys_bot)) / k
@@ -53,6 +65,12 @@ class MetricsAnalyzer:
         et non sur les points bruts.
         Cela permet de comparer Log vs Exp sur une même échelle (1 à 32).
         """
+        if self._indexe(system_name):
+            if self.classement.nb_tournois(system_name) < 2:
+                return 0.0, 0.0
+            stds_individuels = self.classement.volatilite_rangs(system_name)
+            return np.mean(stds_individuels), np.std(stds_individuels)
+
         stds_individuels = []
         
         # 1. On a besoin de reconstituer le classement de CHAQUE tournoi
@@ -1,34 +1,67 @@
 import numpy as np
 
+# Schémas d'attribution : f(rangs) -> points, appliqués en une expression NumPy à un tableau
+# de rangs de n'importe quelle forme (joueurs,), (tournois, joueurs), (saisons, tournois, joueurs).
+# Rang 1 = premier, les ex-aequo partagent le même rang. Nouveaux schémas : @schema("nom").
+SCHEMAS = {}
+
+def schema(nom):
+    def enregistrer(f):
+        SCHEMAS[nom] = f
+        return f
+    return enregistrer
+
+@schema("lineaire")
+def _lineaire(rangs):
+    return rangs.astype(float)
+
+@schema("exponentielle")
+def _exponentielle(rangs):
+    return np.exp(rangs)
+
+@schema("logarithmique")
+def _logarithmique(rangs):
+    return np.log(np.maximum(rangs, 1))
+
+
+def rangs_classement(classement_structure, joueurs):
+    """
+    Classement (liste plate ou liste de paliers ex-aequo) -> tableau des rangs alignés sur joueurs.
+    Un palier de k joueurs au rang r fait passer le suivant au rang r + k.
+    Les joueurs absents du classement ont le rang 0 (0 point).
+    """
+    index = {j: i for i, j in enumerate(joueurs)}
+    rangs = np.zeros(len(joueurs), dtype=int)
+    rang_courant = 1
+    for element in classement_structure:
+        groupe = element if isinstance(element, list) else [element]
+        for joueur in groupe:
+            rangs[index[joueur]] = rang_courant
+        rang_courant += len(groupe)
+    return rangs
+
+def points_matrice(rangs, nom):
+    """Points de même forme que rangs (rang 0 = absent -> 0 point)."""
+    rangs = np.asarray(rangs)
+    return np.where(rangs > 0, SCHEMAS[nom](rangs), 0.0)
+
+def points_saisons(rangs, nom):
+    """rangs (..., tournois, joueurs) -> total des points par joueur (..., joueurs)."""
+    return points_matrice(rangs, nom).sum(axis=-2)
+
+
 class AttributionPoints:
-    
+
     @staticmethod
-    def _applatir_et_attribuer(classement_structure, calcul_func):
+    def _applatir_et_attribuer(classement_structure, nom):
         """
-        Gère l'attribution des points que le classement soit une liste plate 
+        Gère l'attribution des points que le classement soit une liste plate
         ou une liste de paliers (ex-aequo).
         """
-        points_attribues = {}
-        rang_courant = 1
-        
-        for element in classement_structure:
-            # Si c'est un joueur seul (cas liste plate), on le met dans une liste
-            if not isinstance(element, list):
-                groupe = [element]
-            else:
-                groupe = element
-                
-            # Tous les joueurs de ce groupe/palier prennent les points du rang actuel
-            pts = calcul_func(rang_courant)
-            
-            for joueur in groupe:
-                points_attribues[joueur] = pts
-            
-            # Le rang saute du nombre de joueurs dans le groupe
-            # Ex: Si 2 joueurs sont 5ème, le prochain rang est 7 (5 + 2)
-            rang_courant += len(groupe)
-            
-        return points_attribues
+        joueurs = [j for element in classement_structure
+                   for j in (element if isinstance(element, list) else [element])]
+        points = points_matrice(rangs_classement(classement_structure, joueurs), nom)
+        return dict(zip(joueurs, points.tolist()))
 
     @staticmethod
     def lineaire(classement, max_points=None):
@@ -36,7 +69,7 @@ class AttributionPoints:
         Points = Rang
         (1er -> 1pt, 2ème -> 2pts...)
         """
-        return AttributionPoints._applatir_et_attribuer(classement, lambda r: float(r))
+        return AttributionPoints._applatir_et_attribuer(classement, "lineaire")
 
     @staticmethod
     def exponentielle(classement, max_points=None):
@@ -44,7 +77,7 @@ class AttributionPoints:
         Points = exp(Rang)
         (Pénalise très fortement les derniers rangs)
         """
-        return AttributionPoints._applatir_et_attribuer(classement, lambda r: np.exp(r))
+        return AttributionPoints._applatir_et_attribuer(classement, "exponentielle")
 
     @staticmethod
     def logarithmique(classement, max_points=None):
@@ -53,4 +86,4 @@ class AttributionPoints:
         (Écrase les écarts, différences faibles entre 1er et 10ème)
         Note: On évite log(0) car les rangs commencent à 1.
         """
-        return AttributionPoints._applatir_et_attribuer(classement, lambda r: np.log(r) if r > 0 else 0)
\ No newline at end of file
+        return AttributionPoints._applatir_et_attribuer(classement, "logarithmique")
@@ -0,0 +1,10 @@
+# racine.py
+# Modules partagés avec la racine du dépôt (elo.py, cache.py, resultats.py) : au lieu d'en garder
+# une copie ici, on ajoute la racine à la fin de sys.path. Les modules de ce dossier (joueur,
+# match, tournoi, saison...) restent prioritaires puisque le dossier du script passe en premier.
+import os
+import sys
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RACINE not in sys.path:
+    sys.path.append(RACINE)
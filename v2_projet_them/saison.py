@@ -1,16 +1,21 @@
 # saison.py
 from tournoi import Tournoi
-from points import AttributionPoints
+from points import rangs_classement, points_matrice
+from classement_saison import ClassementSaison
+
+SYSTEMES = ["lineaire", "exponentielle", "logarithmique"]
 
 class Saison:
     def __init__(self, joueurs):
         self.joueurs = joueurs
+        # Totaux, rangs et volatilité tenus à jour au fil des tournois
+        self.classement = ClassementSaison(joueurs, SYSTEMES)
 
     def jouer_tournoi(self, type_tournoi="suisse"):
         """
         1. Joue le tournoi selon le format demandé.
         2. Calcule les points selon TOUTES les distributions (Lin, Exp, Log).
-        3. Enregistre les gains dans l'historique des joueurs.
+        3. Enregistre les gains dans l'historique des joueurs et dans l'index de saison.
         """
         # --- A. Exécution du Tournoi ---
         t = Tournoi(self.joueurs)
@@ -27,17 +32,20 @@ class Saison:
 
         # --- B. Attribution des points (Multi-systèmes) ---
         
-        # 1. Calcul des points pour ce tournoi spécifique
-        pts_lin = AttributionPoints.lineaire(classement)
-        pts_exp = AttributionPoints.exponentielle(classement)
-        pts_log = AttributionPoints.logarithmique(classement)
+        # 1. Rangs du tournoi (un tableau aligné sur self.joueurs), puis une opération
+        #    vectorisée par système de points
+        rangs = rangs_classement(classement, self.joueurs)
+        points = {nom: points_matrice(rangs, nom) for nom in SYSTEMES}
+
+        for nom in SYSTEMES:
+            self.classement.enregistrer(nom, points[nom])
 
         # 2. Mise à jour des joueurs
-        for joueur in self.joueurs:
+        for nom in SYSTEMES:
             # On ajoute les points gagnés dans l'historique
-            joueur.historique_points["lineaire"].append(pts_lin.get(joueur, 0))
-            joueur.historique_points["exponentielle"].append(pts_exp.get(joueur, 0))
-            joueur.historique_points["logarithmique"].append(pts_log.get(joueur, 0))
-            
+            for joueur, pts in zip(self.joueurs, points[nom].tolist()):
+                joueur.historique_points[nom].append(pts)
+
+        for joueur in self.joueurs:
             # Pour l'Elo, on stocke la valeur courante (ou le gain, ici valeur courante)
-            joueur.historique_points["elo"].append(joueur.elo)
\ No newline at end of file
+            joueur.historique_points["elo"].append(joueur.elo)
@@ -1,4 +1,8 @@
 import random
+try:
+    import networkx as nx   # seul le système suisse en a besoin (voir requirements.txt)
+except ImportError:
+    nx = None
 from match import Match
 
 class Tournoi:
@@ -147,17 +151,73 @@ class Tournoi:
     def _trier_joueurs_suisse(self):
         return sorted(self.participants, key=lambda p: (self.scores[p], p.elo), reverse=True)
 
-    def _trouver_appariements_recursive(self, joueurs):
-        if not joueurs: return []
-        j1 = joueurs[0]
-        for i in range(1, len(joueurs)):
-            j2 = joueurs[i]
-            if j2 not in self.deja_joue[j1]:
-                reste = joueurs[1:i] + joueurs[i+1:]
-                res = self._trouver_appariements_recursive(reste)
-                if res is not None: return [(j1, j2)] + res
+    def _trouver_appariements(self, joueurs, taille_bloc=64, voisins=12):
+        """
+        Appariement sans re-match par couplage de poids maximal (algorithme d'Edmonds, polynomial).
+        - joueurs : liste triée par (score, elo) décroissants, de taille paire
+        - graphe de compatibilité : arête entre deux joueurs qui ne se sont pas encore rencontrés,
+          de poids d'autant plus grand que l'écart de score (puis de classement) est petit
+        Le classement est découpé en blocs consécutifs de taille_bloc joueurs, couplés
+        indépendamment (coût par ronde linéaire en n). Un bloc sans couplage parfait est fusionné
+        avec les suivants ; en dernier recours on couple tout le classement d'un coup, donc on trouve
+        toujours un appariement sans re-match s'il en existe un. Sinon renvoie None.
+        """
+        paires = []
+        debut = 0
+        n = len(joueurs)
+        while debut < n:
+            fin = debut + taille_bloc
+            if n - fin < taille_bloc:   # pas de petit bloc isolé en fin de classement
+                fin = n
+            paires_bloc = self._coupler(joueurs[debut:fin], voisins)
+            while paires_bloc is None and fin < n:
+                fin = min(fin + taille_bloc, n)
+                paires_bloc = self._coupler(joueurs[debut:fin], voisins)
+            if paires_bloc is None:
+                # dernier recours : tout le classement d'un coup
+                return self._coupler(joueurs, voisins) if debut > 0 else None
+            paires.extend(paires_bloc)
+            debut = fin
+        return paires
+
+    def _coupler(self, joueurs, voisins):
+        """Couplage parfait de poids maximal d'un bloc (graphe creux puis complet), ou None."""
+        if nx is None:
+            raise ImportError("L'appariement suisse a besoin de networkx : voir requirements.txt à la racine du dépôt")
+        n = len(joueurs)
+        for k in (voisins, n):
+            graphe = self._graphe_compatibilite(joueurs, k)
+            couplage = nx.max_weight_matching(graphe, maxcardinality=True)
+            if 2 * len(couplage) == n:
+                paires = sorted((min(a, b), max(a, b)) for a, b in couplage)
+                return [(joueurs[a], joueurs[b]) for a, b in paires]
         return None
 
+    def _graphe_compatibilite(self, joueurs, k):
+        """Graphe des rencontres autorisées entre chaque joueur et ses k suivants non rencontrés."""
+        n = len(joueurs)
+        ecart_max = max(self.scores[j] for j in joueurs) - min(self.scores[j] for j in joueurs)
+        # poids entiers positifs : l'écart de score domine, l'écart de classement départage
+        penalite_score = 2 * n
+        poids_max = int(2 * ecart_max + 1) * penalite_score + n
+
+        graphe = nx.Graph()
+        graphe.add_nodes_from(range(n))
+        for a in range(n):
+            j1 = joueurs[a]
+            s1 = self.scores[j1]
+            trouves = 0
+            for b in range(a + 1, n):
+                j2 = joueurs[b]
+                if j2 in self.deja_joue[j1]:
+                    continue
+                ecart = int(2 * abs(s1 - self.scores[j2]))   # scores au demi-point
+                graphe.add_edge(a, b, weight=poids_max - ecart * penalite_score - (b - a))
+                trouves += 1
+                if trouves == k:
+                    break
+        return graphe
+
     def systeme_suisse(self, n_rondes=11):
         self.scores = {p: 0.0 for p in self.participants}
         self.deja_joue = {p: set() for p in self.participants}
@@ -177,7 +237,7 @@ class Tournoi:
                         joueurs_round.pop(i)
                         break
             
-            paires = self._trouver_appariements_recursive(joueurs_round)
+            paires = self._trouver_appariements(joueurs_round)
             if paires is None:
                 paires = []
                 while len(joueurs_round) >= 2:
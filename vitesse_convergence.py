@@ -3,18 +3,29 @@ ayant des niveaux différents sont triés par le score elo.
 Pour ça, on fait des round robins avec un pool de joueurs à répétition puis
 on observe l'évolution de l'elo des joueurs et le taux de changement du score elo.
 Ce dernier est mesuré en norme2 et en norme infinie, avec des résultats par ailleurs similaires.
-Il faudrait ajouter les métriques spearman/mae/topk.
+On suit aussi la corrélation de Spearman entre le classement Elo et le classement par niveau_E,
+et on compare les politiques de K de moteur_elo.py (K fixe, paliers FIDE, K piloté par
+l'incertitude) et les systèmes Glicko-2 / TrueSkill : combien de rondes et de parties pour
+atteindre la même corrélation.
 Ultérieurement on voudrait aussi observer la vitesse de convergence de l'elo d'un nouveau
 joueur arrivant dans un ensemble de joueurs déjà 'stabilisés'.
 
 Jsp à quel point c'est hors-sujet mais le prof en avait parlé je crois alors voilà..."""
-#TODO ajouter les métriques spearman/mae/topk
+#TODO ajouter les métriques mae/topk
 #TODO nouveau joueur dans pool de joueurs déjà stabilisés
 
 #imports
-from joueur import Joueur
+import numpy as np
+import pandas as pd
 import matplotlib.pyplot as plt
 
+from population import Population
+from moteur_elo import MoteurElo
+from systemes_classement import Glicko2, TrueSkill
+from tournoi import rondes_round_robin
+from arret import ArretNorme, economie
+from metriques_rang import spearman
+
 # constantes
 VICTOIRE = 1
 DEFAITE = 0
@@ -27,59 +38,103 @@ variance = 2
 offset = 40
 ecart = 0.5
 K = 20
-participants  = [Joueur(str(i), offset+i*ecart, variance, K) for i in range(nb_joueurs)]
-resultats_participants = {participant:0 for participant in participants}  # reset à chaque tournoi, +1 pour victoire, +0 pour défaite
-ES_participants = {participant:0 for participant in participants}       # reset à chaque tournoi,à chaque rencontre on ajoute l'expected score
-historique_elo_participants = {participant:[participant.elo] for participant in participants}
-taux_changement_elo = {participant:[] for participant in participants}
-historique_norme_inf = []
-historique_norme_2 = []
-
-# loop
-for idx_tournois in range(nb_tournois):
-    #round robin
-    resultats_participants = {participant:0 for participant in participants}
-    ES_participants = {participant:0 for participant in participants}
-    for idx_j1 in range(len(participants)):
-        for idx_j2 in range(idx_j1+1, len(participants)):
-            j1 = participants[idx_j1]
-            j2 = participants[idx_j2]
-            difference_elo = j2.elo - j1.elo
-            expected_score = 1 / (1 + 10 ** (difference_elo / 400))
-            ES_participants[j1]+=expected_score
-            ES_participants[j2]+=(1-expected_score)
-            if j1.niveau < j2.niveau: # défaite j1
-               # j1.elo = j1.elo + j1.K * (DEFAITE - expected_score)
-               # j2.elo = j2.elo + j2.K * (VICTOIRE - (1-expected_score))
-               resultats_participants[j2]+=1
-            else:  # victoire j1
-                # j1.elo = j1.elo + j1.K * (VICTOIRE - expected_score)
-                # j2.elo = j2.elo + j2.K * (DEFAITE - (1-expected_score))
-                resultats_participants[j1]+=1
-
-    # calcul des elo après tournoi
-    for participant in participants:
-        participant.elo = participant.elo + participant.K * (resultats_participants[participant] - ES_participants[participant])
-
-    # calcul du taux de changement des elo et update des historiques
-    for participant in participants:
-        taux_changement_elo[participant] = participant.elo - historique_elo_participants[participant][-1]
-        historique_elo_participants[participant].append(participant.elo)
-    
-    # norme inf
-    historique_norme_inf.append(max([taux_changement_elo[participant] for participant in participants]))
-
-    # norme_2
-    historique_norme_2.append(pow(sum([taux_changement_elo[participant]**2 for participant in participants]),1/2))
-
-
-#plot
-for participant in participants:
-    plt.plot(historique_elo_participants[participant])
-plt.show()
-
-plt.plot(historique_norme_inf)
-plt.show()
-
-plt.plot(historique_norme_2)
-plt.show()
\ No newline at end of file
+
+
+def simuler_convergence(moteur, lot="ronde", nb_tournois=nb_tournois, nb_joueurs=nb_joueurs,
+                        variance=variance, offset=offset, ecart=ecart, K=K, graine=0, arret=None):
+    """
+    nb_tournois round robins successifs, tous les joueurs partant de 1500.
+    lot = "ronde"   : les Elo sont mis à jour après chaque ronde
+    lot = "tournoi" : une seule mise à jour par tournoi (calcul d'origine de ce fichier)
+    Renvoie un DataFrame avec une ligne par mise à jour : rondes et parties jouées, spearman
+    contre niveau_E, normes 2 et infinie de la variation des Elo, et l'historique des Elo.
+    arret (arret.ArretNorme) : on s'arrête avant nb_tournois dès que la variation est assez petite.
+    """
+    population = Population([str(i) for i in range(nb_joueurs)],
+                            [offset + i * ecart for i in range(nb_joueurs)],
+                            np.full(nb_joueurs, variance), K=np.full(nb_joueurs, K))
+    rng = np.random.default_rng(graine)
+    reference = np.argsort(-population.niveau_E, kind="stable")
+    rondes = rondes_round_robin(nb_joueurs)
+    if lot == "tournoi":
+        periodes = [(np.concatenate([r[0] for r in rondes]), np.concatenate([r[1] for r in rondes]))]
+    else:
+        periodes = rondes
+
+    historique = []
+    n_rondes = 0
+    for _ in range(nb_tournois):
+        if arret is not None and historique and historique[-1]["arret"]:
+            break
+        for idx1, idx2 in periodes:
+            perf1 = rng.normal(population.niveau_E[idx1], population.niveau_V[idx1])
+            perf2 = rng.normal(population.niveau_E[idx2], population.niveau_V[idx2])
+            score1 = np.where(perf1 < perf2, DEFAITE, VICTOIRE)   # j1.niveau < j2.niveau : défaite j1
+            variation = moteur.appliquer(population, idx1, idx2, score1)
+
+            n_rondes += len(rondes) if lot == "tournoi" else 1
+            historique.append({
+                "rondes": n_rondes,
+                "parties": population.parties.sum() // 2,
+                "spearman": spearman(np.argsort(-population.elo, kind="stable"), reference),
+                "norme_2": np.sqrt((variation**2).sum()),
+                "norme_inf": np.abs(variation).max(),
+                "elo": population.elo.copy(),
+                "arret": arret is not None and arret.observer(variation),
+            })
+            if historique[-1]["arret"]:
+                break
+    return pd.DataFrame(historique)
+
+
+def comparer_politiques(moteurs=None, seuil=0.9, n_graines=5, arret=None, **kwargs):
+    """
+    Pour chaque (nom, moteur, lot) : rondes et parties nécessaires pour que la corrélation de
+    Spearman atteigne seuil (moyenne sur n_graines, NaN si jamais atteint), et spearman final.
+    arret : fabrique d'un contrôleur d'arrêt (ex. lambda: ArretNorme(2, fenetre=5)) ; on ajoute
+    alors les parties réellement jouées et la fraction épargnée sur nb_tournois round robins.
+    """
+    if moteurs is None:
+        moteurs = [
+            ("K fixe, par tournoi", lambda: MoteurElo("fixe"), "tournoi"),
+            ("K fixe, par ronde", lambda: MoteurElo("fixe"), "ronde"),
+            ("FIDE, par ronde", lambda: MoteurElo("fide"), "ronde"),
+            ("incertitude, par ronde", lambda: MoteurElo("incertitude"), "ronde"),
+            ("Glicko-2, par ronde", lambda: Glicko2(), "ronde"),
+            ("TrueSkill, par ronde", lambda: TrueSkill(), "ronde"),
+        ]
+    n = kwargs.get("nb_joueurs", nb_joueurs)
+    maximum = kwargs.get("nb_tournois", nb_tournois) * n * (n - 1) // 2
+    lignes = []
+    for nom, fabrique, lot in moteurs:
+        for graine in range(n_graines):
+            h = simuler_convergence(fabrique(), lot, graine=graine, arret=arret() if arret else None, **kwargs)
+            ok = np.flatnonzero(h["spearman"].to_numpy() >= seuil)
+            lignes.append({"politique": nom, "graine": graine, "spearman_final": h["spearman"].iloc[-1],
+                           "rondes": np.nan if not len(ok) else h["rondes"].iloc[ok[0]],
+                           "parties": np.nan if not len(ok) else h["parties"].iloc[ok[0]],
+                           "parties_jouees": h["parties"].iloc[-1],
+                           "fraction_economisee": economie(h["parties"].iloc[-1], maximum)["fraction_economisee"]})
+    return pd.DataFrame(lignes).groupby("politique", sort=False)[
+        ["rondes", "parties", "spearman_final", "parties_jouees", "fraction_economisee"]].mean()
+
+
+if __name__ == "__main__":
+    print(comparer_politiques())
+    # même comparaison en s'arrêtant dès que la variation des Elo est faible
+    print(comparer_politiques(arret=lambda: ArretNorme(2, norme="inf", fenetre=5)))
+
+    historique = simuler_convergence(MoteurElo("fixe"), lot="tournoi")
+
+    #plot
+    plt.plot(np.stack(historique["elo"]))
+    plt.show()
+
+    plt.plot(historique["norme_inf"])
+    plt.show()
+
+    plt.plot(historique["norme_2"])
+    plt.show()
+
+    plt.plot(historique["rondes"], historique["spearman"])
+    plt.show()